@@ -3,7 +3,10 @@
 """
 
 import os
+import orjson
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from flask_caching import Cache
 from flask_login import LoginManager
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
@@ -12,6 +15,47 @@ from flask_migrate import Migrate
 db = SQLAlchemy()
 login_manager = LoginManager()
 migrate = Migrate()
+cache = Cache()
+
+class OrjsonProvider(DefaultJSONProvider):
+    """基于orjson的JSON序列化，jsonify等调用无需改动即可使用"""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        # orjson不支持的类型（Decimal、带__html__的对象等）交给Flask默认处理
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def _json_column_dumps(obj):
+    """JSON列的序列化函数（引擎要求返回str）"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+def _build_engine_options(database_uri):
+    """根据数据库URI生成连接池配置"""
+    options = {
+        'pool_pre_ping': True,  # 取连接前探活，避免使用已断开的连接
+        'pool_recycle': 1800,
+        # JSON列使用orjson编解码
+        'json_serializer': _json_column_dumps,
+        'json_deserializer': orjson.loads
+    }
+    if database_uri.startswith('sqlite'):
+        options['connect_args'] = {'check_same_thread': False}
+        # 内存SQLite使用StaticPool，不接受连接池大小参数
+        if ':memory:' in database_uri or database_uri.rstrip('/') == 'sqlite:':
+            return options
+    options.update({
+        'pool_size': 20,
+        'max_overflow': 10,
+        'pool_timeout': 30
+    })
+    return options
 
 def create_app(config_class=None):
     """应用工厂函数"""
@@ -20,6 +64,7 @@ def create_app(config_class=None):
         template_folder=os.path.join('..', 'templates'),
         static_folder=os.path.join('..', 'static')
     )
+    app.json = OrjsonProvider(app)
     
     # 配置
     if config_class:
@@ -30,6 +75,16 @@ def create_app(config_class=None):
         app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL') or \
             'sqlite:///' + os.path.join(app.instance_path, 'office_assistant.db')
         app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        # 建表模式：sync 在启动时自动建表，skip 交给 flask init-db / flask db upgrade
+        app.config['MIGRATION_MODE'] = os.environ.get('MIGRATION_MODE') or 'skip'
+        app.config['PASSWORD_HASH_METHOD'] = 'scrypt:32768:8:1'
+        
+        # 缓存配置：配置了Redis地址时使用RedisCache，否则使用进程内SimpleCache
+        app.config['CACHE_REDIS_URL'] = os.environ.get('CACHE_REDIS_URL') or ''
+        app.config['CACHE_TYPE'] = 'RedisCache' if app.config['CACHE_REDIS_URL'] else 'SimpleCache'
+        # 单进程部署可允许后台任务状态保存在进程内缓存中
+        app.config['BACKGROUND_JOBS_LOCAL_CACHE'] = os.environ.get('BACKGROUND_JOBS_LOCAL_CACHE', '').lower() in ('1', 'true')
+        app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600  # 静态资源缓存1小时
         app.config['UPLOAD_FOLDER'] = os.path.join(app.root_path, '..', 'static', 'uploads')
         app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB
         app.config['ALLOWED_EXTENSIONS'] = {
@@ -43,6 +98,15 @@ def create_app(config_class=None):
         app.config['UNSPLASH_ACCESS_KEY'] = os.environ.get('UNSPLASH_ACCESS_KEY') or ''
         app.config['DEEPSEEK_API_KEY'] = os.environ.get('DEEPSEEK_API_KEY') or ''
     
+    # 数据库连接池配置（可由配置类覆盖）
+    # db.session 是按线程/应用上下文隔离的 scoped_session，业务代码应直接使用它，不要另开会话
+    app.config.setdefault(
+        'SQLALCHEMY_ENGINE_OPTIONS',
+        _build_engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    )
+    
+    app.config.setdefault('CACHE_TYPE', 'SimpleCache')
+    
     # 确保上传目录存在
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
@@ -50,6 +114,7 @@ def create_app(config_class=None):
     db.init_app(app)
     login_manager.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
     
     # 配置登录视图
     login_manager.login_view = 'auth.login'
@@ -69,8 +134,18 @@ def create_app(config_class=None):
     # 导入模型（确保SQLAlchemy知道它们）
     from . import models
     
-    # 创建数据库表（开发环境）
-    with app.app_context():
+    # 注册命令行工具：部署时执行一次 flask init-db，而不是每个worker启动时建表
+    @app.cli.command('init-db')
+    def init_db_command():
+        """创建数据库表，并标记为最新迁移版本"""
+        from flask_migrate import stamp
         db.create_all()
+        stamp()
+        print('数据库表已创建')
+    
+    # 仅在显式开启时自动建表（测试/本地调试）
+    if app.config.get('MIGRATION_MODE', 'skip') == 'sync':
+        with app.app_context():
+            db.create_all()
     
     return app
@@ -3,13 +3,165 @@ AI数据分析模块
 集成DeepSeek API进行数据质量分析和智能建议生成
 """
 
-import json
+import hashlib
 import os
-from typing import Dict, List, Any, Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Any, Optional
 import logging
 
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 logger = logging.getLogger(__name__)
 
+# 模块级HTTP会话：复用keep-alive连接，避免每次调用都重新握手
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+
+# 预编译的正则表达式（模块加载时编译一次）
+# 评分的几种写法，按优先级排列；各写法分别搜索，避免交替式匹配互相吞掉重叠文本（如“4/5星”）
+_RATING_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(\d)\s*[颗星★]',
+    r'评分[:：]\s*(\d)',
+    r'(\d)/5',
+    r'quality.*?(\d)',
+))
+
+# 章节标题行（含问题/建议关键词）或列表项行，一次 finditer 扫描全文
+_OUTLINE_RE = re.compile(
+    r'^(?P<header>.*?(?:(?P<issue>问题|issue|problem|缺陷)|(?P<rec>建议|recommendation|solution|改进)).*)$'
+    r'|^[ \t]*(?:[•\-*]|\d+[\.\)])[ \t]*(?P<item>.+)$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+_BULLET_RE = re.compile(r'[•\-*]\s*(.+)')
+
+# 分析提示模板（模块加载时构建一次，调用时只做format_map填充）
+_ANALYSIS_PROMPT_TEMPLATE = """
+        请分析以下数据集的质量问题并提供改进建议：
+        
+        1. 数据集基本信息：
+           - 行数：{row_count}
+           - 列数：{column_count}
+           - 列名：{columns}
+           - 数据类型分布：{data_types}
+        
+        2. 缺失值情况：
+           - 总缺失值数：{missing_total}
+           - 缺失值占比：{missing_percentage:.2f}%
+           - 各列缺失情况：{missing_by_column}
+        
+        3. 重复数据：
+           - 重复行数：{duplicate_count}
+           - 重复行占比：{duplicate_percentage:.2f}%
+        
+        4. 异常值检测（数值列）：
+           {outliers}
+        
+        5. 数据样本（前{sample_size}行）：
+           {sample_data}
+        
+        请从以下角度提供专业分析：
+        1. 数据质量综合评价（从1-5星评级）
+        2. 主要问题识别（按严重程度排序）
+        3. 具体改进建议（针对每个问题）
+        4. 数据清洗优先级建议
+        5. 潜在分析价值挖掘
+        
+        请用结构化格式输出，包含清晰的标题和要点。
+        """
+
+
+def _dumps(value: Any) -> str:
+    """使用orjson序列化为紧凑JSON字符串（不转义非ASCII字符）"""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+def _flatten_report(data_report: Dict[str, Any]) -> Dict[str, Any]:
+    """一次性展开数据质量报告中用到的字段，缺失的部分取默认值"""
+    basic_stats = data_report.get("basic_stats") or {}
+    missing_values = data_report.get("missing_values") or {}
+    duplicate_rows = data_report.get("duplicate_rows") or {}
+    
+    return {
+        "row_count": basic_stats.get("row_count", 0),
+        "column_count": basic_stats.get("column_count", 0),
+        "columns": basic_stats.get("columns") or [],
+        "data_types": basic_stats.get("data_types") or {},
+        "missing_total": missing_values.get("total", 0),
+        "missing_percentage": missing_values.get("percentage", 0),
+        "missing_by_column": missing_values.get("by_column") or {},
+        "duplicate_count": duplicate_rows.get("count", 0),
+        "duplicate_percentage": duplicate_rows.get("percentage", 0),
+        "outlier_detection": data_report.get("outlier_detection") or {}
+    }
+
+
+# AI分析结果缓存：相同报告+样本在有效期内直接复用，避免重复调用API
+_RESULT_CACHE_SIZE = 128
+_RESULT_CACHE_TTL = 600  # 秒
+_result_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _analysis_cache_key(data_report: Dict[str, Any], sample_data: List[Dict]) -> str:
+    """计算报告与样本内容的哈希作为缓存键"""
+    payload = orjson.dumps(
+        [data_report, sample_data[:10]],
+        default=str,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _get_cached_analysis(key: str) -> Optional[Dict[str, Any]]:
+    """读取未过期的缓存结果"""
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del _result_cache[key]
+            return None
+        _result_cache.move_to_end(key)
+        return result
+
+
+def _set_cached_analysis(key: str, result: Dict[str, Any]) -> None:
+    """写入缓存，超出容量时淘汰最久未使用的结果"""
+    with _result_cache_lock:
+        _result_cache[key] = (time.monotonic() + _RESULT_CACHE_TTL, result)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+def _scan_sections(content: str) -> Dict[str, List[str]]:
+    """单次扫描AI文本，将列表项归入最近的问题/建议章节"""
+    sections = {'issue': [], 'rec': []}
+    current = None
+    
+    for match in _OUTLINE_RE.finditer(content):
+        if match.group('header') is not None:
+            current = 'issue' if match.group('issue') else 'rec'
+        elif current:
+            item = match.group('item').strip()
+            if len(item) > 10:  # 过滤过短的项
+                sections[current].append(item)
+    
+    return sections
+
+
 class AIAnalyzer:
     """AI数据分析器"""
     
@@ -35,8 +187,11 @@ class AIAnalyzer:
             Dict: AI分析报告
         """
         try:
-            # 如果API密钥可用，调用真实API
+            # 如果API密钥可用，调用真实API（命中缓存时直接返回）
             if self.api_key:
+                cached = _get_cached_analysis(_analysis_cache_key(data_report, sample_data))
+                if cached is not None:
+                    return cached
                 return self._call_deepseek_api(data_report, sample_data)
             else:
                 # 模拟AI分析结果（开发阶段）
@@ -46,28 +201,79 @@ class AIAnalyzer:
             logger.error(f"AI分析失败: {str(e)}")
             return self._generate_fallback_report(data_report)
     
-    def _call_deepseek_api(self, data_report: Dict[str, Any], sample_data: List[Dict]) -> Dict[str, Any]:
+    def stream_analysis(self, data_report: Dict[str, Any], sample_data: List[Dict]) -> Iterator[Dict[str, Any]]:
         """
-        调用DeepSeek API进行数据分析
+        流式分析数据质量
         
         Args:
             data_report: 数据质量报告
-            sample_data: 示例数据
+            sample_data: 示例数据（前10行）
             
-        Returns:
-            Dict: API响应解析后的报告
+        Yields:
+            Dict: {"content": 文本片段}，最后一条为 {"result": AI分析报告}
         """
-        import requests
+        if not self.api_key:
+            report = self._simulate_ai_analysis(data_report, sample_data)
+            yield {"content": report["ai_analysis"]}
+            yield {"result": report}
+            return
+        
+        cache_key = _analysis_cache_key(data_report, sample_data)
+        cached = _get_cached_analysis(cache_key)
+        if cached is not None:
+            yield {"content": cached["ai_analysis"]}
+            yield {"result": cached}
+            return
         
-        # 构建分析提示
         prompt = self._build_analysis_prompt(data_report, sample_data)
+        chunks = []
         
-        headers = {
+        try:
+            with _SESSION.post(
+                f"{self.base_url}/chat/completions",
+                headers=self._build_headers(),
+                json=self._build_payload(prompt, stream=True),
+                timeout=30,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                
+                # 解析SSE：每行 "data: {...}"，以 "data: [DONE]" 结束
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue
+                    data = line[6:]
+                    if data == b"[DONE]":
+                        break
+                    delta = orjson.loads(data)["choices"][0]["delta"].get("content")
+                    if delta:
+                        chunks.append(delta)
+                        yield {"content": delta}
+        except Exception as e:
+            logger.error(f"DeepSeek流式调用失败: {str(e)}")
+            if not chunks:
+                report = self._simulate_ai_analysis(data_report, sample_data)
+                yield {"content": report["ai_analysis"]}
+                yield {"result": report}
+            else:
+                # 中途断开的不完整结果不写入缓存
+                yield {"result": self._parse_ai_response("".join(chunks), data_report)}
+            return
+        
+        result = self._parse_ai_response("".join(chunks), data_report)
+        _set_cached_analysis(cache_key, result)
+        yield {"result": result}
+    
+    def _build_headers(self) -> Dict[str, str]:
+        """构建API请求头"""
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
-        payload = {
+    
+    def _build_payload(self, prompt: str, stream: bool = False) -> Dict[str, Any]:
+        """构建聊天补全请求体"""
+        return {
             "model": "deepseek-chat",
             "messages": [
                 {
@@ -80,14 +286,29 @@ class AIAnalyzer:
                 }
             ],
             "temperature": 0.3,
-            "max_tokens": 2000
+            "max_tokens": 2000,
+            "stream": stream
         }
+    
+    def _call_deepseek_api(self, data_report: Dict[str, Any], sample_data: List[Dict]) -> Dict[str, Any]:
+        """
+        调用DeepSeek API进行数据分析
+        
+        Args:
+            data_report: 数据质量报告
+            sample_data: 示例数据
+            
+        Returns:
+            Dict: API响应解析后的报告
+        """
+        # 构建分析提示
+        prompt = self._build_analysis_prompt(data_report, sample_data)
         
         try:
-            response = requests.post(
+            response = _SESSION.post(
                 f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
+                headers=self._build_headers(),
+                json=self._build_payload(prompt),
                 timeout=30
             )
             response.raise_for_status()
@@ -96,7 +317,9 @@ class AIAnalyzer:
             ai_content = result["choices"][0]["message"]["content"]
             
             # 解析AI响应
-            return self._parse_ai_response(ai_content, data_report)
+            result = self._parse_ai_response(ai_content, data_report)
+            _set_cached_analysis(_analysis_cache_key(data_report, sample_data), result)
+            return result
             
         except Exception as e:
             logger.error(f"DeepSeek API调用失败: {str(e)}")
@@ -113,44 +336,18 @@ class AIAnalyzer:
         Returns:
             str: 分析提示
         """
-        basic_stats = data_report.get("basic_stats", {})
-        missing_values = data_report.get("missing_values", {})
-        duplicate_rows = data_report.get("duplicate_rows", {})
-        outlier_detection = data_report.get("outlier_detection", {})
-        
-        prompt = f"""
-        请分析以下数据集的质量问题并提供改进建议：
-        
-        1. 数据集基本信息：
-           - 行数：{basic_stats.get('row_count', 0)}
-           - 列数：{basic_stats.get('column_count', 0)}
-           - 列名：{', '.join(basic_stats.get('columns', []))}
-           - 数据类型分布：{json.dumps(basic_stats.get('data_types', {}), ensure_ascii=False)}
-        
-        2. 缺失值情况：
-           - 总缺失值数：{missing_values.get('total', 0)}
-           - 缺失值占比：{missing_values.get('percentage', 0):.2f}%
-           - 各列缺失情况：{json.dumps(missing_values.get('by_column', {}), ensure_ascii=False)}
-        
-        3. 重复数据：
-           - 重复行数：{duplicate_rows.get('count', 0)}
-           - 重复行占比：{duplicate_rows.get('percentage', 0):.2f}%
-        
-        4. 异常值检测（数值列）：
-           {json.dumps(outlier_detection, ensure_ascii=False)}
-        
-        5. 数据样本（前{min(10, len(sample_data))}行）：
-           {json.dumps(sample_data, ensure_ascii=False, indent=2)}
-        
-        请从以下角度提供专业分析：
-        1. 数据质量综合评价（从1-5星评级）
-        2. 主要问题识别（按严重程度排序）
-        3. 具体改进建议（针对每个问题）
-        4. 数据清洗优先级建议
-        5. 潜在分析价值挖掘
-        
-        请用结构化格式输出，包含清晰的标题和要点。
-        """
+        sample_data = sample_data[:10]
+        report = _flatten_report(data_report)
+        
+        prompt = _ANALYSIS_PROMPT_TEMPLATE.format_map({
+            **report,
+            "columns": _dumps(report["columns"]),
+            "data_types": _dumps(report["data_types"]),
+            "missing_by_column": _dumps(report["missing_by_column"]),
+            "outliers": _dumps(report["outlier_detection"]),
+            "sample_size": len(sample_data),
+            "sample_data": _dumps(sample_data)
+        })
         
         return prompt
     
@@ -167,6 +364,7 @@ class AIAnalyzer:
         """
         # 这里可以添加更复杂的解析逻辑
         # 目前直接返回AI文本内容
+        report = _flatten_report(data_report)
         
         return {
             "ai_analysis": ai_content,
@@ -174,109 +372,38 @@ class AIAnalyzer:
             "key_issues": self._extract_key_issues(ai_content),
             "recommendations": self._extract_recommendations(ai_content),
             "data_report_summary": {
-                "row_count": data_report.get("basic_stats", {}).get("row_count", 0),
-                "missing_percentage": data_report.get("missing_values", {}).get("percentage", 0),
-                "duplicate_percentage": data_report.get("duplicate_rows", {}).get("percentage", 0)
+                "row_count": report["row_count"],
+                "missing_percentage": report["missing_percentage"],
+                "duplicate_percentage": report["duplicate_percentage"]
             }
         }
     
     def _extract_quality_rating(self, content: str) -> int:
         """从内容中提取质量评级（1-5星）"""
-        import re
-        
-        # 查找星级评价
-        patterns = [
-            r'(\d)\s*[颗星★]',
-            r'评分[:：]\s*(\d)',
-            r'(\d)/5',
-            r'quality.*?(\d)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
+        for pattern in _RATING_PATTERNS:
+            match = pattern.search(content)
             if match:
-                try:
-                    rating = int(match.group(1))
-                    if 1 <= rating <= 5:
-                        return rating
-                except:
-                    pass
+                rating = int(match.group(1))
+                if 1 <= rating <= 5:
+                    return rating
         
         # 默认返回3星
         return 3
     
     def _extract_key_issues(self, content: str) -> List[str]:
         """从内容中提取关键问题"""
-        import re
-        
-        issues = []
-        
-        # 查找问题列表
-        lines = content.split('\n')
-        in_issues_section = False
-        
-        issue_patterns = [
-            r'^[•\-*]\s*(.+)',
-            r'^\d+[\.\)]\s*(.+)',
-            r'^[-]\s*(.+)'
-        ]
-        
-        for line in lines:
-            line_lower = line.lower()
-            
-            # 检测问题章节
-            if any(keyword in line_lower for keyword in ['问题', 'issue', 'problem', '缺陷']):
-                in_issues_section = True
-                continue
-            
-            if in_issues_section:
-                # 匹配问题项
-                for pattern in issue_patterns:
-                    match = re.match(pattern, line.strip())
-                    if match:
-                        issue = match.group(1).strip()
-                        if len(issue) > 10:  # 过滤过短的项
-                            issues.append(issue)
+        issues = _scan_sections(content)['issue']
         
         # 如果没有找到结构化问题，返回前3个要点
         if not issues:
-            bullet_points = re.findall(r'[•\-*]\s*(.+)', content)
+            bullet_points = _BULLET_RE.findall(content)
             issues = bullet_points[:3]
         
         return issues[:5]  # 最多返回5个问题
     
     def _extract_recommendations(self, content: str) -> List[str]:
         """从内容中提取建议"""
-        import re
-        
-        recommendations = []
-        
-        # 查找建议列表
-        lines = content.split('\n')
-        in_recommendations_section = False
-        
-        rec_patterns = [
-            r'^[•\-*]\s*(.+)',
-            r'^\d+[\.\)]\s*(.+)',
-            r'^建议[:：]\s*(.+)'
-        ]
-        
-        for line in lines:
-            line_lower = line.lower()
-            
-            # 检测建议章节
-            if any(keyword in line_lower for keyword in ['建议', 'recommendation', 'solution', '改进']):
-                in_recommendations_section = True
-                continue
-            
-            if in_recommendations_section:
-                # 匹配建议项
-                for pattern in rec_patterns:
-                    match = re.match(pattern, line.strip())
-                    if match:
-                        rec = match.group(1).strip()
-                        if len(rec) > 10:  # 过滤过短的项
-                            recommendations.append(rec)
+        recommendations = _scan_sections(content)['rec']
         
         # 如果没有找到结构化建议，返回一些通用建议
         if not recommendations:
@@ -299,36 +426,28 @@ class AIAnalyzer:
         Returns:
             Dict: 模拟分析报告
         """
-        basic_stats = data_report.get("basic_stats", {})
-        missing_values = data_report.get("missing_values", {})
-        duplicate_rows = data_report.get("duplicate_rows", {})
-        outlier_detection = data_report.get("outlier_detection", {})
+        report = _flatten_report(data_report)
+        outlier_detection = report["outlier_detection"]
         
         # 计算质量评级
-        missing_percent = missing_values.get("percentage", 0)
-        duplicate_percent = duplicate_rows.get("percentage", 0)
-        
-        quality_score = 5
-        if missing_percent > 30:
-            quality_score -= 2
-        elif missing_percent > 10:
-            quality_score -= 1
-            
-        if duplicate_percent > 20:
-            quality_score -= 1
-            
-        if len(outlier_detection) > 0:
-            quality_score -= 0.5
+        missing_percent = report["missing_percentage"]
+        duplicate_percent = report["duplicate_percentage"]
+        
+        has_outliers = bool(outlier_detection)
         
-        quality_score = max(1, min(5, int(quality_score)))
+        # 扣分规则合并为一个算式（布尔值按0/1参与运算），再截断到1-5
+        score = (5
+                 - 2 * (missing_percent > 30)
+                 - 1 * (10 < missing_percent <= 30)
+                 - 1 * (duplicate_percent > 20)
+                 - 0.5 * has_outliers)
+        quality_score = max(1, min(5, int(score)))
         
-        key_issues = []
-        if missing_percent > 10:
-            key_issues.append(f"缺失值比例较高 ({missing_percent:.1f}%)，影响分析完整性")
-        if duplicate_percent > 10:
-            key_issues.append(f"存在重复数据 ({duplicate_percent:.1f}%)，可能导致分析偏差")
-        if len(outlier_detection) > 0:
-            key_issues.append(f"数值列存在异常值，需要进一步处理")
+        key_issues = list(filter(None, [
+            missing_percent > 10 and f"缺失值比例较高 ({missing_percent:.1f}%)，影响分析完整性",
+            duplicate_percent > 10 and f"存在重复数据 ({duplicate_percent:.1f}%)，可能导致分析偏差",
+            has_outliers and "数值列存在异常值，需要进一步处理"
+        ]))
         
         recommendations = [
             "使用适当的策略填充或删除缺失值",
@@ -339,12 +458,12 @@ class AIAnalyzer:
         ]
         
         return {
-            "ai_analysis": f"数据质量分析报告\n\n数据集包含{basic_stats.get('row_count', 0)}行，{basic_stats.get('column_count', 0)}列。\n主要问题：{'; '.join(key_issues) if key_issues else '无明显严重问题'}。\n建议按照优先级进行数据清洗。",
+            "ai_analysis": f"数据质量分析报告\n\n数据集包含{report['row_count']}行，{report['column_count']}列。\n主要问题：{'; '.join(key_issues) if key_issues else '无明显严重问题'}。\n建议按照优先级进行数据清洗。",
             "quality_rating": quality_score,
             "key_issues": key_issues,
             "recommendations": recommendations,
             "data_report_summary": {
-                "row_count": basic_stats.get("row_count", 0),
+                "row_count": report["row_count"],
                 "missing_percentage": missing_percent,
                 "duplicate_percentage": duplicate_percent,
                 "outlier_columns_count": len(outlier_detection)
@@ -361,7 +480,7 @@ class AIAnalyzer:
         Returns:
             Dict: 基本分析报告
         """
-        basic_stats = data_report.get("basic_stats", {})
+        report = _flatten_report(data_report)
         
         return {
             "ai_analysis": "数据质量分析暂时不可用，请检查API配置或网络连接。",
@@ -369,7 +488,7 @@ class AIAnalyzer:
             "key_issues": ["无法进行AI分析"],
             "recommendations": ["请确保DeepSeek API密钥正确配置", "检查网络连接", "尝试重新分析"],
             "data_report_summary": {
-                "row_count": basic_stats.get("row_count", 0),
-                "column_count": basic_stats.get("column_count", 0)
+                "row_count": report["row_count"],
+                "column_count": report["column_count"]
             }
         }
\ No newline at end of file
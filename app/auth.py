@@ -2,20 +2,104 @@
 用户认证相关路由
 """
 
-from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify
+from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify, session
 from flask_login import login_user, logout_user, login_required, current_user
-from werkzeug.security import check_password_hash
-from .models import User, db
-from . import login_manager
+from sqlalchemy import insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from .models import User, db, hash_password
+from . import cache, login_manager
 
 bp = Blueprint('auth', __name__)
 
 @login_manager.user_loader
 def load_user(user_id):
     """Flask-Login用户加载器"""
-    return User.query.get(int(user_id))
+    # session.get 优先命中identity map，避免每个请求都发起SELECT
+    return db.session.get(User, int(user_id))
+
+def _skip_page_cache():
+    """只缓存匿名用户、无待显示消息的GET页面"""
+    return (
+        request.method != 'GET'
+        or current_user.is_authenticated
+        or bool(session.get('_flashes'))
+    )
+
+def _insert_ignore_conflicts(table):
+    """构建遇到唯一约束冲突时跳过的INSERT语句"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if dialect == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect == 'mysql':
+        return insert(table).prefix_with('IGNORE')
+    return insert(table)
+
+def create_users(rows, batch_size=1000):
+    """批量创建用户（用户名或邮箱已存在的行会被跳过）
+    
+    Args:
+        rows: 用户数据字典列表，包含username、email、password
+        batch_size: 每批插入并提交的行数
+    Returns:
+        实际创建的用户数
+    """
+    # 在数据库会话之外先计算密码哈希
+    mappings = [
+        {
+            'username': row['username'],
+            'email': row['email'],
+            'password_hash': hash_password(row['password'])
+        }
+        for row in rows
+    ]
+    
+    stmt = _insert_ignore_conflicts(User.__table__)
+    created = 0
+    for start in range(0, len(mappings), batch_size):
+        batch = mappings[start:start + batch_size]
+        try:
+            result = db.session.execute(stmt, batch)
+            db.session.commit()
+            created += max(result.rowcount, 0)
+        except IntegrityError:
+            # 数据库不支持忽略冲突的INSERT：整批回滚后逐行插入，跳过冲突行
+            db.session.rollback()
+            created += _insert_rows_skipping_conflicts(stmt, batch)
+    
+    return created
+
+def _insert_rows_skipping_conflicts(stmt, rows):
+    """逐行插入并提交，违反唯一约束的行回滚跳过，返回实际插入的行数"""
+    created = 0
+    for row in rows:
+        try:
+            db.session.execute(stmt, row)
+            db.session.commit()
+            created += 1
+        except IntegrityError:
+            db.session.rollback()
+    return created
+
+def _taken_fields(username, email):
+    """查询用户名/邮箱中已被占用的字段，返回错误信息列表"""
+    existing = db.session.execute(
+        select(User.username, User.email).where(
+            or_(User.username == username, User.email == email)
+        )
+    ).all()
+    
+    errors = []
+    if any(row.username == username for row in existing):
+        errors.append('用户名已被使用')
+    if any(row.email == email for row in existing):
+        errors.append('邮箱已被使用')
+    return errors
 
 @bp.route('/login', methods=['GET', 'POST'])
+@cache.cached(timeout=300, unless=_skip_page_cache)
 def login():
     """登录页面"""
     if current_user.is_authenticated:
@@ -34,6 +118,10 @@ def login():
         user = User.query.filter_by(username=username).first()
         
         if user and user.check_password(password):
+            # 旧算法的哈希在登录成功后升级为当前算法
+            if user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
             login_user(user, remember=True)
             if request.is_json:
                 return jsonify({'success': True, 'message': '登录成功'})
@@ -47,6 +135,7 @@ def login():
     return render_template('auth/login.html')
 
 @bp.route('/register', methods=['GET', 'POST'])
+@cache.cached(timeout=300, unless=_skip_page_cache)
 def register():
     """注册页面"""
     if current_user.is_authenticated:
@@ -69,14 +158,6 @@ def register():
         # 验证
         errors = []
         
-        # 检查用户名是否已存在
-        if User.query.filter_by(username=username).first():
-            errors.append('用户名已被使用')
-        
-        # 检查邮箱是否已存在
-        if User.query.filter_by(email=email).first():
-            errors.append('邮箱已被使用')
-        
         # 密码确认
         if password != confirm_password:
             errors.append('两次输入的密码不一致')
@@ -85,18 +166,22 @@ def register():
         if len(password) < 6:
             errors.append('密码长度至少6位')
         
+        if not errors:
+            # 创建用户：由数据库唯一索引判重，冲突时不插入
+            created = create_users(
+                [{'username': username, 'email': email, 'password': password}],
+                batch_size=1
+            )
+            if not created:
+                # 仅在冲突时查询具体是哪个字段重复；冲突行可能已被删除，此时同样按失败处理
+                errors = _taken_fields(username, email) or ['注册失败，请重试']
+        
         if errors:
             if request.is_json:
                 return jsonify({'success': False, 'errors': errors}), 400
             for error in errors:
                 flash(error, 'error')
         else:
-            # 创建用户
-            user = User(username=username, email=email)
-            user.set_password(password)
-            db.session.add(user)
-            db.session.commit()
-            
             if request.is_json:
                 return jsonify({'success': True, 'message': '注册成功'})
             flash('注册成功！请登录', 'success')
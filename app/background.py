@@ -0,0 +1,118 @@
+"""
+后台任务模块
+将耗时的清洗、分析、导出和PPT生成请求转到进程内线程池执行，立即返回任务ID
+"""
+
+import functools
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import copy_current_request_context, current_app, jsonify, request
+from flask_login import current_user
+
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+# 后台任务线程池：任务主要耗时在文件解析和外部API调用，线程数不宜过多
+_JOB_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='background-job')
+
+# 任务状态保存时间（秒）；配置Redis缓存时可跨进程查询
+_JOB_TIMEOUT = 24 * 3600
+
+# 进程内缓存：多worker部署时轮询请求可能落到其他进程，查不到任务状态
+_LOCAL_CACHE_TYPES = {'SimpleCache', 'simple'}
+_NULL_CACHE_TYPES = {'NullCache', 'null'}
+
+# 任务状态（与Celery命名一致）
+PENDING = 'PENDING'
+STARTED = 'STARTED'
+SUCCESS = 'SUCCESS'
+FAILURE = 'FAILURE'
+
+
+def _job_key(job_id):
+    return f'background_job:{job_id}'
+
+
+def _save_job(job_id, **fields):
+    """合并更新任务状态"""
+    job = cache.get(_job_key(job_id)) or {}
+    job.update(fields)
+    cache.set(_job_key(job_id), job, timeout=_JOB_TIMEOUT)
+
+
+def get_job(job_id, user_id):
+    """获取任务状态，只返回属于该用户的任务"""
+    job = cache.get(_job_key(job_id))
+    if job is None or job.get('user_id') != user_id:
+        return None
+    return job
+
+
+def _job_store_error():
+    """缓存无法在各worker间共享任务状态时返回错误说明，否则返回None
+
+    单进程部署可设置 BACKGROUND_JOBS_LOCAL_CACHE 允许使用进程内缓存
+    """
+    cache_type = str(current_app.config.get('CACHE_TYPE', '')).rsplit('.', 1)[-1]
+    if cache_type in _NULL_CACHE_TYPES:
+        return f'当前缓存类型 {cache_type} 不保存数据，无法使用后台任务'
+    if cache_type in _LOCAL_CACHE_TYPES and not current_app.config.get('BACKGROUND_JOBS_LOCAL_CACHE'):
+        return f'当前缓存类型 {cache_type} 为进程内缓存，后台任务需要配置 CACHE_REDIS_URL'
+    return None
+
+
+def _wants_background():
+    """请求是否要求后台执行（查询参数 ?async=1）"""
+    return request.args.get('async', 'false').lower() in ('1', 'true')
+
+
+def background_capable(view):
+    """
+    视图装饰器：带 ?async=1 时将视图放到后台线程执行，立即返回202和任务ID
+
+    后台线程复制当前请求上下文运行原视图（登录用户、请求参数与同步调用一致），
+    视图返回的JSON及状态码保存为任务结果，可通过 /api/jobs/<job_id> 查询。
+    不带该参数时保持同步执行；缓存不能跨进程共享任务状态时拒绝后台执行并返回503
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not _wants_background():
+            return view(*args, **kwargs)
+
+        store_error = _job_store_error()
+        if store_error:
+            logger.error(f"拒绝后台执行 {request.endpoint}: {store_error}")
+            return jsonify({'success': False, 'message': store_error}), 503
+
+        # 请求体在响应返回后不可再读取，提交前先缓存
+        request.get_data(cache=True)
+
+        job_id = uuid.uuid4().hex
+        _save_job(job_id, user_id=current_user.id, endpoint=request.endpoint, state=PENDING)
+
+        @copy_current_request_context
+        def run():
+            _save_job(job_id, state=STARTED)
+            try:
+                rv = view(*args, **kwargs)
+                response, status = (rv if isinstance(rv, tuple) else (rv, None))
+                response = jsonify(response) if isinstance(response, dict) else response
+                status = status or response.status_code
+                _save_job(
+                    job_id,
+                    state=SUCCESS if status < 400 else FAILURE,
+                    status_code=status,
+                    result=response.get_json()
+                )
+            except Exception as e:
+                logger.exception(f"后台任务执行失败: {job_id}")
+                _save_job(job_id, state=FAILURE, status_code=500,
+                          result={'success': False, 'message': f'任务执行失败: {str(e)}'})
+
+        _JOB_POOL.submit(run)
+        return jsonify({'success': True, 'job_id': job_id, 'state': PENDING}), 202
+
+    return wrapper
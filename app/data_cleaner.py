@@ -7,25 +7,331 @@ import pandas as pd
 import numpy as np
 import json
 import os
+import warnings
 from typing import Dict, List, Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import python_calamine  # noqa: F401  pandas的calamine引擎依赖
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+# 数值块小于该单元格数时JIT编译开销大于收益，直接使用NumPy
+_NUMBA_MIN_CELLS = 100_000
+
+# 类型转换选项对应的批量转换函数（输入输出均为DataFrame）
+_TYPE_CONVERTERS = {
+    "numeric": lambda frame: frame.apply(pd.to_numeric, errors='coerce'),
+    "datetime": lambda frame: frame.apply(pd.to_datetime, errors='coerce'),
+    "category": lambda frame: frame.astype('category')
+}
+
+# 可视化数据中每列最多返回的数据点数，超出时均匀随机抽样
+_VIZ_MAX_POINTS = 10_000
+
+_SHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_MERGE_CELL_TAG = _SHEET_NS + 'mergeCell'
+
+# 探测合并单元格时按块扫描工作表XML的字节数
+_MERGE_PROBE_BLOCK = 1 << 20
+
+
+def _read_merged_ranges(ws) -> List[Tuple[int, int, int, int]]:
+    """
+    从只读工作表的XML中读取合并单元格区域
+    
+    只读模式不提供 merged_cells，这里流式扫描 <mergeCell> 节点，
+    返回 (min_row, min_col, max_row, max_col) 列表
+    """
+    from xml.etree.ElementTree import iterparse
+    from openpyxl.utils.cell import range_boundaries
+    
+    ranges = []
+    with ws._get_source() as src:
+        for _, element in iterparse(src):
+            if element.tag == _MERGE_CELL_TAG:
+                min_col, min_row, max_col, max_row = range_boundaries(element.get('ref'))
+                ranges.append((min_row, min_col, max_row, max_col))
+            element.clear()
+    return ranges
+
+
+def _probe_active_sheet(file_path: str) -> Tuple[int, bool]:
+    """
+    不解析单元格，直接从xlsx压缩包中定位活动工作表并探测是否含合并单元格
+    
+    按字节块搜索 mergeCell 标记，误判（如内联文本恰好包含该词）只会回退到
+    较慢但结果相同的openpyxl路径。返回 (工作表序号, 是否含合并单元格)
+    """
+    import zipfile
+    from xml.etree import ElementTree
+    
+    with zipfile.ZipFile(file_path) as zf:
+        workbook = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+        view = workbook.find(f'{_SHEET_NS}bookViews/{_SHEET_NS}workbookView')
+        index = int(view.get('activeTab', 0)) if view is not None else 0
+        sheets = workbook.findall(f'{_SHEET_NS}sheets/{_SHEET_NS}sheet')
+        rel_id = sheets[index].get(f'{_REL_NS}id')
+        
+        rels = ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+        target = next(rel.get('Target') for rel in rels if rel.get('Id') == rel_id)
+        part = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+        
+        marker = b'mergeCell'
+        tail = b''
+        with zf.open(part) as src:
+            while True:
+                block = src.read(_MERGE_PROBE_BLOCK)
+                if not block:
+                    return index, False
+                if marker in tail + block:
+                    return index, True
+                tail = block[-len(marker):]
+
+
+def _read_sheet_calamine(file_path: str, sheet_index: int) -> np.ndarray:
+    """使用Rust实现的calamine引擎读取工作表为二维object数组（不处理合并单元格）"""
+    raw = pd.read_excel(file_path, sheet_name=sheet_index, header=None, engine='calamine')
+    # 空单元格统一为None，与openpyxl路径保持一致
+    return raw.astype(object).where(raw.notna(), None).to_numpy()
+
+
+def _iter_excel_rows(df: pd.DataFrame, chunk_size: int):
+    """逐行产出表头和数据，数据按块转换为object类型，缺失值转为None（空单元格）"""
+    yield list(df.columns)
+    for start in range(0, len(df), chunk_size):
+        block = df.iloc[start:start + chunk_size].astype(object)
+        block = block.where(block.notna(), None)
+        yield from block.itertuples(index=False, name=None)
+
+
+def _write_excel(df: pd.DataFrame, output_path: str, chunk_size: int = 10000) -> None:
+    """
+    流式导出Excel，不在内存中构建整张表的单元格对象
+    
+    安装了xlsxwriter时使用其constant_memory模式（每行写完即落盘，速度更快），
+    否则使用openpyxl只写模式
+    """
+    rows = _iter_excel_rows(df, chunk_size)
+    
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+    
+    if xlsxwriter is not None:
+        wb = xlsxwriter.Workbook(output_path, {
+            'constant_memory': True,
+            # 文本原样写入，不识别为公式或超链接
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+            'remove_timezone': True,
+        })
+        ws = wb.add_worksheet()
+        for row_idx, row in enumerate(rows):
+            ws.write_row(row_idx, 0, row)
+        wb.close()
+        return
+    
+    import openpyxl
+    
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for row in rows:
+        ws.append(row)
+    wb.save(output_path)
+
+
+def iter_json_records(df: pd.DataFrame, chunk_size: int = 10000):
+    """按块产出records格式的JSON数组文本，内存占用只与块大小有关"""
+    yield '['
+    first = True
+    for start in range(0, len(df), chunk_size):
+        body = df.iloc[start:start + chunk_size].to_json(orient="records")[1:-1]
+        if body:
+            yield body if first else ',' + body
+            first = False
+    yield ']'
+
+
+def iter_html_table(df: pd.DataFrame, chunk_size: int = 10000):
+    """按块产出HTML表格文本，拼接结果与to_html(index=False)一致"""
+    head, tail = df.head(0).to_html(index=False).split('<tbody>\n')
+    yield head + '<tbody>\n'
+    for start in range(0, len(df), chunk_size):
+        rows = df.iloc[start:start + chunk_size].to_html(index=False, header=False)
+        yield rows[rows.index('<tbody>\n') + 8:rows.rindex('</tbody>')].rstrip(' ')
+    yield tail
+
+
+def iter_csv(df: pd.DataFrame, chunk_size: int = 50000):
+    """按块产出CSV文本，拼接结果与to_csv(index=False)一致"""
+    yield df.head(0).to_csv(index=False, lineterminator='\n')
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size].to_csv(index=False, header=False, lineterminator='\n')
+
+
+def _write_json_records(df: pd.DataFrame, output_path: str, chunk_size: int = 10000) -> None:
+    """按块写出records格式的JSON数组"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.writelines(iter_json_records(df, chunk_size))
+
+
+def _write_html_table(df: pd.DataFrame, output_path: str, chunk_size: int = 10000) -> None:
+    """按块写出HTML表格，输出与to_html(index=False)一致"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.writelines(iter_html_table(df, chunk_size))
+
+
+def _write_parquet(df: pd.DataFrame, output_path: str) -> None:
+    """以zstd压缩的Parquet列式格式导出（需安装pyarrow），非字符串列名转为字符串"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ValueError("导出Parquet格式需要安装pyarrow")
+    
+    if not all(isinstance(col, str) for col in df.columns):
+        df = df.set_axis([str(col) for col in df.columns], axis=1)
+    df.to_parquet(output_path, engine="pyarrow", compression="zstd", index=False)
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _sorted_quantile(sorted_values, q):
+        """已排序数组的线性插值分位数（与np.nanquantile默认方法一致）"""
+        position = (sorted_values.size - 1) * q
+        low = int(np.floor(position))
+        high = min(low + 1, sorted_values.size - 1)
+        return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+    
+    @njit(parallel=True, cache=True)
+    def _iqr_outlier_kernel(values):
+        """按列并行计算IQR上下界、异常值数量及最小/最大值"""
+        column_count = values.shape[1]
+        lower = np.full(column_count, np.nan)
+        upper = np.full(column_count, np.nan)
+        counts = np.zeros(column_count, dtype=np.int64)
+        minimums = np.full(column_count, np.nan)
+        maximums = np.full(column_count, np.nan)
+        
+        for j in prange(column_count):
+            column = values[:, j]
+            finite = np.sort(column[~np.isnan(column)])
+            if finite.size == 0:
+                continue
+            q1 = _sorted_quantile(finite, 0.25)
+            q3 = _sorted_quantile(finite, 0.75)
+            iqr = q3 - q1
+            lower[j] = q1 - 1.5 * iqr
+            upper[j] = q3 + 1.5 * iqr
+            counts[j] = np.sum((finite < lower[j]) | (finite > upper[j]))
+            minimums[j] = finite[0]
+            maximums[j] = finite[-1]
+        
+        return lower, upper, counts, minimums, maximums
+
+
+def _iqr_outlier_stats(values: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    按列计算IQR异常值统计
+    
+    Returns:
+        Tuple: (下界, 上界, 异常值数量, 最小值, 最大值)，均为长度等于列数的数组
+    """
+    if HAS_NUMBA and values.size >= _NUMBA_MIN_CELLS:
+        return _iqr_outlier_kernel(np.ascontiguousarray(values, dtype=np.float64))
+    
+    # 0/1分位数即最小/最大值，一次nanquantile同时得到四个统计量（全为NaN的列返回NaN）
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        minimums, q1, q3, maximums = np.nanquantile(values, [0, 0.25, 0.75, 1], axis=0)
+    iqr = q3 - q1
+    lower_bounds = q1 - 1.5 * iqr
+    upper_bounds = q3 + 1.5 * iqr
+    counts = ((values < lower_bounds) | (values > upper_bounds)).sum(axis=0)
+    return lower_bounds, upper_bounds, counts, minimums, maximums
+
+
+def read_sheet_values(file_path: str) -> np.ndarray:
+    """
+    读取活动工作表为二维object数组，并用左上角的值填充合并单元格
+    
+    打开工作簿前先探测活动工作表是否含合并单元格。安装了python-calamine时，
+    不含合并单元格的工作表及.xls文件交给calamine引擎解析；其余情况以openpyxl
+    只读模式读取，且只在含合并单元格时才再次扫描工作表XML读取合并区域
+    """
+    is_xlsx = file_path.lower().endswith('.xlsx')
+    if is_xlsx:
+        sheet_index, has_merges = _probe_active_sheet(file_path)
+    else:
+        sheet_index, has_merges = 0, True
+    
+    if HAS_CALAMINE and (not is_xlsx or not has_merges):
+        return _read_sheet_calamine(file_path, sheet_index)
+    
+    import openpyxl
+    
+    wb = openpyxl.load_workbook(file_path, data_only=True, read_only=True)
+    try:
+        ws = wb.active
+        # 部分工具生成的文件缺少或写错维度信息，此时按实际内容读取
+        try:
+            ws.calculate_dimension()
+        except ValueError:
+            ws.reset_dimensions()
+        
+        rows = list(ws.iter_rows(values_only=True))
+        merged_ranges = _read_merged_ranges(ws) if has_merges else []
+    finally:
+        wb.close()
+    
+    # 按最大行列数分配数组，长度不一的行（含超出维度的合并区域）以None补齐
+    height = max([len(rows)] + [r[2] for r in merged_ranges])
+    width = max([len(row) for row in rows] + [r[3] for r in merged_ranges] + [0])
+    if height == len(rows) and all(len(row) == width for row in rows):
+        # 维度信息正确时各行等长，一次构造二维数组
+        values = np.array(rows, dtype=object).reshape(height, width)
+    else:
+        values = np.full((height, width), None, dtype=object)
+        for i, row in enumerate(rows):
+            values[i, :len(row)] = row
+    
+    # 每个合并区域一次切片赋值
+    for min_row, min_col, max_row, max_col in merged_ranges:
+        values[min_row - 1:max_row, min_col - 1:max_col] = values[min_row - 1, min_col - 1]
+    
+    return values
+
 class DataCleaner:
     """数据清洗器"""
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, use_dask: bool = False):
         """
         初始化数据清洗器
         
         Args:
             file_path: Excel文件路径
+            use_dask: 是否使用Dask分块处理超出内存的大文件（需安装dask，
+                仅支持加载、清洗和CSV导出）
         """
         self.file_path = file_path
+        self.use_dask = use_dask
         self.df = None
         self.cleaned_df = None
         self.cleaning_report = {}
+        self._numeric_cols_cache = []
+        self._quality_stats = None
         
     def load_data(self) -> bool:
         """
@@ -34,34 +340,32 @@ class DataCleaner:
         Returns:
             bool: 是否成功加载
         """
+        if self.use_dask:
+            try:
+                return self._load_data_dask()
+            except ImportError:
+                logger.warning("dask未安装，使用pandas加载数据")
+                self.use_dask = False
+        
+        self._quality_stats = None
+        
         try:
             _, ext = os.path.splitext(self.file_path)
             ext = ext.lower()
             
             if ext == '.csv':
                 self.df = pd.read_csv(self.file_path)
+            elif ext == '.parquet':
+                # 导出的Parquet文件可直接重新加载，列类型保持不变
+                self.df = pd.read_parquet(self.file_path)
             elif ext in ['.xlsx', '.xls']:
-                # 使用openpyxl读取，支持合并单元格处理
-                import openpyxl
-                from openpyxl.utils import get_column_letter
-                
-                wb = openpyxl.load_workbook(self.file_path, data_only=True)
-                ws = wb.active
-                
-                # 处理合并单元格
-                merged_ranges = ws.merged_cells.ranges
-                for merged_range in list(merged_ranges):
-                    top_left_cell = ws.cell(row=merged_range.min_row, column=merged_range.min_col)
-                    top_left_value = top_left_cell.value
-                    
-                    for row in range(merged_range.min_row, merged_range.max_row + 1):
-                        for col in range(merged_range.min_col, merged_range.max_col + 1):
-                            cell = ws.cell(row=row, column=col)
-                            cell.value = top_left_value
-                
-                data = ws.values
-                columns = next(data)
-                self.df = pd.DataFrame(data, columns=columns)
+                # 读取活动工作表（calamine或openpyxl只读模式），支持合并单元格处理
+                values = read_sheet_values(self.file_path)
+                if len(values) == 0:
+                    logger.error("工作表为空")
+                    return False
+                # object数组构造的DataFrame需重新推断列类型
+                self.df = pd.DataFrame(values[1:], columns=values[0]).infer_objects()
             else:
                 logger.error(f"不支持的文件格式: {ext}")
                 return False
@@ -78,6 +382,64 @@ class DataCleaner:
             logger.error(f"数据加载失败: {str(e)}")
             return False
     
+    def _numeric_columns(self, df) -> pd.Index:
+        """
+        获取数值列，按DataFrame对象缓存
+        
+        最多保留两份（通常为self.df与cleaned_df），替换或重新加载数据后自动重新计算
+        """
+        for frame, columns in self._numeric_cols_cache:
+            if frame is df:
+                return columns
+        columns = df.select_dtypes(include=['number']).columns
+        self._remember_numeric_columns(df, columns)
+        return columns
+    
+    def _remember_numeric_columns(self, df, columns: pd.Index) -> None:
+        """记录某个DataFrame的数值列"""
+        self._numeric_cols_cache = [(df, columns)] + [
+            entry for entry in self._numeric_cols_cache if entry[0] is not df
+        ][:1]
+    
+    def _cached_quality_stat(self, name: str) -> Optional[pd.Series]:
+        """取analyze_data_quality留下的统计结果，self.df已被替换时返回None"""
+        if self._quality_stats is not None and self._quality_stats["df"] is self.df:
+            return self._quality_stats[name]
+        return None
+    
+    def _load_data_dask(self) -> bool:
+        """使用Dask按64MB分块加载数据，Excel先读入pandas再按CPU核数分区"""
+        import dask.dataframe as dd
+        
+        try:
+            _, ext = os.path.splitext(self.file_path)
+            ext = ext.lower()
+            
+            if ext == '.csv':
+                ddf = dd.read_csv(self.file_path, blocksize="64MB")
+            elif ext in ['.xlsx', '.xls']:
+                values = read_sheet_values(self.file_path)
+                if len(values) == 0:
+                    logger.error("工作表为空")
+                    return False
+                pdf = pd.DataFrame(values[1:], columns=values[0]).infer_objects()
+                ddf = dd.from_pandas(pdf, npartitions=os.cpu_count() or 1)
+            else:
+                logger.error(f"不支持的文件格式: {ext}")
+                return False
+            
+            # 删除完全空的行和列（Dask不支持按列dropna，先算出全空列再删除）
+            ddf = ddf.dropna(how='all')
+            all_null = ddf.isnull().all().compute()
+            self.df = ddf.drop(columns=list(all_null[all_null].index))
+            
+            logger.info(f"数据加载成功(Dask): {self.df.npartitions}个分区, {len(self.df.columns)}列")
+            return True
+            
+        except Exception as e:
+            logger.error(f"数据加载失败: {str(e)}")
+            return False
+    
     def analyze_data_quality(self) -> Dict[str, Any]:
         """
         分析数据质量
@@ -88,64 +450,65 @@ class DataCleaner:
         if self.df is None:
             return {"error": "数据未加载"}
         
+        # 缺失值与重复行各只扫描一次，后续统计复用结果
+        row_count = len(self.df)
+        null_per_col = self.df.isnull().sum()
+        null_total = int(null_per_col.sum())
+        dup_mask = self.df.duplicated()
+        dup_count = int(dup_mask.sum())
+        
+        # 保留给随后的clean_data复用
+        self._quality_stats = {"df": self.df, "null_per_col": null_per_col, "dup_mask": dup_mask}
+        
         report = {
             "basic_stats": {
-                "row_count": len(self.df),
+                "row_count": row_count,
                 "column_count": len(self.df.columns),
                 "columns": list(self.df.columns),
                 "data_types": {str(dtype): int(count) for dtype, count in self.df.dtypes.value_counts().items()}
             },
             "missing_values": {
-                "total": int(self.df.isnull().sum().sum()),
-                "by_column": {col: int(count) for col, count in self.df.isnull().sum().items()},
-                "percentage": float(self.df.isnull().sum().sum() / (len(self.df) * len(self.df.columns)) * 100) if len(self.df) > 0 else 0
+                "total": null_total,
+                "by_column": {col: int(count) for col, count in null_per_col.items()},
+                "percentage": float(null_total / (row_count * len(self.df.columns)) * 100) if row_count > 0 else 0
             },
             "duplicate_rows": {
-                "count": int(self.df.duplicated().sum()),
-                "percentage": float(self.df.duplicated().sum() / len(self.df) * 100) if len(self.df) > 0 else 0
+                "count": dup_count,
+                "percentage": float(dup_count / row_count * 100) if row_count > 0 else 0
             },
             "data_type_issues": [],
             "outlier_detection": {}
         }
         
-        # 检测数据类型问题
-        for col in self.df.columns:
-            col_type = str(self.df[col].dtype)
-            if col_type == 'object':
-                # 检查是否可以转换为数值
-                try:
-                    pd.to_numeric(self.df[col].dropna())
-                    report["data_type_issues"].append({
-                        "column": col,
-                        "issue": "文本列包含数值数据",
-                        "suggestion": "转换为数值类型"
-                    })
-                except:
-                    pass
+        # 检测数据类型问题：文本列强制转数值后非空数量不变，说明整列都是数值
+        text_df = self.df.select_dtypes(include=['object', 'string'])
+        for col in text_df.columns:
+            column = text_df[col]
+            coerced = pd.to_numeric(column, errors='coerce')
+            if coerced.notna().sum() == column.notna().sum():
+                report["data_type_issues"].append({
+                    "column": col,
+                    "issue": "文本列包含数值数据",
+                    "suggestion": "转换为数值类型"
+                })
         
         # 数值列的异常值检测
-        numeric_cols = self.df.select_dtypes(include=['number']).columns
-        if len(numeric_cols) > 0:
+        numeric_df = self.df[self._numeric_columns(self.df)]
+        if numeric_df.shape[1] > 0:
             outlier_info = {}
-            for col in numeric_cols:
-                q1 = self.df[col].quantile(0.25)
-                q3 = self.df[col].quantile(0.75)
-                iqr = q3 - q1
-                lower_bound = q1 - 1.5 * iqr
-                upper_bound = q3 + 1.5 * iqr
-                
-                outliers = self.df[(self.df[col] < lower_bound) | (self.df[col] > upper_bound)][col]
-                outlier_count = len(outliers)
-                
-                if outlier_count > 0:
-                    outlier_info[col] = {
-                        "count": outlier_count,
-                        "percentage": float(outlier_count / len(self.df) * 100),
-                        "lower_bound": float(lower_bound),
-                        "upper_bound": float(upper_bound),
-                        "min": float(self.df[col].min()),
-                        "max": float(self.df[col].max())
-                    }
+            values = numeric_df.to_numpy(dtype=float, na_value=np.nan)
+            lower_bounds, upper_bounds, outlier_counts, minimums, maximums = _iqr_outlier_stats(values)
+            
+            for i in np.flatnonzero(outlier_counts):
+                outlier_count = int(outlier_counts[i])
+                outlier_info[numeric_df.columns[i]] = {
+                    "count": outlier_count,
+                    "percentage": float(outlier_count / len(self.df) * 100),
+                    "lower_bound": float(lower_bounds[i]),
+                    "upper_bound": float(upper_bounds[i]),
+                    "min": float(minimums[i]),
+                    "max": float(maximums[i])
+                }
             
             report["outlier_detection"] = outlier_info
         
@@ -164,6 +527,9 @@ class DataCleaner:
         if self.df is None:
             raise ValueError("数据未加载，请先调用load_data()")
         
+        if self.use_dask:
+            return self._clean_data_dask(options)
+        
         self.cleaning_report = {
             "original_shape": self.df.shape,
             "applied_operations": [],
@@ -173,7 +539,9 @@ class DataCleaner:
             "converted_columns": []
         }
         
-        df_clean = self.df.copy()
+        # 浅拷贝即可：pandas 3默认写时复制，后续按列赋值不会改动self.df，也无需预先复制整表
+        df_clean = self.df.copy(deep=False)
+        numeric_cols = self._numeric_columns(self.df)
         
         # 1. 缺失值处理
         missing_strategy = options.get("missing_strategy", "drop")
@@ -186,34 +554,36 @@ class DataCleaner:
             self.cleaning_report["applied_operations"].append(f"删除包含缺失值的行: {removed}行")
             self.cleaning_report["removed_rows"] += removed
             
-        elif missing_strategy == "mean":
-            # 数值列用均值填充
-            numeric_cols = df_clean.select_dtypes(include=['number']).columns
-            for col in numeric_cols:
-                fill_value = df_clean[col].mean()
-                missing_count = df_clean[col].isnull().sum()
-                df_clean[col] = df_clean[col].fillna(fill_value)
-                self.cleaning_report["filled_missing"] += missing_count
-            
-            self.cleaning_report["applied_operations"].append("数值列缺失值用均值填充")
+        elif missing_strategy in ("mean", "median"):
+            # 数值列用均值/中位数填充：整块数值列一次聚合、一次按掩码赋值
+            values = df_clean[numeric_cols].to_numpy(dtype=float, na_value=np.nan, copy=True)
+            nan_mask = np.isnan(values)
             
-        elif missing_strategy == "median":
-            # 数值列用中位数填充
-            numeric_cols = df_clean.select_dtypes(include=['number']).columns
-            for col in numeric_cols:
-                fill_value = df_clean[col].median()
-                missing_count = df_clean[col].isnull().sum()
-                df_clean[col] = df_clean[col].fillna(fill_value)
-                self.cleaning_report["filled_missing"] += missing_count
+            if nan_mask.any():
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    aggregate = np.nanmean if missing_strategy == "mean" else np.nanmedian
+                    fill_values = aggregate(values, axis=0)
+                np.copyto(values, fill_values, where=nan_mask)
+                
+                # 只回写含缺失值的列，无缺失的整数列保持原类型
+                has_missing = nan_mask.any(axis=0)
+                df_clean[numeric_cols[has_missing]] = values[:, has_missing]
+                self.cleaning_report["filled_missing"] += int(nan_mask.sum())
             
-            self.cleaning_report["applied_operations"].append("数值列缺失值用中位数填充")
+            label = "均值" if missing_strategy == "mean" else "中位数"
+            self.cleaning_report["applied_operations"].append(f"数值列缺失值用{label}填充")
             
         elif missing_strategy == "custom":
             # 自定义填充值
             fill_values = options.get("fill_values", {})
+            null_per_col = self._cached_quality_stat("null_per_col")
             for col, value in fill_values.items():
                 if col in df_clean.columns:
-                    missing_count = df_clean[col].isnull().sum()
+                    if null_per_col is not None:
+                        missing_count = int(null_per_col[col])
+                    else:
+                        missing_count = int(df_clean[col].isnull().sum())
                     df_clean[col] = df_clean[col].fillna(value)
                     self.cleaning_report["filled_missing"] += missing_count
             
@@ -222,57 +592,84 @@ class DataCleaner:
         # 2. 重复值处理
         if options.get("remove_duplicates", True):
             original_rows = len(df_clean)
-            df_clean = df_clean.drop_duplicates()
+            # 只删除了行、未改动取值时，analyze_data_quality算出的重复标记仍然有效
+            dup_mask = self._cached_quality_stat("dup_mask")
+            if dup_mask is not None and missing_strategy not in ("mean", "median", "custom") \
+                    and self.df.index.is_unique:
+                df_clean = df_clean[~dup_mask.loc[df_clean.index]]
+            else:
+                df_clean = df_clean.drop_duplicates()
             removed = original_rows - len(df_clean)
             self.cleaning_report["applied_operations"].append(f"删除重复行: {removed}行")
             self.cleaning_report["removed_rows"] += removed
         
         # 3. 数据类型转换
+        # 相同目标类型的列一次批量转换，批量失败时再逐列转换以定位问题列
         type_conversions = options.get("type_conversions", {})
+        conversion_groups = {}
         for col, target_type in type_conversions.items():
             if col in df_clean.columns:
-                original_type = str(df_clean[col].dtype)
-                
+                conversion_groups.setdefault(target_type, []).append(col)
+        
+        converted = {}
+        for target_type, cols in conversion_groups.items():
+            converter = _TYPE_CONVERTERS.get(target_type)
+            original_types = {col: str(df_clean[col].dtype) for col in cols}
+            
+            if converter is None:
+                succeeded = cols
+            else:
                 try:
-                    if target_type == "numeric":
-                        df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
-                    elif target_type == "datetime":
-                        df_clean[col] = pd.to_datetime(df_clean[col], errors='coerce')
-                    elif target_type == "category":
-                        df_clean[col] = df_clean[col].astype('category')
-                    
-                    self.cleaning_report["converted_columns"].append({
-                        "column": col,
-                        "from": original_type,
-                        "to": target_type
-                    })
-                except Exception as e:
-                    logger.warning(f"列 {col} 类型转换失败: {str(e)}")
+                    df_clean[cols] = converter(df_clean[cols])
+                    succeeded = cols
+                except Exception:
+                    succeeded = []
+                    for col in cols:
+                        try:
+                            df_clean[[col]] = converter(df_clean[[col]])
+                            succeeded.append(col)
+                        except Exception as e:
+                            logger.warning(f"列 {col} 类型转换失败: {str(e)}")
+            
+            for col in succeeded:
+                converted[col] = {
+                    "column": col,
+                    "from": original_types[col],
+                    "to": target_type
+                }
+        
+        # 按用户给出的顺序记录转换结果
+        self.cleaning_report["converted_columns"].extend(
+            converted[col] for col in type_conversions if col in converted
+        )
+        
+        # 自定义填充或类型转换可能改变列类型，需重新识别数值列
+        if missing_strategy == "custom" or self.cleaning_report["converted_columns"]:
+            numeric_cols = df_clean.select_dtypes(include=['number']).columns
         
         # 4. 异常值处理
         outlier_strategy = options.get("outlier_strategy", None)
         if outlier_strategy == "cap":
-            # 使用分位数缩尾法处理异常值
-            numeric_cols = df_clean.select_dtypes(include=['number']).columns
-            for col in numeric_cols:
-                lower = df_clean[col].quantile(0.01)
-                upper = df_clean[col].quantile(0.99)
-                df_clean[col] = df_clean[col].clip(lower, upper)
+            # 使用分位数缩尾法处理异常值：整块数值列一次求分位数、一次按列裁剪
+            if len(numeric_cols) > 0:
+                numeric_df = df_clean[numeric_cols]
+                values = numeric_df.to_numpy(dtype=float, na_value=np.nan)
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    lower, upper = np.nanquantile(values, [0.01, 0.99], axis=0)
+                # DataFrame.clip按列广播上下界，并保持整数列的原有类型
+                df_clean[numeric_cols] = numeric_df.clip(lower, upper, axis=1)
             
             self.cleaning_report["applied_operations"].append("使用分位数缩尾法处理异常值")
         
         elif outlier_strategy == "remove":
-            # 删除异常值
-            numeric_cols = df_clean.select_dtypes(include=['number']).columns
-            for col in numeric_cols:
-                q1 = df_clean[col].quantile(0.25)
-                q3 = df_clean[col].quantile(0.75)
-                iqr = q3 - q1
-                lower_bound = q1 - 1.5 * iqr
-                upper_bound = q3 + 1.5 * iqr
-                
-                mask = (df_clean[col] >= lower_bound) & (df_clean[col] <= upper_bound)
-                removed = len(df_clean) - mask.sum()
+            # 删除异常值（所有数值列的上下界一次算出，任一列越界即删除该行）
+            numeric_df = df_clean[numeric_cols]
+            if numeric_df.shape[1] > 0:
+                values = numeric_df.to_numpy(dtype=float, na_value=np.nan)
+                lower_bounds, upper_bounds = _iqr_outlier_stats(values)[:2]
+                mask = ((values >= lower_bounds) & (values <= upper_bounds)).all(axis=1)
+                removed = int(len(df_clean) - mask.sum())
                 df_clean = df_clean[mask]
                 self.cleaning_report["removed_rows"] += removed
             
@@ -290,6 +687,125 @@ class DataCleaner:
             "转换列数": len(self.cleaning_report["converted_columns"])
         }
         
+        self.cleaned_df = df_clean
+        self._remember_numeric_columns(df_clean, numeric_cols)
+        return df_clean, self.cleaning_report
+    
+    def _clean_data_dask(self, options: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Dask版本的数据清洗，选项与clean_data一致
+        
+        填充值和分位数等全局统计量先compute出来，再按分区并行应用；
+        删除行数只统计总数
+        """
+        import dask
+        import dask.dataframe as dd
+        
+        df_clean = self.df
+        operations = []
+        converted_columns = []
+        filled_missing = 0
+        original_rows = df_clean.shape[0]
+        numeric_cols = list(self._numeric_columns(self.df))
+        
+        # 1. 缺失值处理
+        missing_strategy = options.get("missing_strategy", "drop")
+        
+        if missing_strategy == "drop":
+            df_clean = df_clean.dropna()
+            operations.append("删除包含缺失值的行")
+        
+        elif missing_strategy in ("mean", "median"):
+            numeric_df = df_clean[numeric_cols]
+            stats = numeric_df.mean() if missing_strategy == "mean" else numeric_df.quantile(0.5)
+            fill_values, filled_missing = dask.compute(stats, numeric_df.isnull().sum().sum())
+            df_clean = df_clean.fillna(fill_values.to_dict())
+            
+            label = "均值" if missing_strategy == "mean" else "中位数"
+            operations.append(f"数值列缺失值用{label}填充")
+        
+        elif missing_strategy == "custom":
+            fill_values = {col: value for col, value in options.get("fill_values", {}).items()
+                           if col in df_clean.columns}
+            if fill_values:
+                filled_missing = df_clean[list(fill_values)].isnull().sum().sum().compute()
+                df_clean = df_clean.fillna(fill_values)
+            
+            operations.append(f"使用自定义值填充缺失值: {list(options.get('fill_values', {}).keys())}")
+        
+        # 2. 重复值处理
+        if options.get("remove_duplicates", True):
+            df_clean = df_clean.drop_duplicates()
+            operations.append("删除重复行")
+        
+        # 3. 数据类型转换
+        for col, target_type in options.get("type_conversions", {}).items():
+            if col in df_clean.columns:
+                original_type = str(df_clean[col].dtype)
+                
+                try:
+                    if target_type == "numeric":
+                        df_clean[col] = dd.to_numeric(df_clean[col], errors='coerce')
+                    elif target_type == "datetime":
+                        df_clean[col] = dd.to_datetime(df_clean[col], errors='coerce')
+                    elif target_type == "category":
+                        df_clean[col] = df_clean[col].astype('category')
+                    
+                    converted_columns.append({
+                        "column": col,
+                        "from": original_type,
+                        "to": target_type
+                    })
+                except Exception as e:
+                    logger.warning(f"列 {col} 类型转换失败: {str(e)}")
+        
+        if missing_strategy == "custom" or converted_columns:
+            numeric_cols = list(df_clean.select_dtypes(include=['number']).columns)
+        
+        # 4. 异常值处理
+        outlier_strategy = options.get("outlier_strategy", None)
+        
+        if outlier_strategy == "cap" and numeric_cols:
+            quantiles = df_clean[numeric_cols].quantile([0.01, 0.99]).compute()
+            df_clean[numeric_cols] = df_clean[numeric_cols].clip(
+                lower=quantiles.loc[0.01], upper=quantiles.loc[0.99], axis=1
+            )
+            operations.append("使用分位数缩尾法处理异常值")
+        
+        elif outlier_strategy == "remove" and numeric_cols:
+            quantiles = df_clean[numeric_cols].quantile([0.25, 0.75]).compute()
+            iqr = quantiles.loc[0.75] - quantiles.loc[0.25]
+            lower_bounds = quantiles.loc[0.25] - 1.5 * iqr
+            upper_bounds = quantiles.loc[0.75] + 1.5 * iqr
+            
+            numeric_df = df_clean[numeric_cols]
+            mask = (numeric_df.ge(lower_bounds, axis=1) & numeric_df.le(upper_bounds, axis=1)).all(axis=1)
+            df_clean = df_clean[mask]
+            operations.append("删除异常值行")
+        
+        original_rows, final_rows = dask.compute(original_rows, df_clean.shape[0])
+        original_shape = (int(original_rows), len(self.df.columns))
+        final_shape = (int(final_rows), len(df_clean.columns))
+        
+        self.cleaning_report = {
+            "original_shape": original_shape,
+            "applied_operations": operations,
+            "removed_rows": original_shape[0] - final_shape[0],
+            "removed_columns": 0,
+            "filled_missing": int(filled_missing),
+            "converted_columns": converted_columns,
+            "final_shape": final_shape,
+            "cleaning_summary": {
+                "原始数据行数": original_shape[0],
+                "原始数据列数": original_shape[1],
+                "清洗后行数": final_shape[0],
+                "清洗后列数": final_shape[1],
+                "总删除行数": original_shape[0] - final_shape[0],
+                "填充缺失值数": int(filled_missing),
+                "转换列数": len(converted_columns)
+            }
+        }
+        
         self.cleaned_df = df_clean
         return df_clean, self.cleaning_report
     
@@ -298,7 +814,7 @@ class DataCleaner:
         导出清洗后的数据
         
         Args:
-            format_type: 导出格式 (csv, excel, json, html)
+            format_type: 导出格式 (csv, excel, json, html, parquet)
             output_path: 输出路径（可选）
             
         Returns:
@@ -312,16 +828,27 @@ class DataCleaner:
             base_name = os.path.splitext(os.path.basename(self.file_path))[0]
             output_dir = os.path.join(os.path.dirname(self.file_path), "cleaned")
             os.makedirs(output_dir, exist_ok=True)
-            output_path = os.path.join(output_dir, f"{base_name}_cleaned.{format_type}")
+            extension = "xlsx" if format_type == "excel" else format_type
+            output_path = os.path.join(output_dir, f"{base_name}_cleaned.{extension}")
         
-        if format_type == "csv":
-            self.cleaned_df.to_csv(output_path, index=False)
+        if self.use_dask:
+            # Dask结果逐分区写出：CSV合并为单个文件，Parquet写为目录；其余格式需要整表入内存
+            if format_type == "csv":
+                self.cleaned_df.to_csv(output_path, index=False, single_file=True)
+            elif format_type == "parquet":
+                self.cleaned_df.to_parquet(output_path, compression="zstd", write_index=False)
+            else:
+                raise ValueError(f"Dask模式仅支持CSV和Parquet导出: {format_type}")
+        elif format_type == "csv":
+            self.cleaned_df.to_csv(output_path, index=False, chunksize=50000, lineterminator='\n')
         elif format_type == "excel":
-            self.cleaned_df.to_excel(output_path, index=False)
+            _write_excel(self.cleaned_df, output_path)
         elif format_type == "json":
-            self.cleaned_df.to_json(output_path, orient="records", indent=2)
+            _write_json_records(self.cleaned_df, output_path)
         elif format_type == "html":
-            self.cleaned_df.to_html(output_path, index=False)
+            _write_html_table(self.cleaned_df, output_path)
+        elif format_type == "parquet":
+            _write_parquet(self.cleaned_df, output_path)
         else:
             raise ValueError(f"不支持的导出格式: {format_type}")
         
@@ -345,23 +872,31 @@ class DataCleaner:
         }
         
         # 获取数值列的分布数据
-        numeric_cols = self.cleaned_df.select_dtypes(include=['number']).columns
+        numeric_cols = self._numeric_columns(self.cleaned_df)
         for col in numeric_cols[:5]:  # 最多5个数值列
-            col_data = self.cleaned_df[col].dropna().tolist()
+            series = self.cleaned_df[col].dropna()
+            if len(series) > _VIZ_MAX_POINTS:
+                # 图表不需要全部数据点，抽样后保持原有顺序
+                series_sample = series.sample(n=_VIZ_MAX_POINTS, random_state=0).sort_index()
+            else:
+                series_sample = series
+            # 汇总统计基于完整数据，一次describe得到全部指标
+            stats = self.cleaned_df[col].describe()
             viz_data["column_distributions"][col] = {
-                "data": col_data,
+                "data": series_sample.tolist(),
                 "summary": {
-                    "min": float(self.cleaned_df[col].min()),
-                    "max": float(self.cleaned_df[col].max()),
-                    "mean": float(self.cleaned_df[col].mean()),
-                    "median": float(self.cleaned_df[col].median())
+                    "min": float(stats["min"]),
+                    "max": float(stats["max"]),
+                    "mean": float(stats["mean"]),
+                    "median": float(stats["50%"])
                 }
             }
         
         # 获取分类列的分布数据
         categorical_cols = self.cleaned_df.select_dtypes(include=['object', 'category']).columns
         for col in categorical_cols[:3]:  # 最多3个分类列
-            value_counts = self.cleaned_df[col].value_counts().head(10)  # 前10个类别
+            value_counts = self.cleaned_df[col].value_counts(sort=True)
+            value_counts = value_counts[value_counts > 0].head(10)  # 前10个出现过的类别
             viz_data["column_distributions"][col] = {
                 "categories": value_counts.index.tolist(),
                 "counts": value_counts.values.tolist()
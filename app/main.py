@@ -2,20 +2,250 @@
 主要页面路由
 """
 
-from flask import Blueprint, render_template, jsonify, request
+from flask import Blueprint, current_app, render_template, jsonify, request, Response, stream_with_context
 from flask_login import login_required, current_user
+from sqlalchemy import func, insert
+from sqlalchemy.orm import selectinload
+import orjson
+import numpy as np
 import pandas as pd
 import os
-import json
+import hashlib
+import zipfile
+import itertools
+from urllib.parse import quote, urlencode
+from collections import Counter
 from datetime import datetime
+from . import cache
+from .background import background_capable, get_job
 from .models import Upload, db, PPTTemplate, PPTProject, MeetingMinutes, TodoItem
-from .data_cleaner import DataCleaner
+from .data_cleaner import DataCleaner, read_sheet_values, iter_json_records, iter_html_table, iter_csv
 from .ai_analyzer import AIAnalyzer
-from .ppt_manager import PPTManager
-from .meeting_minutes import MeetingMinutesAssistant
 
 bp = Blueprint('main', __name__)
 
+def _ppt_manager():
+    """获取PPT管理器（延迟导入pptx/PIL，缩短应用启动时间；按应用缓存复用）"""
+    manager = current_app.extensions.get('ppt_manager')
+    if manager is None:
+        from .ppt_manager import PPTManager
+        manager = current_app.extensions['ppt_manager'] = PPTManager()
+    return manager
+
+def _meeting_assistant():
+    """获取会议纪要助手（延迟导入nltk，缩短应用启动时间；按应用缓存复用）"""
+    assistant = current_app.extensions.get('meeting_assistant')
+    if assistant is None:
+        from .meeting_minutes import MeetingMinutesAssistant
+        assistant = current_app.extensions['meeting_assistant'] = MeetingMinutesAssistant()
+    return assistant
+
+def _ai_analyzer():
+    """获取AI分析器（按应用缓存复用，HTTP连接池由模块级会话共享）"""
+    analyzer = current_app.extensions.get('ai_analyzer')
+    if analyzer is None:
+        analyzer = current_app.extensions['ai_analyzer'] = AIAnalyzer()
+    return analyzer
+
+def _frame_records(df):
+    """将DataFrame转换为JSON可序列化的记录列表
+
+    数值保持完整精度，NaN/NaT转换为None，日期时间与时间差转换为ISO格式字符串
+    """
+    records = df.astype(object).where(df.notna(), None)
+    for position, dtype in enumerate(df.dtypes):
+        if pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype):
+            records.isetitem(position, pd.Series([
+                value.isoformat() if pd.notna(value) else None for value in df.iloc[:, position]
+            ], index=df.index, dtype=object))
+    return records.to_dict(orient='records')
+
+def _json_bytes_response(payload):
+    """直接用orjson序列化为UTF-8字节作为响应体，省去jsonify的字符串中转；Content-Length由响应对象按字节长度设置"""
+    body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return current_app.response_class(body, mimetype='application/json')
+
+# 预览结果缓存时间（秒），缓存键包含文件修改时间和大小，文件变化后自动失效
+_PREVIEW_CACHE_TIMEOUT = 3600
+
+def _cached_json_response(body, cache_key):
+    """返回预先序列化的JSON，并附带由缓存键派生的ETag，客户端重复请求时可返回304"""
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(hashlib.blake2b(cache_key.encode(), digest_size=16).hexdigest())
+    return response.make_conditional(request)
+
+# 导出用的清洗结果缓存时间（秒），供prepare/download/导出接口复用
+_EXPORT_FRAME_TIMEOUT = 300
+# 只缓存内存占用不超过该值的清洗结果（字节）；更大的结果每次重新清洗，避免大对象序列化进缓存
+_EXPORT_FRAME_CACHE_MAX_BYTES = 1024 * 1024
+
+# 可直接流式下载的导出格式：格式 -> (MIME类型, 分块编码函数)
+_STREAM_EXPORT_FORMATS = {
+    'json': ('application/json', iter_json_records),
+    'html': ('text/html', iter_html_table),
+    'csv': ('text/csv', iter_csv),
+}
+
+def _cleaned_frame_for_export(upload, options_dict):
+    """
+    按导出选项清洗数据，较小的结果按文件版本和选项短期缓存
+
+    返回清洗后的DataFrame；数据加载失败时返回None
+    """
+    # 使用默认选项清洗数据（确保有清洗后的数据），合并用户选项
+    export_options = {
+        'missing_strategy': 'drop',
+        'remove_duplicates': True,
+        'type_conversions': {},
+        'outlier_strategy': None
+    }
+    export_options.update(options_dict)
+    
+    file_stat = os.stat(upload.upload_path)
+    options_hash = hashlib.blake2b(
+        orjson.dumps(export_options, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+    cache_key = f'export_frame:{upload.id}:{file_stat.st_mtime_ns}:{file_stat.st_size}:{options_hash}'
+    cleaned_df = cache.get(cache_key)
+    if cleaned_df is not None:
+        return cleaned_df
+    
+    cleaner = DataCleaner(upload.upload_path)
+    if not cleaner.load_data():
+        return None
+    cleaned_df, _ = cleaner.clean_data(export_options)
+    if cleaned_df.memory_usage(index=True, deep=True).sum() <= _EXPORT_FRAME_CACHE_MAX_BYTES:
+        cache.set(cache_key, cleaned_df, timeout=_EXPORT_FRAME_TIMEOUT)
+    return cleaned_df
+
+# 列表接口的默认及最大每页条数
+_LIST_PER_PAGE = 50
+_LIST_MAX_PER_PAGE = 200
+
+# 预览返回的行数
+_PREVIEW_ROWS = 10
+# 超过该大小的CSV改为分块流式统计（字节）
+_PREVIEW_STREAM_MIN_BYTES = 50 * 1024 * 1024
+# 流式统计的分块行数
+_PREVIEW_CHUNK_SIZE = 100_000
+# 分位数按每N行取1行的系统抽样估计
+_PREVIEW_QUANTILE_STEP = 10
+
+def _merge_dtype(left, right):
+    """合并不同分块推断出的列类型：数值类型取公共类型，其余冲突退化为object"""
+    if left == right:
+        return left
+    if (pd.api.types.is_numeric_dtype(left) and pd.api.types.is_numeric_dtype(right)
+            and not pd.api.types.is_bool_dtype(left) and not pd.api.types.is_bool_dtype(right)):
+        try:
+            return np.result_type(left, right)
+        except TypeError:
+            pass
+    return np.dtype(object)
+
+def _stream_csv_summary(path, quartiles=False, usecols=None):
+    """分块读取大CSV，返回预览行及与整表读取一致口径的统计量
+
+    计数、缺失值、均值、标准差、最值为精确值（均值/方差按分块合并），
+    quartiles为True时四分位数由系统抽样估计；usecols透传给解析器只读取部分列。
+    返回 (preview_df, original_shape, row_count, dtypes, missing_counts, numeric_desc)
+    """
+    head_frames = []
+    head_rows = 0
+    total_rows = 0
+    kept_rows = 0
+    columns = None
+    dtypes = {}
+    missing_counts = None
+    # 列名 -> [count, mean, M2, min, max]
+    moments = {}
+    samples = []
+
+    for chunk in pd.read_csv(path, chunksize=_PREVIEW_CHUNK_SIZE, usecols=usecols):
+        if columns is None:
+            columns = chunk.columns
+        total_rows += len(chunk)
+        chunk = chunk.dropna(how='all')
+        kept_rows += len(chunk)
+
+        if head_rows < _PREVIEW_ROWS:
+            head_frames.append(chunk.head(_PREVIEW_ROWS - head_rows))
+            head_rows += len(head_frames[-1])
+
+        for col, dtype in chunk.dtypes.items():
+            dtypes[col] = _merge_dtype(dtypes[col], dtype) if col in dtypes else dtype
+
+        chunk_missing = chunk.isnull().sum()
+        missing_counts = chunk_missing if missing_counts is None else missing_counts + chunk_missing
+
+        numeric = chunk.select_dtypes(include=['number'])
+        if numeric.empty:
+            continue
+        counts = numeric.count()
+        means = numeric.mean()
+        m2 = ((numeric - means) ** 2).sum()
+        mins = numeric.min()
+        maxs = numeric.max()
+        for col in numeric.columns:
+            n_b = int(counts[col])
+            if n_b == 0:
+                continue
+            if col not in moments:
+                moments[col] = [n_b, means[col], m2[col], mins[col], maxs[col]]
+                continue
+            # Chan等人的并行方差合并公式
+            n_a, mean_a, m2_a, min_a, max_a = moments[col]
+            n = n_a + n_b
+            delta = means[col] - mean_a
+            moments[col] = [
+                n,
+                mean_a + delta * n_b / n,
+                m2_a + m2[col] + delta * delta * n_a * n_b / n,
+                min(min_a, mins[col]),
+                max(max_a, maxs[col]),
+            ]
+        if quartiles:
+            samples.append(numeric.iloc[::_PREVIEW_QUANTILE_STEP])
+
+    if columns is None:
+        raise pd.errors.EmptyDataError('文件内容为空')
+
+    # 删除完全空的列（与整表读取时的dropna(axis=1, how='all')一致）
+    if missing_counts is None:
+        missing_counts = pd.Series(0, index=columns)
+    kept_cols = [col for col in columns if missing_counts[col] < kept_rows]
+    dtypes = pd.Series({col: dtypes[col] for col in kept_cols}, dtype=object)
+    missing_counts = missing_counts[kept_cols]
+
+    if head_frames:
+        preview_df = pd.concat(head_frames)[kept_cols]
+    else:
+        preview_df = pd.DataFrame(columns=kept_cols)
+
+    numeric_cols = [col for col in kept_cols
+                    if pd.api.types.is_numeric_dtype(dtypes[col]) and col in moments]
+    numeric_desc = None
+    if numeric_cols:
+        desc = {}
+        for col in numeric_cols:
+            n, mean, m2, col_min, col_max = moments[col]
+            desc[col] = {
+                'count': n,
+                'mean': mean,
+                'std': (m2 / (n - 1)) ** 0.5 if n > 1 else np.nan,
+                'min': col_min,
+                'max': col_max,
+            }
+        numeric_desc = pd.DataFrame(desc)
+        if quartiles:
+            # 与describe()的统计量顺序一致
+            sample_quartiles = pd.concat(samples)[numeric_cols].quantile([0.25, 0.5, 0.75])
+            sample_quartiles.index = ['25%', '50%', '75%']
+            numeric_desc = pd.concat([numeric_desc.iloc[:4], sample_quartiles, numeric_desc.iloc[4:]])
+
+    return (preview_df, (total_rows, len(columns)), kept_rows,
+            dtypes, missing_counts, numeric_desc)
+
 @bp.route('/')
 def index():
     """首页"""
@@ -67,6 +297,9 @@ def excel_preview(file_id):
             "preprocessing": {预处理信息}
         }
     }
+    数值列默认只返回count/mean/std/min/max（无需排序）；
+    传入 ?full_stats=1 时额外返回25%/50%/75%分位数；
+    传入 ?columns=a,b,c 时只读取并统计这些列（不存在的列名忽略）
     """
     # 获取上传记录
     upload = Upload.query.filter_by(id=file_id, user_id=current_user.id).first()
@@ -90,84 +323,80 @@ def excel_preview(file_id):
             'message': f'不支持的文件格式: {ext}。支持格式: {", ".join(supported_formats)}'
         }), 400
     
+    full_stats = request.args.get('full_stats', 'false').lower() in ('1', 'true')
+    
+    # 列投影：CSV下推到解析器，未选中的列不做类型转换
+    wanted_columns = sorted({name.strip() for name in request.args.get('columns', '').split(',') if name.strip()})
+    usecols = (lambda name: str(name) in wanted_columns) if wanted_columns else None
+    
+    # 同一文件（修改时间和大小不变）的预览结果直接复用，跳过重新解析
+    file_stat = os.stat(upload.upload_path)
+    cache_key = (f'excel_preview:{upload.id}:{file_stat.st_mtime_ns}:{file_stat.st_size}'
+                 f':{int(full_stats)}:{",".join(wanted_columns)}')
+    body = cache.get(cache_key)
+    if body is not None:
+        return _cached_json_response(body, cache_key)
+    
     try:
         # 读取文件
-        if ext == '.csv':
-            df = pd.read_csv(upload.upload_path)
+        if ext == '.csv' and os.path.getsize(upload.upload_path) >= _PREVIEW_STREAM_MIN_BYTES:
+            # 大CSV只读取前几行做预览，统计信息分块流式累计，避免整表载入内存
+            (preview_df, original_shape, row_count,
+             dtypes, missing_counts, numeric_desc) = _stream_csv_summary(
+                upload.upload_path, quartiles=full_stats, usecols=usecols)
         else:
-            # 使用openpyxl引擎读取Excel文件，并处理合并单元格
-            import openpyxl
-            from openpyxl.utils import get_column_letter
+            if ext == '.csv':
+                df = pd.read_csv(upload.upload_path, usecols=usecols)
+            else:
+                # 流式读取活动工作表（calamine或openpyxl只读模式），并展开合并单元格
+                values = read_sheet_values(upload.upload_path)
+                if len(values) == 0:
+                    raise pd.errors.EmptyDataError('工作表为空')
+                if usecols is not None:
+                    values = values[:, [i for i, name in enumerate(values[0]) if usecols(name)]]
+                # 第一行为列名；object数组构造的DataFrame需重新推断列类型
+                df = pd.DataFrame(values[1:], columns=values[0]).infer_objects()
             
-            # 加载工作簿
-            wb = openpyxl.load_workbook(upload.upload_path, data_only=True)
-            ws = wb.active
+            # 记录原始形状
+            original_shape = df.shape
             
-            # 获取所有合并单元格范围
-            merged_ranges = ws.merged_cells.ranges
+            # 数据预处理：删除完全空的行和列
+            df = df.dropna(how='all')
+            df = df.dropna(axis=1, how='all')
             
-            # 展开合并单元格：将合并区域左上角的值复制到所有单元格
-            for merged_range in list(merged_ranges):
-                # 获取合并区域的左上角单元格值
-                top_left_cell = ws.cell(row=merged_range.min_row, column=merged_range.min_col)
-                top_left_value = top_left_cell.value
-                
-                # 将值复制到合并区域的所有单元格
-                for row in range(merged_range.min_row, merged_range.max_row + 1):
-                    for col in range(merged_range.min_col, merged_range.max_col + 1):
-                        cell = ws.cell(row=row, column=col)
-                        cell.value = top_left_value
-            
-            # 将工作表转换为DataFrame
-            data = ws.values
-            columns = next(data)  # 第一行为列名
-            df = pd.DataFrame(data, columns=columns)
-        
-        # 记录原始形状
-        original_shape = df.shape
-        
-        # 数据预处理：删除完全空的行和列
-        df = df.dropna(how='all')
-        df = df.dropna(axis=1, how='all')
+            preview_df = df.head(_PREVIEW_ROWS)
+            row_count = len(df)
+            dtypes = df.dtypes
+            # 空值掩码整体转为一个布尔数组，按列求和一次
+            missing_counts = pd.Series(df.isna().to_numpy().sum(axis=0), index=df.columns)
+            numeric_cols = df.select_dtypes(include=['number']).columns
+            numeric_desc = None
+            if len(numeric_cols) > 0:
+                # 分位数需要排序，仅在请求完整统计时计算
+                if full_stats:
+                    numeric_desc = df[numeric_cols].describe()
+                else:
+                    numeric_desc = df[numeric_cols].agg(['count', 'mean', 'std', 'min', 'max'])
         
         # 获取前10行数据（转换为JSON可序列化格式）
-        preview_data = df.head(10).replace({pd.NaT: None, pd.NaN: None}).to_dict(orient='records')
+        preview_data = _frame_records(preview_df)
         
         # 计算统计信息
         # 1. 基本维度
-        row_count = len(df)
-        column_count = len(df.columns)
+        column_count = len(dtypes)
         
         # 2. 数据类型分布
-        dtypes_count = df.dtypes.value_counts()
-        data_types = {}
-        for dtype, count in dtypes_count.items():
-            dtype_str = str(dtype)
-            data_types[dtype_str] = int(count)
+        data_types = dict(Counter(map(str, dtypes)))
         
         # 3. 缺失值统计
-        missing_total = int(df.isnull().sum().sum())
-        missing_by_column = {}
-        for col, count in df.isnull().sum().items():
-            missing_by_column[col] = int(count)
+        missing_array = missing_counts.to_numpy()
+        missing_total = missing_array.sum()
+        missing_by_column = dict(zip(missing_counts.index, missing_array.tolist()))
         
-        # 4. 数值列统计
-        numeric_cols = df.select_dtypes(include=['number']).columns
+        # 4. 数值列统计（统一为浮点数；缺失的统计量NaN由orjson输出为null）
         numeric_stats = {}
-        if len(numeric_cols) > 0:
-            numeric_desc = df[numeric_cols].describe()
-            for col in numeric_desc.columns:
-                numeric_stats[col] = {}
-                for stat, value in numeric_desc[col].items():
-                    if pd.isna(value):
-                        numeric_stats[col][stat] = None
-                    else:
-                        # 转换为Python原生类型
-                        try:
-                            # 尝试转换为float，如果失败则转为字符串
-                            numeric_stats[col][stat] = float(value)
-                        except (ValueError, TypeError):
-                            numeric_stats[col][stat] = str(value)
+        if numeric_desc is not None:
+            numeric_stats = numeric_desc.astype(float).to_dict()
         
         # 5. 数据预处理信息
         preprocessing_info = {
@@ -187,17 +416,19 @@ def excel_preview(file_id):
             'preprocessing': preprocessing_info
         }
         
-        return jsonify({
+        body = current_app.json.dumps({
             'success': True,
             'data': preview_data,
             'stats': stats
         })
+        cache.set(cache_key, body, timeout=_PREVIEW_CACHE_TIMEOUT)
+        return _cached_json_response(body, cache_key)
         
     except pd.errors.EmptyDataError:
         return jsonify({'success': False, 'message': '文件内容为空，无法读取'}), 400
     except pd.errors.ParserError as e:
         return jsonify({'success': False, 'message': f'文件解析错误：{str(e)}'}), 400
-    except pd.errors.UnsupportedFileTypeError as e:
+    except zipfile.BadZipFile as e:
         return jsonify({'success': False, 'message': f'不支持的文件类型：{str(e)}'}), 400
     except pd.errors.DataError as e:
         return jsonify({'success': False, 'message': f'数据错误：{str(e)}'}), 400
@@ -221,18 +452,46 @@ def excel_cleaner_page():
     """Excel数据清洗页面"""
     return render_template('main/excel_cleaner.html')
 
+@bp.route('/api/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    """查询后台任务状态；任务完成后result为原接口的响应内容"""
+    job = get_job(job_id, current_user.id)
+    if job is None:
+        return jsonify({'success': False, 'message': '任务不存在或已过期'}), 404
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'state': job['state'],
+        'status_code': job.get('status_code'),
+        'result': job.get('result')
+    })
+
 @bp.route('/api/user/uploads')
 @login_required
 def user_uploads():
-    """获取用户上传文件列表"""
+    """获取用户上传文件列表（分页；可用 ?file_type=excel 按文件类型过滤）"""
     try:
-        # 获取用户的所有上传记录，按时间倒序排列
-        uploads = Upload.query.filter_by(user_id=current_user.id)\
-            .order_by(Upload.uploaded_at.desc())\
-            .all()
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', _LIST_PER_PAGE, type=int)
+        file_type = request.args.get('file_type')
+        
+        # 分页获取用户的上传记录，按时间倒序排列
+        # 只查询列表所需的列，返回轻量Row而非完整ORM实例
+        query = db.session.query(
+                Upload.id, Upload.filename, Upload.original_filename,
+                Upload.file_size, Upload.file_type, Upload.uploaded_at
+            )\
+            .filter(Upload.user_id == current_user.id)
+        if file_type:
+            query = query.filter(Upload.file_type == file_type)
+        uploads = query\
+            .order_by(Upload.uploaded_at.desc(), Upload.id.desc())\
+            .paginate(page=page, per_page=per_page, max_per_page=_LIST_MAX_PER_PAGE, error_out=False)
         
         uploads_data = []
-        for upload in uploads:
+        for upload in uploads.items:
             uploads_data.append({
                 'id': upload.id,
                 'filename': upload.filename,
@@ -245,7 +504,11 @@ def user_uploads():
         return jsonify({
             'success': True,
             'data': uploads_data,
-            'count': len(uploads_data)
+            'count': len(uploads_data),
+            'total': uploads.total,
+            'page': uploads.page,
+            'pages': uploads.pages,
+            'per_page': uploads.per_page
         })
         
     except Exception as e:
@@ -256,6 +519,7 @@ def user_uploads():
 
 @bp.route('/api/excel/clean/<int:file_id>', methods=['POST'])
 @login_required
+@background_capable
 def excel_clean(file_id):
     """Excel数据清洗API
     支持多种清洗选项，返回清洗后的数据和详细报告
@@ -306,15 +570,16 @@ def excel_clean(file_id):
         cleaned_df, cleaning_report = cleaner.clean_data(options)
         
         # 获取清洗后的预览数据
-        preview_data = cleaned_df.head(10).replace({pd.NaT: None, pd.NaN: None}).to_dict(orient='records')
+        preview_data = _frame_records(cleaned_df.head(10))
         
-        # 计算清洗后统计信息
+        # 计算清洗后统计信息（NumPy标量由orjson直接序列化）
+        missing_counts = cleaned_df.isna().sum()
         cleaned_stats = {
             'row_count': len(cleaned_df),
             'column_count': len(cleaned_df.columns),
-            'data_types': {str(dtype): int(count) for dtype, count in cleaned_df.dtypes.value_counts().items()},
-            'missing_values_total': int(cleaned_df.isnull().sum().sum()),
-            'missing_values_by_column': {col: int(count) for col, count in cleaned_df.isnull().sum().items()}
+            'data_types': dict(Counter(map(str, cleaned_df.dtypes))),
+            'missing_values_total': missing_counts.sum(),
+            'missing_values_by_column': missing_counts.to_dict()
         }
         
         return jsonify({
@@ -335,6 +600,7 @@ def excel_clean(file_id):
 
 @bp.route('/api/excel/ai-analyze/<int:file_id>')
 @login_required
+@background_capable
 def excel_ai_analyze(file_id):
     """Excel数据AI分析API
     使用DeepSeek API进行数据质量分析和智能建议生成
@@ -361,11 +627,13 @@ def excel_ai_analyze(file_id):
         quality_report = cleaner.analyze_data_quality()
         
         # 获取数据样本（前10行）
-        cleaner.load_data()  # 确保数据已加载
-        sample_data = cleaner.df.head(10).replace({pd.NaT: None, pd.NaN: None}).to_dict(orient='records')
+        sample_data = _frame_records(cleaner.df.head(10))
+        
+        # 等待AI接口期间不占用数据库连接，归还给连接池
+        db.session.close()
         
         # 创建AI分析器
-        ai_analyzer = AIAnalyzer()
+        ai_analyzer = _ai_analyzer()
         
         # 进行AI分析
         ai_report = ai_analyzer.analyze_data_quality(quality_report, sample_data)
@@ -384,8 +652,54 @@ def excel_ai_analyze(file_id):
             'message': f'AI分析失败：{error_type}: {str(e)}'
         }), 500
 
+@bp.route('/api/excel/ai-analyze/<int:file_id>/stream')
+@login_required
+def excel_ai_analyze_stream(file_id):
+    """Excel数据AI分析API（流式）
+    以 text/event-stream 逐段推送AI输出，最后推送 event: result 的完整分析报告
+    """
+    upload = Upload.query.filter_by(id=file_id, user_id=current_user.id).first()
+    
+    if not upload:
+        return jsonify({'success': False, 'message': '文件不存在或无权访问'}), 404
+    
+    if not os.path.exists(upload.upload_path):
+        return jsonify({'success': False, 'message': '文件不存在于服务器'}), 404
+    
+    cleaner = DataCleaner(upload.upload_path)
+    if not cleaner.load_data():
+        return jsonify({'success': False, 'message': '数据加载失败'}), 400
+    
+    quality_report = cleaner.analyze_data_quality()
+    sample_data = _frame_records(cleaner.df.head(10))
+    
+    # 流式响应期间不占用数据库连接
+    db.session.close()
+    
+    ai_analyzer = _ai_analyzer()
+    
+    def generate():
+        for message in ai_analyzer.stream_analysis(quality_report, sample_data):
+            if 'result' in message:
+                yield _sse_event(message['result'], event='result')
+            else:
+                yield _sse_event(message)
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
+def _sse_event(payload, event=None):
+    """编码一条SSE消息（NaN输出为null）"""
+    data = orjson.dumps(
+        payload,
+        default=str,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+    prefix = f'event: {event}\n'.encode() if event else b''
+    return prefix + b'data: ' + data + b'\n\n'
+
 @bp.route('/api/excel/export/<int:file_id>')
 @login_required
+@background_capable
 def excel_export(file_id):
     """Excel数据导出API
     支持多种格式导出清洗后的数据
@@ -405,12 +719,12 @@ def excel_export(file_id):
     options = request.args.get('options', '{}')
     
     try:
-        options_dict = json.loads(options)
-    except:
+        options_dict = orjson.loads(options)
+    except orjson.JSONDecodeError:
         options_dict = {}
     
     # 支持的格式
-    supported_formats = ['csv', 'excel', 'json', 'html']
+    supported_formats = ['csv', 'excel', 'json', 'html', 'parquet']
     if format_type not in supported_formats:
         return jsonify({
             'success': False,
@@ -418,44 +732,28 @@ def excel_export(file_id):
         }), 400
     
     try:
-        # 创建数据清洗器
-        cleaner = DataCleaner(upload.upload_path)
-        
-        # 加载数据
-        if not cleaner.load_data():
+        cleaned_df = _cleaned_frame_for_export(upload, options_dict)
+        if cleaned_df is None:
             return jsonify({'success': False, 'message': '数据加载失败'}), 400
         
-        # 使用默认选项清洗数据（确保有清洗后的数据）
-        default_options = {
-            'missing_strategy': 'drop',
-            'remove_duplicates': True,
-            'type_conversions': {},
-            'outlier_strategy': None
-        }
-        
-        # 合并用户选项
-        for key, value in options_dict.items():
-            default_options[key] = value
-        
-        cleaned_df, _ = cleaner.clean_data(default_options)
-        
         # 生成导出文件路径
         base_name = os.path.splitext(upload.original_filename)[0]
         export_dir = os.path.join(os.path.dirname(upload.upload_path), "exports")
         os.makedirs(export_dir, exist_ok=True)
         
-        export_filename = f"{base_name}_cleaned.{format_type}"
+        extension = 'xlsx' if format_type == 'excel' else format_type
+        export_filename = f"{base_name}_cleaned.{extension}"
         export_path = os.path.join(export_dir, export_filename)
         
         # 根据格式导出
         if format_type == 'csv':
-            cleaned_df.to_csv(export_path, index=False, encoding='utf-8-sig')
-        elif format_type == 'excel':
-            cleaned_df.to_excel(export_path, index=False)
-        elif format_type == 'json':
-            cleaned_df.to_json(export_path, orient='records', indent=2)
-        elif format_type == 'html':
-            cleaned_df.to_html(export_path, index=False)
+            cleaned_df.to_csv(export_path, index=False, encoding='utf-8-sig',
+                              chunksize=50000, lineterminator='\n')
+        else:
+            # Excel/JSON/HTML/Parquet由DataCleaner导出
+            cleaner = DataCleaner(upload.upload_path)
+            cleaner.cleaned_df = cleaned_df
+            cleaner.export_data(format_type, export_path)
         
         # 返回文件下载信息
         return jsonify({
@@ -473,6 +771,90 @@ def excel_export(file_id):
             'message': f'数据导出失败：{error_type}: {str(e)}'
         }), 500
 
+@bp.route('/api/excel/export/<int:file_id>/prepare')
+@login_required
+def excel_export_prepare(file_id):
+    """预先清洗数据并短期缓存，返回可直接流式下载的JSON/HTML/CSV地址（不写入磁盘）"""
+    upload = Upload.query.filter_by(id=file_id, user_id=current_user.id).first()
+    if not upload:
+        return jsonify({'success': False, 'message': '文件不存在或无权访问'}), 404
+    if not os.path.exists(upload.upload_path):
+        return jsonify({'success': False, 'message': '文件不存在于服务器'}), 404
+    
+    options = request.args.get('options', '{}')
+    try:
+        options_dict = orjson.loads(options)
+    except orjson.JSONDecodeError:
+        options_dict = {}
+    
+    try:
+        cleaned_df = _cleaned_frame_for_export(upload, options_dict)
+        if cleaned_df is None:
+            return jsonify({'success': False, 'message': '数据加载失败'}), 400
+        
+        query = urlencode({'options': options})
+        return jsonify({
+            'success': True,
+            'row_count': len(cleaned_df),
+            'download_urls': {
+                format_type: f'/api/excel/export/{file_id}/download?format={format_type}&{query}'
+                for format_type in _STREAM_EXPORT_FORMATS
+            }
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'数据导出失败：{type(e).__name__}: {str(e)}'
+        }), 500
+
+@bp.route('/api/excel/export/<int:file_id>/download')
+@login_required
+def excel_export_download(file_id):
+    """将清洗后的数据按块编码后直接流式返回（JSON/HTML/CSV），不经过磁盘"""
+    upload = Upload.query.filter_by(id=file_id, user_id=current_user.id).first()
+    if not upload:
+        return jsonify({'success': False, 'message': '文件不存在或无权访问'}), 404
+    if not os.path.exists(upload.upload_path):
+        return jsonify({'success': False, 'message': '文件不存在于服务器'}), 404
+    
+    format_type = request.args.get('format', 'json').lower()
+    if format_type not in _STREAM_EXPORT_FORMATS:
+        return jsonify({
+            'success': False,
+            'message': f'不支持的流式导出格式: {format_type}。支持格式: {", ".join(_STREAM_EXPORT_FORMATS)}'
+        }), 400
+    
+    try:
+        options_dict = orjson.loads(request.args.get('options', '{}'))
+    except orjson.JSONDecodeError:
+        options_dict = {}
+    
+    try:
+        cleaned_df = _cleaned_frame_for_export(upload, options_dict)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'数据导出失败：{type(e).__name__}: {str(e)}'
+        }), 500
+    if cleaned_df is None:
+        return jsonify({'success': False, 'message': '数据加载失败'}), 400
+    
+    # 数据已在内存中，响应期间不占用数据库连接
+    db.session.close()
+    
+    mimetype, chunks = _STREAM_EXPORT_FORMATS[format_type]
+    export_filename = f"{os.path.splitext(upload.original_filename)[0]}_cleaned.{format_type}"
+    body = chunks(cleaned_df)
+    if format_type == 'csv':
+        # 与文件导出一致，带BOM便于Excel识别UTF-8
+        body = itertools.chain(['\ufeff'], body)
+    
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f"attachment; filename*=UTF-8''{quote(export_filename)}"}
+    )
+
 # ==================== PPT生成相关路由 ====================
 
 @bp.route('/ppt-generator')
@@ -490,8 +872,13 @@ def ppt_templates_list():
         style_type = request.args.get('style_type')
         public_only = request.args.get('public_only', 'false').lower() == 'true'
         
-        ppt_manager = PPTManager()
-        templates = ppt_manager.list_templates(current_user.id, category, style_type, public_only)
+        ppt_manager = _ppt_manager()
+        templates = ppt_manager.list_templates(
+            current_user.id, category, style_type, public_only,
+            columns=(PPTTemplate.id, PPTTemplate.name, PPTTemplate.description,
+                     PPTTemplate.category, PPTTemplate.thumbnail_path, PPTTemplate.style_type,
+                     PPTTemplate.tags, PPTTemplate.is_public, PPTTemplate.created_at)
+        )
         
         templates_data = []
         for template in templates:
@@ -538,7 +925,7 @@ def ppt_template_upload():
         tags = request.form.get('tags', '').split(',') if request.form.get('tags') else None
         is_public = request.form.get('is_public', 'false').lower() == 'true'
         
-        ppt_manager = PPTManager()
+        ppt_manager = _ppt_manager()
         template, message = ppt_manager.upload_template(
             current_user.id,
             template_file,
@@ -573,7 +960,7 @@ def ppt_template_upload():
 def ppt_template_delete(template_id):
     """删除PPT模板"""
     try:
-        ppt_manager = PPTManager()
+        ppt_manager = _ppt_manager()
         success, message = ppt_manager.delete_template(template_id, current_user.id)
         
         if success:
@@ -601,7 +988,7 @@ def ppt_project_create():
         template_id = data.get('template_id')
         content_data = data.get('content_data')
         
-        ppt_manager = PPTManager()
+        ppt_manager = _ppt_manager()
         project, message = ppt_manager.create_project(
             current_user.id,
             title,
@@ -630,10 +1017,11 @@ def ppt_project_create():
 
 @bp.route('/api/ppt/projects/<int:project_id>/generate-pptx', methods=['POST'])
 @login_required
+@background_capable
 def ppt_generate_pptx(project_id):
     """生成PPTX文件"""
     try:
-        ppt_manager = PPTManager()
+        ppt_manager = _ppt_manager()
         success, message, file_path = ppt_manager.generate_pptx(project_id, current_user.id)
         
         if success:
@@ -656,10 +1044,11 @@ def ppt_generate_pptx(project_id):
 
 @bp.route('/api/ppt/projects/<int:project_id>/generate-html', methods=['POST'])
 @login_required
+@background_capable
 def ppt_generate_html(project_id):
     """生成HTML版本"""
     try:
-        ppt_manager = PPTManager()
+        ppt_manager = _ppt_manager()
         success, message, file_path = ppt_manager.generate_html(project_id, current_user.id)
         
         if success:
@@ -688,7 +1077,7 @@ def ppt_create_share_link(project_id):
         data = request.get_json()
         expires_hours = data.get('expires_hours', 24) if data else 24
         
-        ppt_manager = PPTManager()
+        ppt_manager = _ppt_manager()
         success, message, share_url = ppt_manager.create_share_link(
             project_id,
             current_user.id,
@@ -728,7 +1117,7 @@ def ppt_optimize_content():
         if not content_data:
             return jsonify({'success': False, 'message': '内容数据不能为空'}), 400
         
-        ppt_manager = PPTManager()
+        ppt_manager = _ppt_manager()
         optimized_content, message = ppt_manager.optimize_content_with_ai(
             content_data,
             optimization_type
@@ -763,7 +1152,7 @@ def ppt_search_images():
         if not keywords:
             return jsonify({'success': False, 'message': '关键词不能为空'}), 400
         
-        ppt_manager = PPTManager()
+        ppt_manager = _ppt_manager()
         images, message = ppt_manager.search_unsplash_images(keywords, count)
         
         return jsonify({
@@ -795,7 +1184,7 @@ def ppt_match_images():
         if not content_data:
             return jsonify({'success': False, 'message': '内容数据不能为空'}), 400
         
-        ppt_manager = PPTManager()
+        ppt_manager = _ppt_manager()
         matched_images = ppt_manager.match_images_to_content(content_data, image_count)
         
         return jsonify({
@@ -843,7 +1232,7 @@ def ppt_project_detail(project_id):
             'title': project.title,
             'description': project.description,
             'template_id': project.template_id,
-            'content_data': json.loads(project.content_data) if project.content_data else {},
+            'content_data': project.content_data or {},
             'generated_pptx_path': project.generated_pptx_path,
             'generated_html_path': project.generated_html_path,
             'share_token': project.share_token,
@@ -869,12 +1258,20 @@ def ppt_project_detail(project_id):
 def ppt_projects_list():
     """获取用户PPT项目列表"""
     try:
-        projects = PPTProject.query.filter_by(user_id=current_user.id)\
-            .order_by(PPTProject.updated_at.desc())\
-            .all()
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', _LIST_PER_PAGE, type=int)
+        
+        # 只查询列表所需的列，不加载content_data等大字段
+        projects = db.session.query(
+                PPTProject.id, PPTProject.title, PPTProject.description,
+                PPTProject.status, PPTProject.created_at, PPTProject.updated_at
+            )\
+            .filter(PPTProject.user_id == current_user.id)\
+            .order_by(PPTProject.updated_at.desc(), PPTProject.id.desc())\
+            .paginate(page=page, per_page=per_page, max_per_page=_LIST_MAX_PER_PAGE, error_out=False)
         
         projects_data = []
-        for project in projects:
+        for project in projects.items:
             projects_data.append({
                 'id': project.id,
                 'title': project.title,
@@ -887,7 +1284,11 @@ def ppt_projects_list():
         return jsonify({
             'success': True,
             'data': projects_data,
-            'count': len(projects_data)
+            'count': len(projects_data),
+            'total': projects.total,
+            'page': projects.page,
+            'pages': projects.pages,
+            'per_page': projects.per_page
         })
         
     except Exception as e:
@@ -904,8 +1305,17 @@ def meeting_minutes_page():
     """会议纪要助手页面"""
     return render_template('main/meeting_minutes.html')
 
+# 会议纪要处理支持的语言
+_MEETING_LANGUAGES = frozenset({'zh', 'en'})
+
+def _timestamp_suffix():
+    """当前时间的文件名后缀（YYYYMMDD_HHMMSS），用整数格式化代替strftime"""
+    n = datetime.now()
+    return f'{n.year:04d}{n.month:02d}{n.day:02d}_{n.hour:02d}{n.minute:02d}{n.second:02d}'
+
 @bp.route('/api/meeting-minutes/process', methods=['POST'])
 @login_required
+@background_capable
 def process_meeting_minutes():
     """处理会议文本文件"""
     try:
@@ -920,6 +1330,12 @@ def process_meeting_minutes():
         if not file_id:
             return jsonify({'success': False, 'message': '文件ID不能为空'}), 400
         
+        if language not in _MEETING_LANGUAGES:
+            return jsonify({
+                'success': False,
+                'message': f'不支持的语言: {language}。支持语言: {", ".join(sorted(_MEETING_LANGUAGES))}'
+            }), 400
+        
         # 获取上传记录
         upload = Upload.query.filter_by(id=file_id, user_id=current_user.id).first()
         
@@ -941,38 +1357,41 @@ def process_meeting_minutes():
             }), 400
         
         # 处理会议文本
-        assistant = MeetingMinutesAssistant()
+        assistant = _meeting_assistant()
         result = assistant.process_meeting_text(upload.upload_path, language)
         
         # 保存到数据库
         meeting_minutes = MeetingMinutes(
-            title=f"会议纪要_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            title=f"会议纪要_{_timestamp_suffix()}",
             original_file_id=file_id,
             original_text=result['text_processing']['raw_text_sample'],
             summary=result['summary']['summary_text'],
-            structured_data=json.dumps(result['summary']['structured_data'], ensure_ascii=False),
-            todo_items=json.dumps(result['todo_items'], ensure_ascii=False),
-            timeline_data=json.dumps(result['timeline']['data'], ensure_ascii=False),
+            structured_data=result['summary']['structured_data'],
+            timeline_data=result['timeline']['data'],
             language=language,
             processing_status='completed',
             user_id=current_user.id
         )
         
+        # 会议纪要与待办事项在同一事务中提交；flush只为获取会议纪要ID
         db.session.add(meeting_minutes)
-        db.session.commit()
+        db.session.flush()
         
-        # 保存待办事项到独立表
-        for todo_item in result['todo_items']:
-            todo = TodoItem(
-                meeting_minutes_id=meeting_minutes.id,
-                description=todo_item['description'],
-                assignee=todo_item.get('assignee', ''),
-                priority=todo_item.get('priority', 2),
-                due_date=todo_item.get('due_date'),
-                status='pending',
-                user_id=current_user.id
-            )
-            db.session.add(todo)
+        # 保存待办事项到独立表：一条INSERT语句批量写入，不逐行构造ORM实例
+        todo_rows = [
+            {
+                'meeting_minutes_id': meeting_minutes.id,
+                'description': todo_item['description'],
+                'assignee': todo_item.get('assignee', ''),
+                'priority': todo_item.get('priority', 2),
+                'due_date': _parse_due_date(todo_item.get('due_date')),
+                'status': 'pending',
+                'user_id': current_user.id
+            }
+            for todo_item in result['todo_items']
+        ]
+        if todo_rows:
+            db.session.execute(insert(TodoItem), todo_rows)
         
         db.session.commit()
         
@@ -992,6 +1411,8 @@ def process_meeting_minutes():
         })
         
     except Exception as e:
+        # 回滚未提交的会议纪要和待办事项，避免只保存了一部分
+        db.session.rollback()
         import logging
         logger = logging.getLogger(__name__)
         logger.error(f"会议纪要处理失败: {e}")
@@ -1000,30 +1421,68 @@ def process_meeting_minutes():
             'message': f'会议纪要处理失败: {str(e)}'
         }), 500
 
+def _parse_due_date(value):
+    """ISO格式的截止日期转换为datetime；“下周五”等相对日期文本无法保存为日期，返回None"""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+def _todo_item_dict(todo):
+    """待办事项记录转换为接口/导出使用的字典"""
+    return {
+        'id': todo.id,
+        'description': todo.description,
+        'assignee': todo.assignee,
+        'priority': todo.priority,
+        'due_date': todo.due_date.isoformat() if todo.due_date else None,
+        'status': todo.status
+    }
+
+def _user_meeting_minutes(minutes_id, *options):
+    """按主键获取当前用户的会议纪要，不存在或不属于当前用户时返回None；options为加载选项"""
+    minutes = db.session.get(MeetingMinutes, minutes_id, options=options)
+    if minutes is None or minutes.user_id != current_user.id:
+        return None
+    return minutes
+
 @bp.route('/api/meeting-minutes/list')
 @login_required
 def meeting_minutes_list():
     """获取用户会议纪要列表"""
     try:
-        minutes_list = MeetingMinutes.query.filter_by(user_id=current_user.id)\
-            .order_by(MeetingMinutes.created_at.desc())\
-            .all()
-        
-        data = []
-        for minutes in minutes_list:
-            data.append({
-                'id': minutes.id,
-                'title': minutes.title,
-                'language': minutes.language,
-                'processing_status': minutes.processing_status,
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', _LIST_PER_PAGE, type=int)
+        
+        # 只查询列表所需的列，不加载原文和JSON大字段
+        minutes_list = db.session.query(
+                MeetingMinutes.id, MeetingMinutes.title, MeetingMinutes.language,
+                MeetingMinutes.processing_status, MeetingMinutes.created_at, MeetingMinutes.updated_at
+            )\
+            .filter(MeetingMinutes.user_id == current_user.id)\
+            .order_by(MeetingMinutes.created_at.desc(), MeetingMinutes.id.desc())\
+            .paginate(page=page, per_page=per_page, max_per_page=_LIST_MAX_PER_PAGE, error_out=False)
+        
+        # 查询结果为轻量Row，直接转为字典，只需格式化时间字段
+        data = [
+            {
+                **minutes._asdict(),
                 'created_at': minutes.created_at.isoformat() if minutes.created_at else None,
                 'updated_at': minutes.updated_at.isoformat() if minutes.updated_at else None
-            })
+            }
+            for minutes in minutes_list.items
+        ]
         
-        return jsonify({
+        return _json_bytes_response({
             'success': True,
             'data': data,
-            'count': len(data)
+            'count': len(data),
+            'total': minutes_list.total,
+            'page': minutes_list.page,
+            'pages': minutes_list.pages,
+            'per_page': minutes_list.per_page
         })
         
     except Exception as e:
@@ -1037,32 +1496,28 @@ def meeting_minutes_list():
 def meeting_minutes_detail(minutes_id):
     """获取会议纪要详情"""
     try:
-        minutes = MeetingMinutes.query.filter_by(id=minutes_id, user_id=current_user.id).first()
+        # 待办事项用一条IN查询批量加载
+        minutes = _user_meeting_minutes(minutes_id, selectinload(MeetingMinutes.todos))
         
         if not minutes:
             return jsonify({'success': False, 'message': '会议纪要不存在或无权访问'}), 404
         
-        # 解析JSON字段
-        structured_data = json.loads(minutes.structured_data) if minutes.structured_data else {}
-        todo_items = json.loads(minutes.todo_items) if minutes.todo_items else []
-        timeline_data = json.loads(minutes.timeline_data) if minutes.timeline_data else []
-        
         data = {
             'id': minutes.id,
             'title': minutes.title,
             'original_file_id': minutes.original_file_id,
             'original_text': minutes.original_text,
             'summary': minutes.summary,
-            'structured_data': structured_data,
-            'todo_items': todo_items,
-            'timeline_data': timeline_data,
+            'structured_data': minutes.structured_data or {},
+            'todo_items': [_todo_item_dict(todo) for todo in minutes.todos],
+            'timeline_data': minutes.timeline_data or [],
             'language': minutes.language,
             'processing_status': minutes.processing_status,
             'created_at': minutes.created_at.isoformat() if minutes.created_at else None,
             'updated_at': minutes.updated_at.isoformat() if minutes.updated_at else None
         }
         
-        return jsonify({
+        return _json_bytes_response({
             'success': True,
             'data': data
         })
@@ -1073,62 +1528,73 @@ def meeting_minutes_detail(minutes_id):
             'message': f'获取会议纪要详情失败: {str(e)}'
         }), 500
 
+# 会议纪要导出格式：格式 -> (MIME类型, 文件扩展名)
+_MEETING_EXPORT_FORMATS = {
+    'json': ('application/json', 'json'),
+    'markdown': ('text/markdown', 'md'),
+    'html': ('text/html', 'html'),
+}
+
+# 会议纪要导出内容缓存时间（秒）；键中包含纪要与待办事项的版本，任一修改后自动失效
+_MEETING_EXPORT_CACHE_TIMEOUT = 3600
+
+def _export_meeting_content(minutes, format_type):
+    """由数据库记录构建处理结果并导出为指定格式（json为UTF-8字节，其余为字符串）"""
+    result = {
+        'text_processing': {
+            'raw_text_sample': minutes.original_text,
+            'quality_report': {}
+        },
+        'summary': {
+            'summary_text': minutes.summary,
+            'structured_data': minutes.structured_data or {}
+        },
+        'todo_items': [_todo_item_dict(todo) for todo in minutes.todos],
+        'timeline': {
+            'data': minutes.timeline_data or []
+        },
+        'processing_time': minutes.updated_at.isoformat() if minutes.updated_at else None,
+        'language': minutes.language
+    }
+    return _meeting_assistant().export_results(result, format_type)
+
 @bp.route('/api/meeting-minutes/<int:minutes_id>/export')
 @login_required
 def export_meeting_minutes(minutes_id):
-    """导出会议纪要"""
+    """导出会议纪要，直接作为附件下载"""
     try:
-        minutes = MeetingMinutes.query.filter_by(id=minutes_id, user_id=current_user.id).first()
+        minutes = _user_meeting_minutes(minutes_id)
         
         if not minutes:
             return jsonify({'success': False, 'message': '会议纪要不存在或无权访问'}), 404
         
         format_type = request.args.get('format', 'json')
+        if format_type not in _MEETING_EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'message': f'不支持的导出格式: {format_type}。支持格式: {", ".join(_MEETING_EXPORT_FORMATS)}'
+            }), 400
         
-        # 重新处理数据（或从数据库加载）
-        assistant = MeetingMinutesAssistant()
-        
-        # 构建结果对象
-        result = {
-            'text_processing': {
-                'raw_text_sample': minutes.original_text,
-                'quality_report': {}
-            },
-            'summary': {
-                'summary_text': minutes.summary,
-                'structured_data': json.loads(minutes.structured_data) if minutes.structured_data else {}
-            },
-            'todo_items': json.loads(minutes.todo_items) if minutes.todo_items else [],
-            'timeline': {
-                'data': json.loads(minutes.timeline_data) if minutes.timeline_data else []
-            },
-            'processing_time': minutes.updated_at.isoformat() if minutes.updated_at else None,
-            'language': minutes.language
-        }
-        
-        # 导出
-        export_content = assistant.export_results(result, format_type)
-        
-        # 生成导出文件
-        from flask import current_app
-        export_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'exports', 'meeting_minutes')
-        os.makedirs(export_dir, exist_ok=True)
-        
-        export_filename = f"meeting_minutes_{minutes_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format_type}"
-        export_path = os.path.join(export_dir, export_filename)
-        
-        with open(export_path, 'w', encoding='utf-8') as f:
-            f.write(export_content)
-        
-        return jsonify({
-            'success': True,
-            'message': '导出成功',
-            'data': {
-                'export_file': export_filename,
-                'format': format_type,
-                'download_url': f'/static/uploads/exports/meeting_minutes/{export_filename}'
-            }
-        })
+        updated = minutes.updated_at.isoformat() if minutes.updated_at else None
+        todo_count, todo_updated = db.session.query(
+            func.count(TodoItem.id), func.max(TodoItem.updated_at)
+        ).filter(TodoItem.meeting_minutes_id == minutes_id).one()
+        todo_version = f'{todo_count}:{todo_updated.isoformat() if todo_updated else None}'
+        cache_key = f'meeting_export:{minutes_id}:{format_type}:{updated}:{todo_version}'
+        # 缓存命中时无需重新构建导出内容
+        export_content = cache.get(cache_key)
+        if export_content is None:
+            export_content = _export_meeting_content(minutes, format_type)
+            cache.set(cache_key, export_content, timeout=_MEETING_EXPORT_CACHE_TIMEOUT)
+        
+        mimetype, extension = _MEETING_EXPORT_FORMATS[format_type]
+        export_filename = f"meeting_minutes_{minutes_id}_{_timestamp_suffix()}.{extension}"
+        
+        return Response(
+            export_content,
+            mimetype=mimetype,
+            headers={'Content-Disposition': f"attachment; filename*=UTF-8''{quote(export_filename)}"}
+        )
         
     except Exception as e:
         return jsonify({
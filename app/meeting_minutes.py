@@ -5,21 +5,60 @@
 
 import os
 import re
-import json
+import time
+import hashlib
 import logging
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Union
 import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
 from nltk import pos_tag
 import pandas as pd
 import requests
+import orjson
 from flask import current_app
 
 # 设置日志
 logger = logging.getLogger(__name__)
 
+# 导出JSON的序列化选项（orjson直接输出UTF-8，中文不转义；缩进2格）
+_EXPORT_JSON_OPTION = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# 英文处理所需的NLTK数据包及其资源路径
+_NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+}
+
+# 中文停用词
+_ZH_STOPWORDS = frozenset([
+    '的', '了', '在', '是', '我', '有', '和', '就',
+    '不', '人', '都', '一', '一个', '上', '也', '很',
+    '到', '说', '要', '去', '你', '会', '着', '没有',
+    '看', '好', '自己', '这'
+])
+
+@functools.lru_cache(maxsize=None)
+def _english_stopwords() -> frozenset:
+    """英文停用词（NLTK语料，首次使用时读取一次）"""
+    return frozenset(stopwords.words('english'))
+
+# 文本处理用的正则（模块加载时编译一次）
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+# 预处理时需要去除的字符：中文文本保留中文、英文、数字、常见标点；英文文本保留英文、数字、基本标点
+_ZH_DISALLOWED_CHARS = re.compile(r'[^\u4e00-\u9fa5a-zA-Z0-9\s，。！？；："\'、（）《》【】]')
+_EN_DISALLOWED_CHARS = re.compile(r'[^a-zA-Z0-9\s.,!?;:"\'()\[\]{}]')
+_PARAGRAPH_SPLIT_PATTERN = re.compile(r'\n\s*\n')
+_ZH_SENTENCE_SPLIT_PATTERN = re.compile(r'[。！？；]+')
+_CJK_CHAR_PATTERN = re.compile(r'[\u4e00-\u9fa5]')
+_LATIN_CHAR_PATTERN = re.compile(r'[a-zA-Z]')
+
 class TextProcessor:
     """文本处理基础功能"""
     
@@ -41,6 +80,8 @@ class TextProcessor:
                 try:
                     import jieba
                     import jieba.posseg as pseg
+                    # 立即加载词典，避免首次分词时在请求中加载
+                    jieba.initialize()
                     self.jieba = jieba
                     self.pseg = pseg
                     self.has_jieba = True
@@ -48,11 +89,10 @@ class TextProcessor:
                     logger.warning("jieba未安装，中文分词功能受限")
                     self.has_jieba = False
             else:
-                # 英文NLTK数据
-                nltk_data = ['punkt', 'stopwords', 'averaged_perceptron_tagger']
-                for data in nltk_data:
+                # 英文NLTK数据（按各自的资源目录查找，已安装的不再重复下载）
+                for data, resource in _NLTK_RESOURCES.items():
                     try:
-                        nltk.data.find(f'tokenizers/{data}')
+                        nltk.data.find(resource)
                     except LookupError:
                         nltk.download(data, quiet=True)
         except Exception as e:
@@ -97,15 +137,15 @@ class TextProcessor:
             预处理后的文本
         """
         # 去除多余空白字符
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_PATTERN.sub(' ', text).strip()
         
         # 去除特殊字符（保留中文、英文、数字、基本标点）
         if self.language == 'zh':
             # 中文文本：保留中文、英文、数字、常见标点
-            text = re.sub(r'[^\u4e00-\u9fa5a-zA-Z0-9\s，。！？；："\'、（）《》【】]', '', text)
+            text = _ZH_DISALLOWED_CHARS.sub('', text)
         else:
             # 英文文本：保留英文、数字、基本标点
-            text = re.sub(r'[^a-zA-Z0-9\s.,!?;:"\'()\[\]{}]', '', text)
+            text = _EN_DISALLOWED_CHARS.sub('', text)
         
         return text
     
@@ -120,13 +160,13 @@ class TextProcessor:
         """
         if mode == 'paragraph':
             # 按段落分割（空行分割）
-            paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+            paragraphs = [p.strip() for p in _PARAGRAPH_SPLIT_PATTERN.split(text) if p.strip()]
             return paragraphs
         elif mode == 'sentence':
             # 按句子分割
             if self.language == 'zh':
                 # 中文句子分割：使用句号、问号、感叹号等分割
-                sentences = re.split(r'[。！？；]+', text)
+                sentences = _ZH_SENTENCE_SPLIT_PATTERN.split(text)
                 sentences = [s.strip() for s in sentences if s.strip()]
             else:
                 # 英文句子分割：使用NLTK
@@ -135,11 +175,12 @@ class TextProcessor:
         else:
             raise ValueError(f"不支持的mode: {mode}")
     
-    def tokenize_words(self, text: str) -> List[str]:
+    def tokenize_words(self, text: str, sentences: Optional[List[str]] = None) -> List[str]:
         """
         分词
         Args:
             text: 文本内容
+            sentences: 英文文本已分好的句子（可选），传入时逐句分词，避免再次分句
         Returns:
             分词结果列表
         """
@@ -149,8 +190,11 @@ class TextProcessor:
             else:
                 # 简单按字符分割
                 return list(text)
-        else:
+        elif sentences is None:
             return word_tokenize(text)
+        else:
+            # 与word_tokenize(text)结果一致：其内部同样先分句再逐句分词
+            return [token for sentence in sentences for token in word_tokenize(sentence, preserve_line=True)]
     
     def remove_stopwords(self, tokens: List[str]) -> List[str]:
         """
@@ -161,15 +205,10 @@ class TextProcessor:
             去除停用词后的分词列表
         """
         if self.language == 'zh':
-            # 中文停用词列表
-            stop_words = set(['的', '了', '在', '是', '我', '有', '和', '就', 
-                            '不', '人', '都', '一', '一个', '上', '也', '很', 
-                            '到', '说', '要', '去', '你', '会', '着', '没有', 
-                            '看', '好', '自己', '这'])
-        else:
-            # 英文停用词
-            stop_words = set(stopwords.words('english'))
+            # 中文停用词不区分大小写，无需转换
+            return [token for token in tokens if token not in _ZH_STOPWORDS]
         
+        stop_words = _english_stopwords()
         return [token for token in tokens if token.lower() not in stop_words]
     
     def evaluate_text_quality(self, text: str) -> Dict[str, Any]:
@@ -182,8 +221,10 @@ class TextProcessor:
         """
         # 基本统计
         char_count = len(text)
-        word_count = len(self.tokenize_words(text))
-        sentence_count = len(self.segment_text(text, mode='sentence'))
+        # 英文分句（Punkt）只执行一次，分词复用分句结果
+        sentences = self.segment_text(text, mode='sentence')
+        word_count = len(self.tokenize_words(text, sentences))
+        sentence_count = len(sentences)
         paragraph_count = len(self.segment_text(text, mode='paragraph'))
         
         # 可读性评估（简单版本）
@@ -210,8 +251,8 @@ class TextProcessor:
         language_detected = self.language
         if self.language == 'auto':
             # 简单检测：根据字符范围判断
-            chinese_chars = len(re.findall(r'[\u4e00-\u9fa5]', text))
-            english_chars = len(re.findall(r'[a-zA-Z]', text))
+            chinese_chars = len(_CJK_CHAR_PATTERN.findall(text))
+            english_chars = len(_LATIN_CHAR_PATTERN.findall(text))
             if chinese_chars > english_chars:
                 language_detected = 'zh'
             else:
@@ -229,6 +270,93 @@ class TextProcessor:
         }
 
 
+@functools.lru_cache(maxsize=None)
+def get_text_processor(language='zh') -> TextProcessor:
+    """
+    按语言获取共享的文本处理器
+    初始化会导入jieba或检查/下载NLTK数据，处理器本身无请求级状态，可跨请求复用
+    """
+    return TextProcessor(language)
+
+
+# 关键信息提取用的正则（模块加载时编译一次）
+_KEY_TIME_PATTERNS = [re.compile(p) for p in [
+    r'\d{1,2}[:：]\d{1,2}',  # 10:30, 10:30:00
+    r'\d{1,2}\s*(?:AM|PM|am|pm)',  # 10 AM
+    r'上午\s*\d{1,2}[:：]\d{1,2}',  # 上午10:30
+    r'下午\s*\d{1,2}[:：]\d{1,2}'   # 下午2:30
+]]
+
+_KEY_DATE_PATTERNS = [re.compile(p) for p in [
+    r'\d{4}[-/]\d{1,2}[-/]\d{1,2}',  # 2024-12-27
+    r'\d{1,2}[-/]\d{1,2}[-/]\d{4}',  # 12/27/2024
+    r'\d{4}年\d{1,2}月\d{1,2}日',    # 2024年12月27日
+    r'\d{1,2}月\d{1,2}日'            # 12月27日
+]]
+
+_NUMBER_PATTERN = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+# 常见姓氏；人名按“姓氏字符连续出现”粗略识别。单字符集合匹配由正则引擎的C实现线性扫描完成
+_CHINESE_SURNAMES = '张王李赵刘陈杨黄吴周徐孙马朱胡林郭何高罗郑梁谢宋唐许韩冯邓曹彭曾萧田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈姚卢姜崔钟谭陆汪范金石廖熊郝孔白康毛邱秦江史顾侯邵孟龙万段雷钱汤尹黎易常武乔贺赖龚文'
+_CHINESE_NAME_PATTERN = re.compile(rf'[{_CHINESE_SURNAMES}]+\s*[{_CHINESE_SURNAMES}]+')
+
+
+# 摘要文本各部分的提取模式
+_SUMMARY_SECTION_PATTERNS = {
+    'zh': {
+        'meeting_topic': re.compile(r'会议主题[:：]\s*(.+?)(?=\n|$)'),
+        'discussion_issues': re.compile(r'(?:主要讨论问题|讨论议题)[:：]\s*(.+?)(?=\n|$)', re.MULTILINE),
+        'discussion_points': re.compile(r'(?:关键讨论点|讨论要点)[:：]\s*(.+?)(?=\n|$)', re.MULTILINE),
+        'decisions': re.compile(r'(?:达成的决议|决议)[:：]\s*(.+?)(?=\n|$)', re.MULTILINE),
+        'action_items': re.compile(r'(?:待办事项|行动项)[:：]\s*(.+?)(?=\n|$)', re.MULTILINE)
+    },
+    'en': {
+        'meeting_topic': re.compile(r'Meeting Topic[:：]\s*(.+?)(?=\n|$)'),
+        'discussion_issues': re.compile(r'Main Discussion Issues[:：]\s*(.+?)(?=\n|$)', re.MULTILINE),
+        'discussion_points': re.compile(r'Key Discussion Points[:：]\s*(.+?)(?=\n|$)', re.MULTILINE),
+        'decisions': re.compile(r'Decisions Made[:：]\s*(.+?)(?=\n|$)', re.MULTILINE),
+        'action_items': re.compile(r'Action Items[:：]\s*(.+?)(?=\n|$)', re.MULTILINE)
+    }
+}
+
+# 批量摘要的线程池：瓶颈是DeepSeek接口往返而非CPU，线程并发不受GIL限制
+_SUMMARY_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='meeting-summary')
+
+# DeepSeek摘要缓存：相同文本+语言在有效期内直接复用，避免重复调用API
+_SUMMARY_CACHE_SIZE = 128
+_SUMMARY_CACHE_TTL = 24 * 3600  # 秒
+_summary_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+def _summary_cache_key(text: str, language: str) -> str:
+    """计算文本与语言的哈希作为缓存键"""
+    return hashlib.blake2b(f'{language}\0{text}'.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _get_cached_summary(key: str) -> Optional[str]:
+    """读取未过期的摘要"""
+    with _summary_cache_lock:
+        entry = _summary_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, summary_text = entry
+        if expires_at < time.monotonic():
+            del _summary_cache[key]
+            return None
+        _summary_cache.move_to_end(key)
+        return summary_text
+
+
+def _set_cached_summary(key: str, summary_text: str) -> None:
+    """写入摘要，超出容量时淘汰最久未使用的结果"""
+    with _summary_cache_lock:
+        _summary_cache[key] = (time.monotonic() + _SUMMARY_CACHE_TTL, summary_text)
+        _summary_cache.move_to_end(key)
+        while len(_summary_cache) > _SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+
+
 class SummaryGenerator:
     """智能摘要生成系统"""
     
@@ -271,6 +399,23 @@ class SummaryGenerator:
             logger.error(f"摘要生成失败: {e}")
             raise
     
+    def generate_summaries_batch(self, texts: List[str], language='zh') -> List[Dict[str, Any]]:
+        """
+        批量生成结构化摘要，多个文本并发调用API
+        Args:
+            texts: 原始文本列表
+            language: 语言代码
+        Returns:
+            与texts顺序一致的结构化摘要列表
+        """
+        # 相同文本只请求一次
+        unique_texts = list(dict.fromkeys(texts))
+        summaries = dict(zip(
+            unique_texts,
+            _SUMMARY_POOL.map(lambda text: self.generate_summary(text, language), unique_texts)
+        ))
+        return [summaries[text] for text in texts]
+    
     def _call_deepseek_api(self, text: str, language: str) -> str:
         """
         调用DeepSeek API生成摘要
@@ -280,6 +425,11 @@ class SummaryGenerator:
         Returns:
             摘要文本
         """
+        cache_key = _summary_cache_key(text, language)
+        cached = _get_cached_summary(cache_key)
+        if cached is not None:
+            return cached
+        
         # 构建提示词
         if language == 'zh':
             system_prompt = """你是一个专业的会议纪要助手。请根据以下会议文本，生成一份结构清晰的会议纪要摘要。
@@ -336,12 +486,15 @@ Please output the summary content directly, without additional explanations."""
         try:
             response = requests.post(self.api_url, headers=headers, json=data, timeout=60)
             response.raise_for_status()
-            result = response.json()
-            return result['choices'][0]['message']['content']
+            result = orjson.loads(response.content)
+            summary_text = result['choices'][0]['message']['content']
         except Exception as e:
             logger.error(f"DeepSeek API调用失败: {e}")
-            # 如果API失败，返回简化摘要
+            # 如果API失败，返回简化摘要（不缓存，API恢复后重新生成）
             return self._generate_fallback_summary(text, language)
+        
+        _set_cached_summary(cache_key, summary_text)
+        return summary_text
     
     def _generate_fallback_summary(self, text: str, language: str) -> str:
         """
@@ -353,7 +506,7 @@ Please output the summary content directly, without additional explanations."""
             简化摘要文本
         """
         # 简单分段并取前3段作为摘要
-        processor = TextProcessor(language)
+        processor = get_text_processor(language)
         paragraphs = processor.segment_text(text, mode='paragraph')
         
         if len(paragraphs) <= 3:
@@ -379,54 +532,16 @@ Please output the summary content directly, without additional explanations."""
             'action_items': []
         }
         
-        # 中文模式
-        if language == 'zh':
-            # 提取会议主题
-            topic_match = re.search(r'会议主题[:：]\s*(.+?)(?=\n|$)', summary_text)
-            if topic_match:
-                structure['meeting_topic'] = topic_match.group(1).strip()
-            
-            # 提取讨论问题
-            issues_matches = re.findall(r'(?:主要讨论问题|讨论议题)[:：]\s*(.+?)(?=\n|$)', summary_text, re.MULTILINE)
-            if issues_matches:
-                structure['discussion_issues'] = [issue.strip() for issue in issues_matches]
-            
-            # 提取关键讨论点
-            points_matches = re.findall(r'(?:关键讨论点|讨论要点)[:：]\s*(.+?)(?=\n|$)', summary_text, re.MULTILINE)
-            if points_matches:
-                structure['discussion_points'] = [point.strip() for point in points_matches]
-            
-            # 提取决议
-            decisions_matches = re.findall(r'(?:达成的决议|决议)[:：]\s*(.+?)(?=\n|$)', summary_text, re.MULTILINE)
-            if decisions_matches:
-                structure['decisions'] = [decision.strip() for decision in decisions_matches]
-            
-            # 提取待办事项
-            todos_matches = re.findall(r'(?:待办事项|行动项)[:：]\s*(.+?)(?=\n|$)', summary_text, re.MULTILINE)
-            if todos_matches:
-                structure['action_items'] = [todo.strip() for todo in todos_matches]
+        patterns = _SUMMARY_SECTION_PATTERNS['zh' if language == 'zh' else 'en']
         
-        # 英文模式
-        else:
-            topic_match = re.search(r'Meeting Topic[:：]\s*(.+?)(?=\n|$)', summary_text)
-            if topic_match:
-                structure['meeting_topic'] = topic_match.group(1).strip()
-            
-            issues_matches = re.findall(r'Main Discussion Issues[:：]\s*(.+?)(?=\n|$)', summary_text, re.MULTILINE)
-            if issues_matches:
-                structure['discussion_issues'] = [issue.strip() for issue in issues_matches]
-            
-            points_matches = re.findall(r'Key Discussion Points[:：]\s*(.+?)(?=\n|$)', summary_text, re.MULTILINE)
-            if points_matches:
-                structure['discussion_points'] = [point.strip() for point in points_matches]
-            
-            decisions_matches = re.findall(r'Decisions Made[:：]\s*(.+?)(?=\n|$)', summary_text, re.MULTILINE)
-            if decisions_matches:
-                structure['decisions'] = [decision.strip() for decision in decisions_matches]
-            
-            todos_matches = re.findall(r'Action Items[:：]\s*(.+?)(?=\n|$)', summary_text, re.MULTILINE)
-            if todos_matches:
-                structure['action_items'] = [todo.strip() for todo in todos_matches]
+        # 提取会议主题
+        topic_match = patterns['meeting_topic'].search(summary_text)
+        if topic_match:
+            structure['meeting_topic'] = topic_match.group(1).strip()
+        
+        # 提取讨论问题、关键讨论点、决议、待办事项
+        for field in ('discussion_issues', 'discussion_points', 'decisions', 'action_items'):
+            structure[field] = [item.strip() for item in patterns[field].findall(summary_text)]
         
         return structure
     
@@ -448,44 +563,98 @@ Please output the summary content directly, without additional explanations."""
         }
         
         # 提取时间信息
-        time_patterns = [
-            r'\d{1,2}[:：]\d{1,2}',  # 10:30, 10:30:00
-            r'\d{1,2}\s*(?:AM|PM|am|pm)',  # 10 AM
-            r'上午\s*\d{1,2}[:：]\d{1,2}',  # 上午10:30
-            r'下午\s*\d{1,2}[:：]\d{1,2}'   # 下午2:30
-        ]
-        
-        for pattern in time_patterns:
-            matches = re.findall(pattern, text)
-            key_info['times'].extend(matches)
+        for pattern in _KEY_TIME_PATTERNS:
+            key_info['times'].extend(pattern.findall(text))
         
         # 提取日期信息
-        date_patterns = [
-            r'\d{4}[-/]\d{1,2}[-/]\d{1,2}',  # 2024-12-27
-            r'\d{1,2}[-/]\d{1,2}[-/]\d{4}',  # 12/27/2024
-            r'\d{4}年\d{1,2}月\d{1,2}日',    # 2024年12月27日
-            r'\d{1,2}月\d{1,2}日'            # 12月27日
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            key_info['dates'].extend(matches)
+        for pattern in _KEY_DATE_PATTERNS:
+            key_info['dates'].extend(pattern.findall(text))
         
         # 提取数字
-        number_pattern = r'\b\d+(?:\.\d+)?\b'
-        numbers = re.findall(number_pattern, text)
+        numbers = _NUMBER_PATTERN.findall(text)
         key_info['numbers'] = [float(num) if '.' in num else int(num) for num in numbers]
         
         # 提取可能的人名（简单版本）
         # 中文人名：2-4个汉字
         if language == 'zh':
-            name_pattern = r'[张王李赵刘陈杨黄吴周徐孙马朱胡林郭何高罗郑梁谢宋唐许韩冯邓曹彭曾萧田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈姚卢姜崔钟谭陆汪范金石廖熊金陆郝孔白崔康毛邱秦江史顾侯邵孟龙万段雷钱汤尹黎易常武乔贺赖龚文]+\s*[张王李赵刘陈杨黄吴周徐孙马朱胡林郭何高罗郑梁谢宋唐许韩冯邓曹彭曾萧田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈姚卢姜崔钟谭陆汪范金石廖熊金陆郝孔白崔康毛邱秦江史顾侯邵孟龙万段雷钱汤尹黎易常武乔贺赖龚文]+'
-            names = re.findall(name_pattern, text)
-            key_info['persons'] = list(set(names))
+            key_info['persons'] = list(set(_CHINESE_NAME_PATTERN.findall(text)))
         
         return key_info
 
 
+def _compile_patterns(patterns, flags=0):
+    """按语言预编译正则表达式表"""
+    return {language: [re.compile(p, flags) for p in items] for language, items in patterns.items()}
+
+
+# 待办事项表达模式（模块加载时编译一次，避免每次调用重建和查找正则缓存）
+_TODO_PATTERNS = _compile_patterns({
+    'zh': [
+        r'(?:需要|要|必须|得|应该)(.+?)(?:完成|处理|解决|跟进|负责)(?:，|。|；|）|）)?',
+        r'(?:由|由.*?)([^，。；]+?)(?:负责|跟进|处理)(.+?)(?:，|。|；|）|）)?',
+        r'(?:截止|截至|期限)[:：]\s*([^，。；]+?)(?:，|。|；|）|）)?',
+        r'(?:行动项|待办事项)[:：]\s*(.+?)(?=\n|$)',
+        r'(?:TODO|todo)[:：]\s*(.+?)(?=\n|$)'
+    ],
+    'en': [
+        r'(?:need|must|should|have to)(.+?)(?:complete|handle|solve|follow up|responsible)(?:,|.|;|\)|})?',
+        r'(?:by|assigned to)\s*([^,.]+?)(?:to|for|will)(.+?)(?:,|.|;|\)|})?',
+        r'(?:deadline|due date)[:：]\s*([^,.]+?)(?:,|.|;|\)|})?',
+        r'(?:action item|todo item)[:：]\s*(.+?)(?=\n|$)',
+        r'(?:TODO|todo)[:：]\s*(.+?)(?=\n|$)'
+    ]
+}, re.IGNORECASE | re.MULTILINE)
+
+# 责任人模式
+_ASSIGNEE_PATTERNS = _compile_patterns({
+    'zh': [
+        r'由\s*([^，。；]+?)\s*(?:负责|跟进|处理)',
+        r'([^，。；]+?)\s*负责',
+        r'责任人[:：]\s*([^，。；]+?)(?:，|。|；|）|）)?'
+    ],
+    'en': [
+        r'by\s*([^,.]+?)(?:to|for|will)',
+        r'assigned to\s*([^,.]+?)(?:,|.|;|\)|})?',
+        r'responsible person[:：]\s*([^,.]+?)(?:,|.|;|\)|})?'
+    ]
+}, re.IGNORECASE)
+
+# 截止日期模式
+_DUE_DATE_PATTERNS = _compile_patterns({
+    'zh': [
+        r'(?:截止|截至|期限)[:：]\s*([^，。；]+?)(?:，|。|；|）|）)?',
+        r'(?:在|于)\s*([^，。；]+?)\s*(?:之前|前)完成',
+        r'(?:下周一|下周二|下周三|下周四|下周五|下周六|下周日|下周)',
+        r'(?:明天|后天|大后天)',
+        r'\d{4}年\d{1,2}月\d{1,2}日',
+        r'\d{1,2}月\d{1,2}日'
+    ],
+    'en': [
+        r'(?:deadline|due date)[:：]\s*([^,.]+?)(?:,|.|;|\)|})?',
+        r'due by\s*([^,.]+?)(?:,|.|;|\)|})?',
+        r'(?:next Monday|next Tuesday|next Wednesday|next Thursday|next Friday|next Saturday|next Sunday|next week)',
+        r'(?:tomorrow|day after tomorrow)',
+        r'\d{4}[-/]\d{1,2}[-/]\d{1,2}',
+        r'\d{1,2}[-/]\d{1,2}[-/]\d{4}'
+    ]
+}, re.IGNORECASE)
+
+# 优先级关键词（均为小写，与小写化后的文本比较）
+_HIGH_PRIORITY_KEYWORDS = {
+    'zh': ['紧急', '重要', '尽快', '立即', '马上', '必须', '优先', '关键'],
+    'en': ['urgent', 'important', 'asap', 'immediately', 'now', 'must', 'priority', 'critical']
+}
+
+_LOW_PRIORITY_KEYWORDS = {
+    'zh': ['可选', '次要', '不急', '后续', '将来', '有空', '方便时'],
+    'en': ['optional', 'secondary', 'not urgent', 'later', 'future', 'when convenient']
+}
+
+
+# iCalendar日期中需去掉的分隔符
+_ICAL_DATE_STRIP = str.maketrans('', '', '-/')
+
+
 class TodoManager:
     """待办事项管理工具"""
     
@@ -503,65 +672,49 @@ class TodoManager:
             待办事项列表
         """
         todo_items = []
+        seen_descriptions = set()
         
         # 使用正则匹配常见的待办表达模式
-        patterns = {
-            'zh': [
-                r'(?:需要|要|必须|得|应该)(.+?)(?:完成|处理|解决|跟进|负责)(?:，|。|；|）|）)?',
-                r'(?:由|由.*?)([^，。；]+?)(?:负责|跟进|处理)(.+?)(?:，|。|；|）|）)?',
-                r'(?:截止|截至|期限)[:：]\s*([^，。；]+?)(?:，|。|；|）|）)?',
-                r'(?:行动项|待办事项)[:：]\s*(.+?)(?=\n|$)',
-                r'(?:TODO|todo)[:：]\s*(.+?)(?=\n|$)'
-            ],
-            'en': [
-                r'(?:need|must|should|have to)(.+?)(?:complete|handle|solve|follow up|responsible)(?:,|.|;|\)|})?',
-                r'(?:by|assigned to)\s*([^,.]+?)(?:to|for|will)(.+?)(?:,|.|;|\)|})?',
-                r'(?:deadline|due date)[:：]\s*([^,.]+?)(?:,|.|;|\)|})?',
-                r'(?:action item|todo item)[:：]\s*(.+?)(?=\n|$)',
-                r'(?:TODO|todo)[:：]\s*(.+?)(?=\n|$)'
-            ]
-        }
-        
-        lang_patterns = patterns.get(language, patterns['zh'])
+        lang_patterns = _TODO_PATTERNS.get(language, _TODO_PATTERNS['zh'])
         
         for pattern in lang_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                if isinstance(match, tuple):
+            # 多个捕获组时findall返回元组
+            multi_group = pattern.groups > 1
+            for match in pattern.findall(text):
+                if multi_group:
                     # 处理多个捕获组的情况
                     description = ' '.join([m for m in match if m]).strip()
                 else:
                     description = match.strip()
                 
-                if description and len(description) > 3:
-                    # 提取责任人
-                    assignee = self._extract_assignee(description, language)
-                    
-                    # 提取截止日期
-                    due_date = self._extract_due_date(description, language)
-                    
-                    # 评估优先级
-                    priority = self._evaluate_priority(description, language)
-                    
-                    todo_items.append({
-                        'description': description,
-                        'assignee': assignee,
-                        'priority': priority,
-                        'due_date': due_date,
-                        'status': 'pending',
-                        'extracted_from': description[:100]  # 保留原始文本片段
-                    })
-        
-        # 去重
-        unique_items = []
-        seen_descriptions = set()
-        for item in todo_items:
-            desc_key = item['description'].lower().strip()
-            if desc_key not in seen_descriptions:
+                if len(description) <= 3:
+                    continue
+                
+                # 去重：重复描述在提取责任人、日期、优先级之前跳过
+                desc_key = description.lower()
+                if desc_key in seen_descriptions:
+                    continue
                 seen_descriptions.add(desc_key)
-                unique_items.append(item)
+                
+                # 提取责任人
+                assignee = self._extract_assignee(description, language)
+                
+                # 提取截止日期
+                due_date = self._extract_due_date(description, language)
+                
+                # 评估优先级
+                priority = self._evaluate_priority(description, language)
+                
+                todo_items.append({
+                    'description': description,
+                    'assignee': assignee,
+                    'priority': priority,
+                    'due_date': due_date,
+                    'status': 'pending',
+                    'extracted_from': description[:100]  # 保留原始文本片段
+                })
         
-        return unique_items
+        return todo_items
     
     def _extract_assignee(self, text: str, language: str) -> str:
         """
@@ -572,23 +725,9 @@ class TodoManager:
         Returns:
             责任人姓名
         """
-        # 简单模式匹配
-        assignee_patterns = {
-            'zh': [
-                r'由\s*([^，。；]+?)\s*(?:负责|跟进|处理)',
-                r'([^，。；]+?)\s*负责',
-                r'责任人[:：]\s*([^，。；]+?)(?:，|。|；|）|）)?'
-            ],
-            'en': [
-                r'by\s*([^,.]+?)(?:to|for|will)',
-                r'assigned to\s*([^,.]+?)(?:,|.|;|\)|})?',
-                r'responsible person[:：]\s*([^,.]+?)(?:,|.|;|\)|})?'
-            ]
-        }
-        
-        patterns = assignee_patterns.get(language, assignee_patterns['zh'])
+        patterns = _ASSIGNEE_PATTERNS.get(language, _ASSIGNEE_PATTERNS['zh'])
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         
@@ -603,28 +742,9 @@ class TodoManager:
         Returns:
             截止日期字符串（ISO格式）或None
         """
-        date_patterns = {
-            'zh': [
-                r'(?:截止|截至|期限)[:：]\s*([^，。；]+?)(?:，|。|；|）|）)?',
-                r'(?:在|于)\s*([^，。；]+?)\s*(?:之前|前)完成',
-                r'(?:下周一|下周二|下周三|下周四|下周五|下周六|下周日|下周)',
-                r'(?:明天|后天|大后天)',
-                r'\d{4}年\d{1,2}月\d{1,2}日',
-                r'\d{1,2}月\d{1,2}日'
-            ],
-            'en': [
-                r'(?:deadline|due date)[:：]\s*([^,.]+?)(?:,|.|;|\)|})?',
-                r'due by\s*([^,.]+?)(?:,|.|;|\)|})?',
-                r'(?:next Monday|next Tuesday|next Wednesday|next Thursday|next Friday|next Saturday|next Sunday|next week)',
-                r'(?:tomorrow|day after tomorrow)',
-                r'\d{4}[-/]\d{1,2}[-/]\d{1,2}',
-                r'\d{1,2}[-/]\d{1,2}[-/]\d{4}'
-            ]
-        }
-        
-        patterns = date_patterns.get(language, date_patterns['zh'])
+        patterns = _DUE_DATE_PATTERNS.get(language, _DUE_DATE_PATTERNS['zh'])
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 date_str = match.group(1).strip() if match.groups() else match.group(0).strip()
                 # 尝试解析日期
@@ -647,26 +767,16 @@ class TodoManager:
             优先级数值
         """
         # 关键词匹配
-        high_priority_keywords = {
-            'zh': ['紧急', '重要', '尽快', '立即', '马上', '必须', '优先', '关键'],
-            'en': ['urgent', 'important', 'asap', 'immediately', 'now', 'must', 'priority', 'critical']
-        }
-        
-        low_priority_keywords = {
-            'zh': ['可选', '次要', '不急', '后续', '将来', '有空', '方便时'],
-            'en': ['optional', 'secondary', 'not urgent', 'later', 'future', 'when convenient']
-        }
-        
         text_lower = text.lower()
         
         # 检查高优先级关键词
-        for keyword in high_priority_keywords.get(language, high_priority_keywords['zh']):
-            if keyword.lower() in text_lower:
+        for keyword in _HIGH_PRIORITY_KEYWORDS.get(language, _HIGH_PRIORITY_KEYWORDS['zh']):
+            if keyword in text_lower:
                 return 3
         
         # 检查低优先级关键词
-        for keyword in low_priority_keywords.get(language, low_priority_keywords['zh']):
-            if keyword.lower() in text_lower:
+        for keyword in _LOW_PRIORITY_KEYWORDS.get(language, _LOW_PRIORITY_KEYWORDS['zh']):
+            if keyword in text_lower:
                 return 1
         
         # 默认中等优先级
@@ -705,36 +815,33 @@ class TodoManager:
             日历格式字符串
         """
         if format_type == 'ical':
-            # 生成简单的iCalendar格式
-            ical_content = """BEGIN:VCALENDAR
-VERSION:2.0
-PRODID:-//Meeting Minutes Assistant//EN
-"""
+            # 生成简单的iCalendar格式（各段收集到列表最后一次拼接）
+            ical_parts = ["BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//Meeting Minutes Assistant//EN\n"]
+            
+            now = datetime.now()
+            uid_stamp = now.strftime('%Y%m%d%H%M%S')
+            dtstamp = now.strftime('%Y%m%dT%H%M%SZ')
             
             for i, item in enumerate(todo_items):
-                event_id = f"todo_{i}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
                 summary = item['description'][:100]
                 
-                ical_content += f"""BEGIN:VEVENT
-UID:{event_id}
-DTSTAMP:{datetime.now().strftime('%Y%m%dT%H%M%SZ')}
-SUMMARY:{summary}
-STATUS:CONFIRMED
-"""
+                ical_parts.append(
+                    f"BEGIN:VEVENT\nUID:todo_{i}_{uid_stamp}\nDTSTAMP:{dtstamp}\n"
+                    f"SUMMARY:{summary}\nSTATUS:CONFIRMED\n"
+                )
                 
                 if item.get('due_date'):
                     # 尝试解析日期
                     try:
-                        # 简化处理：假设日期字符串
-                        due_str = item['due_date']
-                        ical_content += f"DTSTART;VALUE=DATE:{due_str.replace('-', '').replace('/', '')}\n"
+                        # 简化处理：假设日期字符串，去掉分隔符
+                        ical_parts.append(f"DTSTART;VALUE=DATE:{item['due_date'].translate(_ICAL_DATE_STRIP)}\n")
                     except:
                         pass
                 
-                ical_content += "END:VEVENT\n"
+                ical_parts.append("END:VEVENT\n")
             
-            ical_content += "END:VCALENDAR"
-            return ical_content
+            ical_parts.append("END:VCALENDAR")
+            return ''.join(ical_parts)
         
         elif format_type == 'csv':
             # 生成CSV格式
@@ -763,6 +870,31 @@ STATUS:CONFIRMED
             raise ValueError(f"不支持的格式类型: {format_type}")
 
 
+# 时间模式
+_TIME_PATTERNS = [re.compile(p) for p in [
+    # 时间点
+    r'(\d{1,2}[:：]\d{1,2})\s*(?:左右|许|时|分)?',
+    # 时间段
+    r'(\d{1,2}[:：]\d{1,2})[～~-](\d{1,2}[:：]\d{1,2})',
+    # 日期+时间
+    r'(\d{4}[-/]\d{1,2}[-/]\d{1,2})\s+(\d{1,2}[:：]\d{1,2})',
+    # 中文日期时间
+    r'(\d{4}年\d{1,2}月\d{1,2}日)\s*(?:上午|下午)?\s*(\d{1,2}[:：]\d{1,2})',
+    # 相对时间
+    r'(?:接下来|随后|然后|接着)\s*(?:的)?\s*(\d+)\s*(?:分钟|小时|天|周|月|年)',
+    r'(?:之前|以前|前)\s*(\d+)\s*(?:分钟|小时|天|周|月|年)'
+]]
+
+# 时间模式的预筛选：以上模式均包含\d，句子中没有数字时不可能匹配
+_DIGIT_PATTERN = re.compile(r'\d')
+
+# 无明确时间时判断重要事件的关键词（小写）
+_IMPORTANCE_KEYWORDS = {
+    'zh': ['决定', '决议', '达成', '同意', '通过', '确认', '安排', '计划'],
+    'en': ['decide', 'resolution', 'agree', 'approve', 'confirm', 'arrange', 'plan']
+}
+
+
 class TimelineVisualizer:
     """时间线可视化组件"""
     
@@ -781,31 +913,17 @@ class TimelineVisualizer:
         """
         timeline_items = []
         
-        # 时间模式匹配
-        time_patterns = [
-            # 时间点
-            r'(\d{1,2}[:：]\d{1,2})\s*(?:左右|许|时|分)?',
-            # 时间段
-            r'(\d{1,2}[:：]\d{1,2})[～~-](\d{1,2}[:：]\d{1,2})',
-            # 日期+时间
-            r'(\d{4}[-/]\d{1,2}[-/]\d{1,2})\s+(\d{1,2}[:：]\d{1,2})',
-            # 中文日期时间
-            r'(\d{4}年\d{1,2}月\d{1,2}日)\s*(?:上午|下午)?\s*(\d{1,2}[:：]\d{1,2})',
-            # 相对时间
-            r'(?:接下来|随后|然后|接着)\s*(?:的)?\s*(\d+)\s*(?:分钟|小时|天|周|月|年)',
-            r'(?:之前|以前|前)\s*(\d+)\s*(?:分钟|小时|天|周|月|年)'
-        ]
-        
         # 简单分词并查找时间相关上下文
-        sentences = TextProcessor(language).segment_text(text, mode='sentence')
+        sentences = get_text_processor(language).segment_text(text, mode='sentence')
         
-        for sentence in sentences:
-            # 查找时间信息
+        for sentence_index, sentence in enumerate(sentences):
+            # 查找时间信息；所有时间模式都要求数字，不含数字的句子跳过逐个匹配
             time_matches = []
-            for pattern in time_patterns:
-                matches = re.findall(pattern, sentence)
-                if matches:
-                    time_matches.extend(matches)
+            if _DIGIT_PATTERN.search(sentence):
+                for pattern in _TIME_PATTERNS:
+                    matches = pattern.findall(sentence)
+                    if matches:
+                        time_matches.extend(matches)
             
             if time_matches:
                 # 提取时间点附近的上下文作为事件描述
@@ -818,25 +936,21 @@ class TimelineVisualizer:
                     'time': time_matches[0] if isinstance(time_matches[0], str) else str(time_matches[0]),
                     'event': event_title,
                     'description': sentence,
-                    'sentence_index': sentences.index(sentence),
+                    'sentence_index': sentence_index,
                     'has_time': True
                 })
             else:
                 # 没有明确时间，但可能是重要事件
                 # 使用启发式规则判断重要性
-                importance_keywords = {
-                    'zh': ['决定', '决议', '达成', '同意', '通过', '确认', '安排', '计划'],
-                    'en': ['decide', 'resolution', 'agree', 'approve', 'confirm', 'arrange', 'plan']
-                }
-                
-                keywords = importance_keywords.get(language, importance_keywords['zh'])
+                keywords = _IMPORTANCE_KEYWORDS.get(language, _IMPORTANCE_KEYWORDS['zh'])
+                sentence_lower = sentence.lower()
                 for keyword in keywords:
-                    if keyword.lower() in sentence.lower():
+                    if keyword in sentence_lower:
                         timeline_items.append({
                             'time': f"事件_{len(timeline_items)}",
                             'event': sentence[:50].strip(),
                             'description': sentence,
-                            'sentence_index': sentences.index(sentence),
+                            'sentence_index': sentence_index,
                             'has_time': False
                         })
                         break
@@ -915,7 +1029,6 @@ class TimelineVisualizer:
             'series': [{
                 'type': 'scatter',
                 'data': data,
-                'symbolSize': lambda val: val[3],
                 'itemStyle': {
                     'color': '#5470c6'
                 },
@@ -939,7 +1052,7 @@ class TimelineVisualizer:
             导出格式字符串
         """
         if format_type == 'json':
-            return json.dumps(timeline_data, ensure_ascii=False, indent=2)
+            return orjson.dumps(timeline_data, option=_EXPORT_JSON_OPTION).decode('utf-8')
         
         elif format_type == 'csv':
             import csv
@@ -1025,7 +1138,7 @@ class MeetingMinutesAssistant:
         Args:
             api_key: DeepSeek API密钥
         """
-        self.text_processor = TextProcessor()
+        self.text_processor = get_text_processor('zh')
         self.summary_generator = SummaryGenerator(api_key)
         self.todo_manager = TodoManager()
         self.timeline_visualizer = TimelineVisualizer()
@@ -1090,17 +1203,17 @@ class MeetingMinutesAssistant:
             logger.error(f"会议纪要处理失败: {e}")
             raise
     
-    def export_results(self, result: Dict[str, Any], export_format: str = 'json') -> str:
+    def export_results(self, result: Dict[str, Any], export_format: str = 'json') -> Union[str, bytes]:
         """
         导出处理结果
         Args:
             result: 处理结果
             export_format: 导出格式，支持'json'、'markdown'、'html'
         Returns:
-            导出内容字符串
+            导出内容；json格式直接返回orjson生成的UTF-8字节，其余格式返回字符串
         """
         if export_format == 'json':
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return orjson.dumps(result, option=_EXPORT_JSON_OPTION)
         
         elif export_format == 'markdown':
             md_content = "# 会议纪要处理报告\n\n"
@@ -3,17 +3,33 @@
 """
 
 from datetime import datetime
+from flask import current_app
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
+from sqlalchemy.dialects.postgresql import JSONB
 from . import db
 
+# JSON列类型：PostgreSQL使用JSONB，其他数据库使用通用JSON；读写时自动序列化/反序列化
+JSONColumn = db.JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), 'postgresql')
+
+# 默认密码哈希算法：scrypt 校验耗时约为 pbkdf2(600000次迭代) 的一半
+DEFAULT_PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'
+
+def password_hash_method():
+    """当前配置的密码哈希算法"""
+    return current_app.config.get('PASSWORD_HASH_METHOD', DEFAULT_PASSWORD_HASH_METHOD)
+
+def hash_password(password):
+    """按配置的算法生成密码哈希"""
+    return generate_password_hash(password, method=password_hash_method())
+
 class User(UserMixin, db.Model):
     """用户模型"""
     __tablename__ = 'users'
     
     id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(64), unique=True, nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
+    username = db.Column(db.String(64), unique=True, index=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, index=True, nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -25,12 +41,16 @@ class User(UserMixin, db.Model):
     
     def set_password(self, password):
         """设置密码哈希"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        """验证密码"""
+        """验证密码（兼容旧算法生成的哈希）"""
         return check_password_hash(self.password_hash, password)
     
+    def password_needs_rehash(self):
+        """密码哈希是否由旧算法生成"""
+        return not self.password_hash.startswith(password_hash_method() + '$')
+    
     def __repr__(self):
         return f'<User {self.username}>'
 
@@ -79,7 +99,7 @@ class PPTProject(db.Model):
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
     template_id = db.Column(db.Integer, db.ForeignKey('ppt_templates.id'))
-    content_data = db.Column(db.Text)  # JSON格式的内容数据
+    content_data = db.Column(JSONColumn)  # 内容数据
     generated_pptx_path = db.Column(db.String(500))  # 生成的PPTX文件路径
     generated_html_path = db.Column(db.String(500))  # 生成的HTML文件路径
     share_token = db.Column(db.String(100), unique=True)  # 分享令牌
@@ -101,17 +121,23 @@ class MeetingMinutes(db.Model):
     original_file_id = db.Column(db.Integer, db.ForeignKey('uploads.id'))
     original_text = db.Column(db.Text)  # 原始文本内容
     summary = db.Column(db.Text)  # 结构化摘要文本
-    structured_data = db.Column(db.Text)  # JSON格式的结构化数据（问题、讨论、决议等）
-    todo_items = db.Column(db.Text)  # JSON格式的待办事项列表
-    timeline_data = db.Column(db.Text)  # JSON格式的时间线数据
+    structured_data = db.Column(JSONColumn)  # 结构化数据（问题、讨论、决议等）
+    timeline_data = db.Column(JSONColumn)  # 时间线数据
     language = db.Column(db.String(10), default='zh')  # 语言：zh, en等
     processing_status = db.Column(db.String(20), default='pending')  # pending, processing, completed, failed
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # 列表接口按用户过滤并按创建时间倒序分页
+    __table_args__ = (
+        db.Index('ix_meeting_minutes_user_created', user_id, created_at.desc()),
+    )
+    
     # 关系
     original_file = db.relationship('Upload', foreign_keys=[original_file_id])
+    # 待办事项只保存在todo_items表中；需要时在查询上指定selectinload批量加载
+    todos = db.relationship('TodoItem', back_populates='meeting_minutes', order_by='TodoItem.id')
     
     def __repr__(self):
         return f'<MeetingMinutes {self.title}>'
@@ -132,7 +158,7 @@ class TodoItem(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # 关系
-    meeting_minutes = db.relationship('MeetingMinutes', foreign_keys=[meeting_minutes_id])
+    meeting_minutes = db.relationship('MeetingMinutes', foreign_keys=[meeting_minutes_id], back_populates='todos')
     
     def __repr__(self):
         return f'<TodoItem {self.description[:50]}>'
\ No newline at end of file
@@ -15,11 +15,20 @@ from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import io
 
 from .models import db, PPTTemplate, PPTProject
 
+# 模块级HTTP会话：Unsplash/DeepSeek请求复用keep-alive连接，分摊TLS握手开销
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+# 多页图片搜索的线程池：瓶颈是HTTPS往返而非CPU，线程并发不受GIL限制
+_IMAGE_SEARCH_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix='image-search')
+
 class PPTManager:
     """PPT管理器类"""
     
@@ -95,7 +104,7 @@ class PPTManager:
             current_app.logger.error(f"模板上传失败: {str(e)}")
             return None, f"模板上传失败: {str(e)}"
     
-    def list_templates(self, user_id, category=None, style_type=None, public_only=False):
+    def list_templates(self, user_id, category=None, style_type=None, public_only=False, columns=None):
         """
         获取模板列表
         Args:
@@ -103,10 +112,13 @@ class PPTManager:
             category: 按分类筛选
             style_type: 按样式类型筛选
             public_only: 是否只获取公开模板
+            columns: 只查询指定列，返回轻量Row而非ORM实例（用于列表展示）
         Returns:
             模板列表
         """
         query = PPTTemplate.query
+        if columns:
+            query = query.with_entities(*columns)
         
         if public_only:
             query = query.filter_by(is_public=True)
@@ -202,7 +214,7 @@ class PPTManager:
                 title=title,
                 description=description,
                 template_id=template_id,
-                content_data=json.dumps(content_data) if content_data else None,
+                content_data=content_data or None,
                 user_id=user_id,
                 status='draft'
             )
@@ -242,7 +254,7 @@ class PPTManager:
                 template = self.get_template(project.template_id, user_id)
             
             # 解析内容数据
-            content_data = json.loads(project.content_data) if project.content_data else {}
+            content_data = project.content_data or {}
             
             # 生成PPTX文件
             if template:
@@ -386,7 +398,7 @@ class PPTManager:
                 'temperature': 0.7
             }
             
-            response = requests.post(
+            response = _SESSION.post(
                 'https://api.deepseek.com/v1/chat/completions',
                 headers=headers,
                 json=data,
@@ -435,7 +447,7 @@ class PPTManager:
                 'orientation': 'landscape'
             }
             
-            response = requests.get(
+            response = _SESSION.get(
                 'https://api.unsplash.com/search/photos',
                 headers=headers,
                 params=params,
@@ -470,11 +482,21 @@ class PPTManager:
         """
         为内容匹配合适的图片
         Args:
-            content_data: 内容数据
+            content_data: 内容数据；为幻灯片列表时各页并发搜索
             image_count: 每页图片数量
         Returns:
-            匹配的图片数据
+            匹配的图片数据；幻灯片列表时按页顺序返回每页的图片列表
         """
+        if isinstance(content_data, list):
+            app = current_app._get_current_object()
+            
+            def match_slide(slide):
+                # 工作线程没有应用上下文，需显式推入
+                with app.app_context():
+                    return self.match_images_to_content(slide, image_count)
+            
+            return list(_IMAGE_SEARCH_POOL.map(match_slide, content_data))
+        
         # 从内容中提取关键词
         keywords = self._extract_keywords(content_data)
         
@@ -1,12 +1,12 @@
 """
-File upload and Excel preview routes.
+File upload routes.
+
+Excel preview is served by main.excel_preview (/api/excel/preview/<file_id>).
 """
 
 import os
 from datetime import datetime
-from typing import Any, Dict
 
-import pandas as pd
 from flask import Blueprint, current_app, jsonify, request
 from flask_login import current_user, login_required
 from werkzeug.utils import secure_filename
@@ -16,18 +16,6 @@ from .models import Upload, db
 bp = Blueprint("upload", __name__)
 
 
-def _normalize_json_value(value: Any) -> Any:
-    """Convert pandas/numpy values into JSON-safe Python values."""
-    if pd.isna(value):
-        return None
-    if hasattr(value, "item"):
-        try:
-            return value.item()
-        except Exception:
-            return str(value)
-    return value
-
-
 def _allowed_file(filename: str, file_type: str) -> bool:
     if file_type not in current_app.config["ALLOWED_EXTENSIONS"]:
         return False
@@ -44,33 +32,6 @@ def _detect_file_type(filename: str) -> str | None:
     return None
 
 
-def _safe_preview_stats(df_raw: pd.DataFrame, df_cleaned: pd.DataFrame) -> Dict[str, Any]:
-    dtype_counts = df_cleaned.dtypes.value_counts().to_dict()
-    missing_by_col = df_cleaned.isnull().sum().to_dict()
-    numeric_stats: Dict[str, Dict[str, Any]] = {}
-
-    numeric_df = df_cleaned.select_dtypes(include=["number"])
-    if not numeric_df.empty:
-        described = numeric_df.describe().to_dict()
-        for col, values in described.items():
-            numeric_stats[col] = {k: _normalize_json_value(v) for k, v in values.items()}
-
-    return {
-        "row_count": int(len(df_cleaned)),
-        "column_count": int(len(df_cleaned.columns)),
-        "data_types": {str(k): int(v) for k, v in dtype_counts.items()},
-        "missing_values_total": int(df_cleaned.isnull().sum().sum()),
-        "missing_values_by_column": {str(k): int(v) for k, v in missing_by_col.items()},
-        "numeric_stats": numeric_stats,
-        "preprocessing": {
-            "original_shape": [int(df_raw.shape[0]), int(df_raw.shape[1])],
-            "cleaned_shape": [int(df_cleaned.shape[0]), int(df_cleaned.shape[1])],
-            "removed_empty_rows": int(df_raw.shape[0] - df_raw.dropna(how="all").shape[0]),
-            "removed_empty_columns": int(df_raw.shape[1] - df_raw.dropna(axis=1, how="all").shape[1]),
-        },
-    }
-
-
 @bp.route("/upload", methods=["POST"])
 @login_required
 def upload_file():
@@ -171,80 +132,3 @@ def get_uploads():
         }
     )
 
-
-@bp.route("/excel/preview/<int:file_id>", methods=["GET"])
-@login_required
-def preview_excel(file_id: int):
-    """
-    Preview tabular files.
-    Supports .csv, .xlsx, .xls and returns both modern and compatibility fields.
-    """
-    upload = Upload.query.filter_by(id=file_id, user_id=current_user.id).first()
-    if not upload:
-        return jsonify({"success": False, "message": "File not found or access denied"}), 404
-
-    if not os.path.exists(upload.upload_path):
-        return jsonify({"success": False, "message": "File does not exist on server"}), 404
-
-    if os.path.getsize(upload.upload_path) == 0:
-        return jsonify({"success": False, "message": "Empty file"}), 400
-
-    _, ext = os.path.splitext(upload.filename or upload.original_filename)
-    ext = ext.lower()
-    if ext not in {".csv", ".xlsx", ".xls"}:
-        return jsonify({"success": False, "message": "Unsupported file format"}), 400
-
-    try:
-        if ext == ".csv":
-            df_raw = pd.read_csv(upload.upload_path)
-        else:
-            df_raw = pd.read_excel(upload.upload_path, engine="openpyxl")
-
-        df_cleaned = df_raw.dropna(how="all").dropna(axis=1, how="all")
-        stats = _safe_preview_stats(df_raw, df_cleaned)
-
-        preview_df = df_cleaned.head(10)
-        preview_data = []
-        for row in preview_df.to_dict(orient="records"):
-            preview_data.append({str(k): _normalize_json_value(v) for k, v in row.items()})
-
-        columns_info = []
-        for col in df_cleaned.columns:
-            series = df_cleaned[col]
-            sample_value = _normalize_json_value(series.iloc[0]) if len(series) > 0 else None
-            columns_info.append(
-                {
-                    "name": str(col),
-                    "type": str(series.dtype),
-                    "non_null_count": int(series.count()),
-                    "unique_count": int(series.nunique(dropna=True)),
-                    "sample_value": sample_value,
-                }
-            )
-
-        response_data = {
-            "success": True,
-            # compatibility shape used by tests
-            "data": preview_data,
-            "stats": stats,
-            # legacy fields
-            "preview": preview_data,
-            "statistics": {
-                "total_rows": stats["row_count"],
-                "total_cols": stats["column_count"],
-                "dtype_distribution": stats["data_types"],
-            },
-            "columns_info": columns_info,
-            "filename": upload.original_filename,
-            "file_type": upload.file_type,
-            "uploaded_at": upload.uploaded_at.isoformat() if upload.uploaded_at else None,
-        }
-        return jsonify(response_data)
-
-    except pd.errors.EmptyDataError:
-        return jsonify({"success": False, "message": "File content is empty"}), 400
-    except pd.errors.ParserError as exc:
-        return jsonify({"success": False, "message": f"Failed to parse file: {exc}"}), 400
-    except Exception as exc:
-        current_app.logger.exception("Failed to preview file")
-        return jsonify({"success": False, "message": f"Failed to read file: {exc}"}), 500
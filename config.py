@@ -10,6 +10,19 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # 建表模式：sync 在启动时自动建表，skip 交给 flask init-db / flask db upgrade
+    MIGRATION_MODE = os.environ.get('MIGRATION_MODE') or 'skip'
+    
+    # 密码哈希算法（旧的pbkdf2哈希仍可校验，并在登录时升级）
+    PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'
+    
+    # 缓存配置：配置了Redis地址时使用RedisCache，否则使用进程内SimpleCache
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or ''
+    CACHE_TYPE = 'RedisCache' if CACHE_REDIS_URL else 'SimpleCache'
+    # 单进程部署可允许后台任务状态保存在进程内缓存中
+    BACKGROUND_JOBS_LOCAL_CACHE = os.environ.get('BACKGROUND_JOBS_LOCAL_CACHE', '').lower() in ('1', 'true')
+    SEND_FILE_MAX_AGE_DEFAULT = 3600  # 静态资源缓存1小时
+    
     # 上传配置
     UPLOAD_FOLDER = os.path.join(basedir, 'static', 'uploads')
     MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # 50MB
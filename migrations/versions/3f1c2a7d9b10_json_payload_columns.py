@@ -0,0 +1,72 @@
+"""JSON载荷列由TEXT改为JSON（PostgreSQL为JSONB）
+
+Revision ID: 3f1c2a7d9b10
+Revises:
+Create Date: 2026-10-16 10:00:00.000000
+
+旧版本用 db.create_all() 建出的库中，这些列是保存 json.dumps 文本的 TEXT 列；
+用新模型 flask init-db 建出的库已是目标结构，init-db 会直接标记到最新版本。
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a7d9b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (表名, 列名)：todo_items 列在下一个版本中迁入 todo_items 表后删除
+JSON_COLUMNS = [
+    ('meeting_minutes', 'structured_data'),
+    ('meeting_minutes', 'todo_items'),
+    ('meeting_minutes', 'timeline_data'),
+    ('ppt_projects', 'content_data'),
+]
+
+
+def _existing_columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    for table, column in JSON_COLUMNS:
+        if column not in _existing_columns(table):
+            continue
+
+        # 空字符串不是合法JSON，按“无数据”处理
+        op.execute(f"UPDATE {table} SET {column} = NULL WHERE {column} = ''")
+
+        if dialect == 'postgresql':
+            op.alter_column(table, column, type_=JSONB(), existing_type=sa.Text(),
+                            postgresql_using=f'{column}::jsonb')
+            continue
+
+        if dialect == 'sqlite':
+            # 非JSON文本转成JSON字符串保存，避免读取时解码失败
+            op.execute(f'UPDATE {table} SET {column} = json_quote({column}) '
+                       f'WHERE {column} IS NOT NULL AND NOT json_valid({column})')
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, type_=sa.JSON(), existing_type=sa.Text())
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    for table, column in JSON_COLUMNS:
+        if column not in _existing_columns(table):
+            continue
+
+        if dialect == 'postgresql':
+            op.alter_column(table, column, type_=sa.Text(), existing_type=JSONB(),
+                            postgresql_using=f'{column}::text')
+            continue
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, type_=sa.Text(), existing_type=sa.JSON())
@@ -0,0 +1,129 @@
+"""会议纪要待办事项迁入todo_items表，删除meeting_minutes.todo_items列
+
+Revision ID: 8b5d4e2f6c31
+Revises: 3f1c2a7d9b10
+Create Date: 2026-10-16 10:30:00.000000
+
+删除列之前，为还没有待办事项记录的会议纪要，按列中保存的JSON补写todo_items表。
+
+"""
+import json
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision = '8b5d4e2f6c31'
+down_revision = '3f1c2a7d9b10'
+branch_labels = None
+depends_on = None
+
+todo_items_table = sa.table(
+    'todo_items',
+    sa.column('id', sa.Integer),
+    sa.column('meeting_minutes_id', sa.Integer),
+    sa.column('description', sa.Text),
+    sa.column('assignee', sa.String),
+    sa.column('priority', sa.Integer),
+    sa.column('due_date', sa.DateTime),
+    sa.column('status', sa.String),
+    sa.column('user_id', sa.Integer),
+    sa.column('created_at', sa.DateTime),
+    sa.column('updated_at', sa.DateTime),
+)
+
+
+def _json_value(value):
+    """JSON列的原始值：PostgreSQL驱动返回已解析对象，其他数据库返回文本"""
+    if isinstance(value, (str, bytes)):
+        return json.loads(value)
+    return value
+
+
+def _parse_due_date(value):
+    """ISO格式的截止日期转换为datetime，其他文本（如“下周五”）无法保存为日期，置为空"""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _todo_columns(bind):
+    return {column['name'] for column in sa.inspect(bind).get_columns('meeting_minutes')}
+
+
+def upgrade():
+    bind = op.get_bind()
+    if 'todo_items' not in _todo_columns(bind):
+        return
+
+    legacy_rows = bind.execute(sa.text(
+        'SELECT id, user_id, todo_items FROM meeting_minutes '
+        'WHERE todo_items IS NOT NULL '
+        'AND id NOT IN (SELECT meeting_minutes_id FROM todo_items)'
+    )).fetchall()
+
+    now = datetime.utcnow()
+    todo_rows = []
+    for minutes_id, user_id, raw_todos in legacy_rows:
+        todos = _json_value(raw_todos)
+        if not isinstance(todos, list):
+            continue
+        for todo in todos:
+            if not isinstance(todo, dict) or not todo.get('description'):
+                continue
+            todo_rows.append({
+                'meeting_minutes_id': minutes_id,
+                'description': todo['description'],
+                'assignee': todo.get('assignee', ''),
+                'priority': todo.get('priority', 2),
+                'due_date': _parse_due_date(todo.get('due_date')),
+                'status': todo.get('status', 'pending'),
+                'user_id': user_id,
+                'created_at': now,
+                'updated_at': now,
+            })
+
+    if todo_rows:
+        op.bulk_insert(todo_items_table, todo_rows)
+
+    with op.batch_alter_table('meeting_minutes') as batch_op:
+        batch_op.drop_column('todo_items')
+
+
+def downgrade():
+    bind = op.get_bind()
+    json_type = JSONB() if bind.dialect.name == 'postgresql' else sa.JSON()
+
+    with op.batch_alter_table('meeting_minutes') as batch_op:
+        batch_op.add_column(sa.Column('todo_items', json_type, nullable=True))
+
+    todos_by_minutes = {}
+    rows = bind.execute(
+        sa.select(todo_items_table).order_by(todo_items_table.c.id)
+    ).mappings()
+    for row in rows:
+        todos_by_minutes.setdefault(row['meeting_minutes_id'], []).append({
+            'description': row['description'],
+            'assignee': row['assignee'],
+            'priority': row['priority'],
+            'due_date': row['due_date'].isoformat() if row['due_date'] else None,
+            'status': row['status'],
+        })
+
+    meeting_minutes_table = sa.table(
+        'meeting_minutes',
+        sa.column('id', sa.Integer),
+        sa.column('todo_items', json_type),
+    )
+    for minutes_id, todos in todos_by_minutes.items():
+        bind.execute(
+            meeting_minutes_table.update()
+            .where(meeting_minutes_table.c.id == minutes_id)
+            .values(todo_items=todos)
+        )
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+测试AI分析结果解析
+"""
+
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import ai_analyzer as ai_analyzer_module
+from app.ai_analyzer import AIAnalyzer
+
+
+AI_CONTENT = """数据质量综合评价：3星
+
+## 主要问题
+1. 缺失值比例较高，Salary列缺失超过三成
+- 存在完全重复的数据行需要清理
+- 太短
+
+## 改进建议
+* 使用中位数填充Salary列的缺失值
+2) 删除重复行后再进行后续统计分析
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """每个测试前清空AI分析结果缓存"""
+    ai_analyzer_module._result_cache.clear()
+    yield
+    ai_analyzer_module._result_cache.clear()
+
+
+@pytest.fixture
+def analyzer():
+    """创建不带API密钥的分析器"""
+    return AIAnalyzer(api_key='')
+
+
+class TestAIResponseParsing:
+    """测试AI响应解析"""
+    
+    def test_quality_rating(self, analyzer):
+        """测试星级提取"""
+        assert analyzer._extract_quality_rating(AI_CONTENT) == 3
+        assert analyzer._extract_quality_rating('无评分信息') == 3
+    
+    @pytest.mark.parametrize('content, rating', [
+        ('4/5星', 5),
+        ('评分：2，整体 4/5', 2),
+        ('质量 4/5，Quality level 2', 4),
+        ('0星，评分：4', 4),
+    ])
+    def test_quality_rating_priority(self, analyzer, content, rating):
+        """测试多种写法重叠或同时出现时按星级、评分、n/5、quality的优先级取值"""
+        assert analyzer._extract_quality_rating(content) == rating
+    
+    def test_key_issues_bucketed_by_section(self, analyzer):
+        """测试问题项只归入问题章节"""
+        issues = analyzer._extract_key_issues(AI_CONTENT)
+        assert issues == [
+            '缺失值比例较高，Salary列缺失超过三成',
+            '存在完全重复的数据行需要清理'
+        ]
+    
+    def test_recommendations_bucketed_by_section(self, analyzer):
+        """测试建议项只归入建议章节"""
+        recommendations = analyzer._extract_recommendations(AI_CONTENT)
+        assert recommendations == [
+            '使用中位数填充Salary列的缺失值',
+            '删除重复行后再进行后续统计分析'
+        ]
+    
+    def test_fallbacks_without_sections(self, analyzer):
+        """测试无章节时的回退结果"""
+        content = "- 第一点\n- 第二点"
+        assert analyzer._extract_key_issues(content) == ['第一点', '第二点']
+        assert len(analyzer._extract_recommendations(content)) == 3
+
+
+
+class FakeStreamResponse:
+    """模拟DeepSeek流式响应"""
+    
+    def __init__(self, lines):
+        self.lines = lines
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def raise_for_status(self):
+        pass
+    
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+class TestStreamAnalysis:
+    """测试流式AI分析"""
+    
+    def test_stream_yields_deltas_then_result(self, monkeypatch):
+        """测试逐段输出SSE内容并在最后给出解析结果"""
+        lines = [
+            b'data: {"choices":[{"delta":{"content":"\\u8bc4\\u5206\\uff1a4"}}]}',
+            b'',
+            b'data: {"choices":[{"delta":{}}]}',
+            b'data: [DONE]'
+        ]
+        monkeypatch.setattr(
+            ai_analyzer_module._SESSION, 'post',
+            lambda *args, **kwargs: FakeStreamResponse(lines)
+        )
+        
+        messages = list(AIAnalyzer(api_key='key').stream_analysis({}, []))
+        
+        assert messages[0] == {'content': '评分：4'}
+        assert messages[-1]['result']['quality_rating'] == 4
+        assert len(messages) == 2
+    
+    def test_stream_without_api_key(self, analyzer):
+        """测试无API密钥时返回模拟分析"""
+        messages = list(analyzer.stream_analysis({}, []))
+        assert 'content' in messages[0]
+        assert messages[-1]['result']['quality_rating'] == 5
+
+
+
+class TestResultCache:
+    """测试AI分析结果缓存"""
+    
+    def test_repeated_analysis_hits_cache(self, monkeypatch):
+        """测试相同报告和样本只调用一次API"""
+        calls = []
+        
+        def fake_call(self, data_report, sample_data):
+            calls.append(1)
+            result = {'ai_analysis': '评分：4', 'quality_rating': 4}
+            ai_analyzer_module._set_cached_analysis(
+                ai_analyzer_module._analysis_cache_key(data_report, sample_data), result
+            )
+            return result
+        
+        monkeypatch.setattr(AIAnalyzer, '_call_deepseek_api', fake_call)
+        analyzer = AIAnalyzer(api_key='key')
+        report = {'basic_stats': {'row_count': 3}}
+        sample = [{'a': 1}]
+        
+        first = analyzer.analyze_data_quality(report, sample)
+        second = analyzer.analyze_data_quality(report, sample)
+        third = analyzer.analyze_data_quality(report, [{'a': 2}])
+        
+        assert first == second == third
+        assert len(calls) == 2
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+测试用户注册
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import insert
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import auth as auth_module
+from app import create_app
+from app.auth import create_users
+from app.models import User, db
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """创建测试应用"""
+    # 数据库地址在create_app时读取，需在创建应用前设置
+    monkeypatch.setenv('DATABASE_URL', 'sqlite:///:memory:')
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['WTF_CSRF_ENABLED'] = False
+    # 测试中使用快速哈希算法
+    app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1'
+    
+    with app.app_context():
+        db.create_all()
+        create_users([{'username': 'alice', 'email': 'alice@example.com', 'password': 'secret123'}])
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    """创建测试客户端"""
+    return app.test_client()
+
+
+@pytest.fixture
+def generic_insert(monkeypatch):
+    """模拟不支持忽略冲突的数据库：使用普通INSERT，重复行抛出IntegrityError"""
+    monkeypatch.setattr(auth_module, '_insert_ignore_conflicts', lambda table: insert(table))
+
+
+def _register(client, username, email):
+    return client.post('/auth/register', json={
+        'username': username,
+        'email': email,
+        'password': 'secret123',
+        'confirm_password': 'secret123'
+    })
+
+
+class TestRegister:
+    """测试注册接口"""
+
+    def test_register_success(self, client):
+        """测试新用户注册成功"""
+        response = _register(client, 'bob', 'bob@example.com')
+
+        assert response.status_code == 200
+        assert response.get_json() == {'success': True, 'message': '注册成功'}
+        assert User.query.filter_by(username='bob').count() == 1
+
+    @pytest.mark.parametrize('username, email, errors', [
+        ('alice', 'new@example.com', ['用户名已被使用']),
+        ('new', 'alice@example.com', ['邮箱已被使用']),
+        ('alice', 'alice@example.com', ['用户名已被使用', '邮箱已被使用']),
+    ])
+    def test_register_duplicate(self, client, username, email, errors):
+        """测试用户名或邮箱重复时返回具体的冲突字段"""
+        response = _register(client, username, email)
+
+        assert response.status_code == 400
+        assert response.get_json() == {'success': False, 'errors': errors}
+
+    def test_register_duplicate_generic_insert(self, client, generic_insert):
+        """测试普通INSERT遇到唯一约束冲突时返回400而不是500"""
+        response = _register(client, 'alice', 'new@example.com')
+
+        assert response.status_code == 400
+        assert response.get_json()['errors'] == ['用户名已被使用']
+
+    def test_register_conflict_row_vanished(self, client, monkeypatch):
+        """测试未插入且查不到冲突行时按失败处理，不报告注册成功"""
+        monkeypatch.setattr(auth_module, 'create_users', lambda rows, batch_size: 0)
+
+        response = _register(client, 'bob', 'bob@example.com')
+
+        assert response.status_code == 400
+        assert response.get_json() == {'success': False, 'errors': ['注册失败，请重试']}
+
+
+class TestCreateUsers:
+    """测试批量创建用户"""
+
+    ROWS = [
+        {'username': 'alice', 'email': 'other@example.com', 'password': 'secret123'},
+        {'username': 'bob', 'email': 'bob@example.com', 'password': 'secret123'},
+        {'username': 'carol', 'email': 'alice@example.com', 'password': 'secret123'},
+    ]
+
+    def test_skips_conflicts(self, app):
+        """测试跳过重复行，只统计实际创建的用户"""
+        assert create_users(self.ROWS) == 1
+        assert sorted(user.username for user in User.query) == ['alice', 'bob']
+
+    def test_skips_conflicts_generic_insert(self, app, generic_insert):
+        """测试普通INSERT整批冲突时逐行插入，跳过重复行"""
+        assert create_users(self.ROWS) == 1
+        assert sorted(user.username for user in User.query) == ['alice', 'bob']
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+测试后台任务
+"""
+
+import os
+import sys
+import time
+
+import pytest
+from flask import jsonify
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import cache, create_app
+from app.background import FAILURE, SUCCESS, background_capable, get_job
+from app.models import User, db
+
+
+@background_capable
+def _echo_view():
+    """测试视图：返回固定结果"""
+    return jsonify({'success': True, 'value': 42})
+
+
+@background_capable
+def _failing_view():
+    """测试视图：执行时抛出异常"""
+    raise ValueError('数据格式错误')
+
+
+@background_capable
+def _rejected_view():
+    """测试视图：返回4xx错误"""
+    return jsonify({'success': False, 'message': '参数无效'}), 400
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """创建测试应用（单进程测试允许使用进程内缓存保存任务状态）"""
+    # 数据库地址在create_app时读取，需在创建应用前设置
+    monkeypatch.setenv('DATABASE_URL', 'sqlite:///:memory:')
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['BACKGROUND_JOBS_LOCAL_CACHE'] = True
+    app.add_url_rule('/test/echo', view_func=_echo_view, methods=['POST'])
+    app.add_url_rule('/test/fail', view_func=_failing_view, methods=['POST'])
+    app.add_url_rule('/test/reject', view_func=_rejected_view, methods=['POST'])
+    
+    with app.app_context():
+        db.create_all()
+        cache.clear()
+        user = User(username='testuser', email='test@example.com')
+        user.set_password('testpass123')
+        db.session.add(user)
+        db.session.commit()
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    """创建已登录的测试客户端"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(User.query.first().id)
+    return client
+
+
+def _wait_for_job(client, job_id, timeout=5):
+    """轮询任务状态直到结束"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get(f'/api/jobs/{job_id}')
+        assert response.status_code == 200
+        job = response.get_json()
+        if job['state'] in (SUCCESS, FAILURE):
+            return job
+        time.sleep(0.02)
+    pytest.fail(f'任务 {job_id} 未在 {timeout} 秒内结束')
+
+
+class TestBackgroundJobs:
+    """测试后台任务提交与轮询"""
+
+    def test_sync_by_default(self, client):
+        """测试不带async参数时同步执行"""
+        response = client.post('/test/echo')
+        assert response.status_code == 200
+        assert response.get_json() == {'success': True, 'value': 42}
+
+    def test_submit_and_poll(self, client):
+        """测试提交后台任务返回202，轮询得到原视图的响应"""
+        response = client.post('/test/echo?async=1')
+        assert response.status_code == 202
+        body = response.get_json()
+        assert body['success'] and body['state'] == 'PENDING'
+
+        job = _wait_for_job(client, body['job_id'])
+        assert job['state'] == SUCCESS
+        assert job['status_code'] == 200
+        assert job['result'] == {'success': True, 'value': 42}
+
+    def test_view_exception_marks_failure(self, client):
+        """测试视图抛出异常时任务失败并记录错误信息"""
+        job_id = client.post('/test/fail?async=1').get_json()['job_id']
+
+        job = _wait_for_job(client, job_id)
+        assert job['state'] == FAILURE
+        assert job['status_code'] == 500
+        assert '数据格式错误' in job['result']['message']
+
+    def test_error_status_marks_failure(self, client):
+        """测试视图返回4xx时任务失败并保留原响应"""
+        job_id = client.post('/test/reject?async=1').get_json()['job_id']
+
+        job = _wait_for_job(client, job_id)
+        assert job['state'] == FAILURE
+        assert job['status_code'] == 400
+        assert job['result'] == {'success': False, 'message': '参数无效'}
+
+    def test_other_users_job_not_found(self, client):
+        """测试任务只能由提交者查询"""
+        job_id = client.post('/test/echo?async=1').get_json()['job_id']
+        _wait_for_job(client, job_id)
+
+        owner_id = User.query.first().id
+        assert get_job(job_id, owner_id) is not None
+        assert get_job(job_id, owner_id + 1) is None
+
+    def test_local_cache_refused(self, app, client):
+        """测试进程内缓存未显式允许时拒绝后台执行"""
+        app.config['BACKGROUND_JOBS_LOCAL_CACHE'] = False
+
+        response = client.post('/test/echo?async=1')
+        assert response.status_code == 503
+        assert 'CACHE_REDIS_URL' in response.get_json()['message']
+
+        # 同步调用不受影响
+        assert client.post('/test/echo').status_code == 200
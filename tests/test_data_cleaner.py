@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+测试数据清洗器
+"""
+
+import os
+import sys
+import tempfile
+
+import orjson
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.data_cleaner import DataCleaner
+
+
+@pytest.fixture
+def make_csv():
+    """将文本写入临时CSV文件，返回加载好数据的清洗器"""
+    paths = []
+
+    def _make(content):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as f:
+            f.write(content)
+            paths.append(f.name)
+        cleaner = DataCleaner(f.name)
+        assert cleaner.load_data()
+        return cleaner
+
+    yield _make
+    for path in paths:
+        os.unlink(path)
+
+
+class TestCleanData:
+    """测试清洗流程"""
+
+    def test_dedup_before_type_conversion(self, make_csv):
+        """测试先去重再转换类型：转换失败变为NaN的不同取值不应被当作重复行删除"""
+        cleaner = make_csv('id,code\n1,abc\n1,def\n')
+        df, report = cleaner.clean_data({
+            'missing_strategy': 'none',
+            'type_conversions': {'code': 'numeric'}
+        })
+
+        assert report['removed_rows'] == 0
+        assert len(df) == 2
+        assert df['code'].isna().all()
+
+    def test_text_columns_keep_dtype(self, make_csv):
+        """测试未要求转换的低基数文本列保持原类型"""
+        cleaner = make_csv('city,value\nA,1\nA,2\nA,3\nA,4\nB,5\n')
+        df, _ = cleaner.clean_data({'remove_duplicates': False})
+
+        assert df['city'].dtype == cleaner.df['city'].dtype
+        assert df['city'].dtype != 'category'
+
+
+class TestCsvRoundTrip:
+    """测试CSV读取与导出"""
+
+    def test_date_column_round_trip(self, make_csv, tmp_path):
+        """测试日期列按原文本读取，JSON导出保持ISO日期字符串"""
+        cleaner = make_csv('date,amount\n2024-01-02,10\n2024-02-03,20\n')
+
+        assert cleaner.df['date'].tolist() == ['2024-01-02', '2024-02-03']
+        report = cleaner.analyze_data_quality()
+        assert 'object' not in report['basic_stats']['data_types'].values()
+
+        cleaner.clean_data({})
+        output_path = cleaner.export_data('json', str(tmp_path / 'out.json'))
+        with open(output_path, 'rb') as f:
+            records = orjson.loads(f.read())
+
+        assert records == [
+            {'date': '2024-01-02', 'amount': 10},
+            {'date': '2024-02-03', 'amount': 20}
+        ]
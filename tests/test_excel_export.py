@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+测试Excel数据流式导出API
+"""
+
+import os
+import sys
+
+import orjson
+import pandas as pd
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import cache, create_app
+from app import main as main_module
+from app.data_cleaner import DataCleaner
+from app.models import Upload, User, db
+
+# 默认导出选项会删除重复行
+CSV_CONTENT = 'name,score\nAlice,90\nBob,85\nAlice,90\n'
+CLEANED_DF = pd.DataFrame({'name': ['Alice', 'Bob'], 'score': [90, 85]})
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """创建测试应用"""
+    # 数据库地址在create_app时读取，需在创建应用前设置
+    monkeypatch.setenv('DATABASE_URL', 'sqlite:///:memory:')
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['WTF_CSRF_ENABLED'] = False
+    
+    with app.app_context():
+        db.create_all()
+        cache.clear()
+        yield app
+
+
+@pytest.fixture
+def test_user(app):
+    """创建测试用户"""
+    user = User(username='testuser', email='test@example.com')
+    user.set_password('testpass123')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def client(app, test_user):
+    """创建已登录的测试客户端"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(test_user.id)
+    return client
+
+
+@pytest.fixture
+def upload(test_user, tmp_path):
+    """创建指向测试CSV文件的上传记录"""
+    filepath = tmp_path / 'scores.csv'
+    filepath.write_text(CSV_CONTENT, encoding='utf-8')
+    upload = Upload(
+        filename='scores.csv',
+        original_filename='scores.csv',
+        file_size=filepath.stat().st_size,
+        file_type='excel',
+        upload_path=str(filepath),
+        user_id=test_user.id
+    )
+    db.session.add(upload)
+    db.session.commit()
+    return upload
+
+
+@pytest.fixture
+def load_counter(monkeypatch):
+    """统计数据加载次数，用于判断清洗结果是否命中缓存"""
+    calls = []
+    original = DataCleaner.load_data
+
+    def counting_load(self):
+        calls.append(self.file_path)
+        return original(self)
+
+    monkeypatch.setattr(DataCleaner, 'load_data', counting_load)
+    return calls
+
+
+class TestExcelExportDownload:
+    """测试流式下载"""
+
+    def test_json_body(self, client, upload):
+        """测试JSON导出为records数组"""
+        response = client.get(f'/api/excel/export/{upload.id}/download?format=json')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        assert "scores_cleaned.json" in response.headers['Content-Disposition']
+        assert orjson.loads(response.data) == [
+            {'name': 'Alice', 'score': 90},
+            {'name': 'Bob', 'score': 85}
+        ]
+
+    def test_html_body(self, client, upload):
+        """测试HTML导出与to_html(index=False)一致"""
+        response = client.get(f'/api/excel/export/{upload.id}/download?format=html')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/html'
+        assert response.get_data(as_text=True) == CLEANED_DF.to_html(index=False)
+
+    def test_csv_body_with_bom(self, client, upload):
+        """测试CSV导出带UTF-8 BOM，便于Excel识别编码"""
+        response = client.get(f'/api/excel/export/{upload.id}/download?format=csv')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert response.data.startswith(b'\xef\xbb\xbf')
+        assert response.data.decode('utf-8-sig') == 'name,score\nAlice,90\nBob,85\n'
+
+    def test_unsupported_format(self, client, upload):
+        """测试不支持流式导出的格式返回400"""
+        response = client.get(f'/api/excel/export/{upload.id}/download?format=excel')
+
+        assert response.status_code == 400
+        assert response.get_json()['success'] is False
+
+
+class TestExcelExportPrepare:
+    """测试预先清洗与结果缓存"""
+
+    def test_prepare_returns_download_urls(self, client, upload, load_counter):
+        """测试prepare返回各流式格式的下载地址，下载时复用已缓存的清洗结果"""
+        response = client.get(f'/api/excel/export/{upload.id}/prepare')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['row_count'] == 2
+        assert set(data['download_urls']) == {'json', 'html', 'csv'}
+
+        download = client.get(data['download_urls']['csv'])
+        assert download.data.decode('utf-8-sig') == 'name,score\nAlice,90\nBob,85\n'
+        assert len(load_counter) == 1
+
+    def test_large_frame_not_cached(self, client, upload, load_counter, monkeypatch):
+        """测试超过大小上限的清洗结果不放入缓存，每次重新清洗"""
+        monkeypatch.setattr(main_module, '_EXPORT_FRAME_CACHE_MAX_BYTES', 0)
+
+        client.get(f'/api/excel/export/{upload.id}/prepare')
+        client.get(f'/api/excel/export/{upload.id}/download?format=json')
+
+        assert len(load_counter) == 2
@@ -12,16 +12,18 @@ import pytest
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app import create_app
+from app import cache, create_app
+from app import main as main_module
 from app.models import Upload, User, db
 
 
 @pytest.fixture
-def app():
+def app(monkeypatch):
     """创建测试应用"""
+    # 数据库地址在create_app时读取，需在创建应用前设置
+    monkeypatch.setenv('DATABASE_URL', 'sqlite:///:memory:')
     app = create_app()
     app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
     app.config['WTF_CSRF_ENABLED'] = False
     
     with app.app_context():
@@ -37,13 +39,12 @@ def client(app):
 
 @pytest.fixture
 def test_user(app):
-    """创建测试用户"""
-    with app.app_context():
-        user = User(username='testuser', email='test@example.com')
-        user.set_password('testpass123')
-        db.session.add(user)
-        db.session.commit()
-        return user
+    """创建测试用户（在app夹具的应用上下文中创建，实例在测试期间保持绑定会话）"""
+    user = User(username='testuser', email='test@example.com')
+    user.set_password('testpass123')
+    db.session.add(user)
+    db.session.commit()
+    return user
 
 
 @pytest.fixture
@@ -87,6 +88,21 @@ def test_csv_file():
     os.unlink(filepath)
 
 
+def _create_upload(user, filepath, filename):
+    """为测试用户创建指向filepath的上传记录"""
+    upload = Upload(
+        filename=filename,
+        original_filename=filename,
+        file_size=os.path.getsize(filepath),
+        file_type='excel',
+        upload_path=filepath,
+        user_id=user.id
+    )
+    db.session.add(upload)
+    db.session.commit()
+    return upload
+
+
 class TestExcelPreviewEnhanced:
     """测试增强版Excel预览API"""
     
@@ -96,6 +112,9 @@ class TestExcelPreviewEnhanced:
             # 创建上传记录
             upload = Upload(
                 filename='test.xlsx',
+                original_filename='test.xlsx',
+                file_size=0,
+                file_type='excel',
                 upload_path=test_excel_file,
                 user_id=test_user.id
             )
@@ -108,7 +127,7 @@ class TestExcelPreviewEnhanced:
             
             # 调用API
             response = client.get(f'/api/excel/preview/{upload.id}')
-            data = response.json()
+            data = response.get_json()
             
             # 验证响应结构
             assert response.status_code == 200
@@ -129,6 +148,9 @@ class TestExcelPreviewEnhanced:
         with app.app_context():
             upload = Upload(
                 filename='test.xlsx',
+                original_filename='test.xlsx',
+                file_size=0,
+                file_type='excel',
                 upload_path=test_excel_file,
                 user_id=test_user.id
             )
@@ -138,12 +160,14 @@ class TestExcelPreviewEnhanced:
             with client.session_transaction() as session:
                 session['_user_id'] = str(test_user.id)
             
-            response = client.get(f'/api/excel/preview/{upload.id}')
-            data = response.json()
+            response = client.get(f'/api/excel/preview/{upload.id}?full_stats=1')
+            data = response.get_json()
             
             # 验证基本维度
             stats = data['stats']
-            assert stats['row_count'] == 5  # 包含空行
+            # 第4行全部为空，预处理时删除
+            assert stats['row_count'] == 4
+            assert stats['preprocessing']['removed_empty_rows'] == 1
             assert stats['column_count'] == 4
             
             # 验证缺失值统计
@@ -160,12 +184,22 @@ class TestExcelPreviewEnhanced:
             required_stats = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
             for stat in required_stats:
                 assert stat in age_stats
+            assert age_stats['50%'] == 31.0
+            
+            # 默认请求不计算分位数
+            response = client.get(f'/api/excel/preview/{upload.id}')
+            age_stats = response.get_json()['stats']['numeric_stats']['Age']
+            assert set(age_stats) == {'count', 'mean', 'std', 'min', 'max'}
+            assert age_stats['mean'] == 30.5
     
     def test_csv_file_support(self, app, client, test_user, test_csv_file):
         """测试CSV文件支持"""
         with app.app_context():
             upload = Upload(
                 filename='test.csv',
+                original_filename='test.csv',
+                file_size=0,
+                file_type='excel',
                 upload_path=test_csv_file,
                 user_id=test_user.id
             )
@@ -176,11 +210,33 @@ class TestExcelPreviewEnhanced:
                 session['_user_id'] = str(test_user.id)
             
             response = client.get(f'/api/excel/preview/{upload.id}')
-            data = response.json()
+            data = response.get_json()
             
             assert response.status_code == 200
             assert data['success'] == True
             assert len(data['data']) > 0
+            
+            # numpy计数由JSON序列化直接输出为整数
+            stats = data['stats']
+            assert type(stats['row_count']) is int
+            assert type(stats['missing_values_total']) is int
+            assert all(type(v) is int for v in stats['missing_values_by_column'].values())
+            assert b'"missing_values_total":0' in response.get_data()
+    
+    def test_float_precision(self, client, test_user, tmp_path):
+        """测试预览行中的浮点数保持完整精度"""
+        values = [3.141592653589793, 1.23456789e-07, 12345678901234567.0]
+        filepath = tmp_path / 'floats.csv'
+        filepath.write_text('value\n' + '\n'.join(repr(v) for v in values) + '\n', encoding='utf-8')
+        upload = _create_upload(test_user, str(filepath), 'floats.csv')
+        
+        with client.session_transaction() as session:
+            session['_user_id'] = str(test_user.id)
+        
+        response = client.get(f'/api/excel/preview/{upload.id}')
+        
+        assert response.status_code == 200
+        assert [row['value'] for row in response.get_json()['data']] == values
     
     def test_error_handling_invalid_format(self, app, client, test_user):
         """测试不支持文件格式的错误处理"""
@@ -193,6 +249,9 @@ class TestExcelPreviewEnhanced:
             with app.app_context():
                 upload = Upload(
                     filename='test.pdf',
+                    original_filename='test.pdf',
+                    file_size=0,
+                    file_type='excel',
                     upload_path=filepath,
                     user_id=test_user.id
                 )
@@ -203,7 +262,7 @@ class TestExcelPreviewEnhanced:
                     session['_user_id'] = str(test_user.id)
                 
                 response = client.get(f'/api/excel/preview/{upload.id}')
-                data = response.json()
+                data = response.get_json()
                 
                 # 应该返回400错误
                 assert response.status_code == 400
@@ -218,6 +277,9 @@ class TestExcelPreviewEnhanced:
             # 创建记录但文件实际不存在
             upload = Upload(
                 filename='missing.xlsx',
+                original_filename='missing.xlsx',
+                file_size=0,
+                file_type='excel',
                 upload_path='/path/to/nonexistent/file.xlsx',
                 user_id=test_user.id
             )
@@ -228,7 +290,7 @@ class TestExcelPreviewEnhanced:
                 session['_user_id'] = str(test_user.id)
             
             response = client.get(f'/api/excel/preview/{upload.id}')
-            data = response.json()
+            data = response.get_json()
             
             assert response.status_code == 404
             assert data['success'] == False
@@ -253,6 +315,9 @@ class TestExcelPreviewEnhanced:
             with app.app_context():
                 upload = Upload(
                     filename='test_empty.xlsx',
+                    original_filename='test_empty.xlsx',
+                    file_size=0,
+                    file_type='excel',
                     upload_path=filepath,
                     user_id=test_user.id
                 )
@@ -263,12 +328,17 @@ class TestExcelPreviewEnhanced:
                     session['_user_id'] = str(test_user.id)
                 
                 response = client.get(f'/api/excel/preview/{upload.id}')
-                data = response.json()
+                data = response.get_json()
                 
                 # 验证预处理信息
                 preprocessing = data['stats']['preprocessing']
                 assert preprocessing['removed_empty_columns'] == 1  # 删除了全空列
                 assert preprocessing['cleaned_shape'][1] == 2  # 处理后列数为2
+                
+                # 缺失值只统计删除空行空列后的数据
+                stats = data['stats']
+                assert stats['missing_values_by_column'] == {'Col1': 1, 'Col3': 0}
+                assert stats['missing_values_total'] == 1
         finally:
             os.unlink(filepath)
     
@@ -277,6 +347,9 @@ class TestExcelPreviewEnhanced:
         with app.app_context():
             upload = Upload(
                 filename='test.xlsx',
+                original_filename='test.xlsx',
+                file_size=0,
+                file_type='excel',
                 upload_path=test_excel_file,
                 user_id=test_user.id
             )
@@ -287,7 +360,7 @@ class TestExcelPreviewEnhanced:
                 session['_user_id'] = str(test_user.id)
             
             response = client.get(f'/api/excel/preview/{upload.id}')
-            data = response.json()
+            data = response.get_json()
             
             # 原有基础API功能仍然正常工作
             assert response.status_code == 200
@@ -298,6 +371,207 @@ class TestExcelPreviewEnhanced:
             if len(data['data']) > 0:
                 assert isinstance(data['data'][0], dict)
 
+    
+    def test_large_csv_streamed_summary(self, app, client, test_user, monkeypatch):
+        """测试大CSV走分块流式统计，结果与整表读取一致"""
+        df = pd.DataFrame({
+            'Product': ['A', 'B', None, 'D', 'E', 'F', 'G'],
+            'Price': [1.5, 2.0, None, 4.25, None, 8.0, 3.5],
+            'Quantity': [10, 20, None, 40, 50, 60, 70]
+        })
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+            df.to_csv(f.name, index=False)
+            filepath = f.name
+        
+        try:
+            upload = Upload(
+                filename='large.csv',
+                original_filename='large.csv',
+                file_size=os.path.getsize(filepath),
+                file_type='excel',
+                upload_path=filepath,
+                user_id=test_user.id
+            )
+            db.session.add(upload)
+            db.session.commit()
+            
+            with client.session_transaction() as session:
+                session['_user_id'] = str(test_user.id)
+            
+            # 整表读取的结果作为对照
+            expected = client.get(f'/api/excel/preview/{upload.id}').get_json()
+            cache.clear()
+            
+            # 阈值设为0使任意CSV都走流式路径，分块行数设小以覆盖分块合并
+            streamed_calls = []
+            stream_csv_summary = main_module._stream_csv_summary
+            def spy(*args, **kwargs):
+                streamed_calls.append(args)
+                return stream_csv_summary(*args, **kwargs)
+            monkeypatch.setattr(main_module, '_PREVIEW_STREAM_MIN_BYTES', 0)
+            monkeypatch.setattr(main_module, '_PREVIEW_CHUNK_SIZE', 3)
+            monkeypatch.setattr(main_module, '_stream_csv_summary', spy)
+            
+            response = client.get(f'/api/excel/preview/{upload.id}')
+            data = response.get_json()
+            
+            assert response.status_code == 200
+            assert len(streamed_calls) == 1
+            assert data['data'] == expected['data']
+            
+            stats, expected_stats = data['stats'], expected['stats']
+            for key in ('row_count', 'column_count', 'data_types', 'missing_values_total',
+                        'missing_values_by_column', 'preprocessing'):
+                assert stats[key] == expected_stats[key]
+            assert stats['preprocessing']['removed_empty_rows'] == 1
+            for col in ('Price', 'Quantity'):
+                for stat, value in expected_stats['numeric_stats'][col].items():
+                    assert stats['numeric_stats'][col][stat] == pytest.approx(value)
+        finally:
+            os.unlink(filepath)
+
+    
+    def test_preview_cached_with_etag(self, app, client, test_user, test_csv_file, monkeypatch):
+        """测试预览结果按文件版本缓存并返回ETag，重复请求可返回304"""
+        upload = Upload(
+            filename='test.csv',
+            original_filename='test.csv',
+            file_size=os.path.getsize(test_csv_file),
+            file_type='excel',
+            upload_path=test_csv_file,
+            user_id=test_user.id
+        )
+        db.session.add(upload)
+        db.session.commit()
+        
+        with client.session_transaction() as session:
+            session['_user_id'] = str(test_user.id)
+        
+        first = client.get(f'/api/excel/preview/{upload.id}')
+        assert first.status_code == 200
+        assert first.headers.get('ETag')
+        
+        # 命中缓存时不再解析文件
+        def fail_read_csv(*args, **kwargs):
+            raise AssertionError('预览缓存未命中')
+        monkeypatch.setattr(main_module.pd, 'read_csv', fail_read_csv)
+        
+        second = client.get(f'/api/excel/preview/{upload.id}')
+        assert second.status_code == 200
+        assert second.get_data() == first.get_data()
+        assert second.headers['ETag'] == first.headers['ETag']
+        
+        not_modified = client.get(
+            f'/api/excel/preview/{upload.id}',
+            headers={'If-None-Match': first.headers['ETag']}
+        )
+        assert not_modified.status_code == 304
+        assert not_modified.get_data() == b''
+
+    
+    def test_merged_cells_expanded(self, app, client, test_user):
+        """测试xlsx预览展开合并单元格"""
+        import openpyxl
+        
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(['Region', 'Q1', 'Q2'])
+        ws.append(['North', 1, 2])
+        ws.append([None, 3, 4])
+        ws.append(['South', 5, 6])
+        ws.merge_cells('A2:A3')
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as f:
+            filepath = f.name
+        wb.save(filepath)
+        
+        try:
+            upload = _create_upload(test_user, filepath, 'merged.xlsx')
+            with client.session_transaction() as session:
+                session['_user_id'] = str(test_user.id)
+            
+            response = client.get(f'/api/excel/preview/{upload.id}')
+            data = response.get_json()
+            
+            assert response.status_code == 200
+            assert [row['Region'] for row in data['data']] == ['North', 'North', 'South']
+            assert data['stats']['missing_values_by_column']['Region'] == 0
+        finally:
+            os.unlink(filepath)
+
+    
+    def test_rectangular_sheet_matches_pandas(self, app, client, test_user, monkeypatch):
+        """测试等宽工作表一次构造数组后，预览与pandas读取结果一致"""
+        from app import data_cleaner
+        # 固定走openpyxl只读路径（未安装calamine时的行为）
+        monkeypatch.setattr(data_cleaner, 'HAS_CALAMINE', False)
+        
+        df = pd.DataFrame({
+            'Name': ['Alice', None, 'Carol'],
+            'Score': [1.5, 2.0, None],
+            'Joined': pd.to_datetime(['2024-01-02', '2024-02-03', None]),
+            'Active': [True, False, True]
+        })
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as f:
+            df.to_excel(f.name, index=False, engine='openpyxl')
+            filepath = f.name
+        
+        try:
+            upload = _create_upload(test_user, filepath, 'rect.xlsx')
+            with client.session_transaction() as session:
+                session['_user_id'] = str(test_user.id)
+            
+            data = client.get(f'/api/excel/preview/{upload.id}').get_json()
+            expected = main_module._frame_records(pd.read_excel(filepath, engine='openpyxl'))
+            
+            assert data['data'] == expected
+            assert data['stats']['missing_values_by_column'] == {
+                'Name': 1, 'Score': 1, 'Joined': 1, 'Active': 0
+            }
+        finally:
+            os.unlink(filepath)
+
+    
+    def test_stats_values(self, app, client, test_user):
+        """测试类型分布与数值统计的取值（单值列标准差为null）"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write('City,Sales,Rate\nA,10,0.5\nB,30,\nC,20,\n')
+            filepath = f.name
+        
+        try:
+            upload = _create_upload(test_user, filepath, 'stats.csv')
+            with client.session_transaction() as session:
+                session['_user_id'] = str(test_user.id)
+            
+            stats = client.get(f'/api/excel/preview/{upload.id}').get_json()['stats']
+            
+            assert stats['data_types'] == {'str': 1, 'int64': 1, 'float64': 1}
+            assert stats['numeric_stats']['Sales'] == {
+                'count': 3.0, 'mean': 20.0, 'std': 10.0, 'min': 10.0, 'max': 30.0
+            }
+            assert stats['numeric_stats']['Rate'] == {
+                'count': 1.0, 'mean': 0.5, 'std': None, 'min': 0.5, 'max': 0.5
+            }
+        finally:
+            os.unlink(filepath)
+
+    
+    def test_columns_projection(self, app, client, test_user, test_csv_file, test_excel_file):
+        """测试?columns=只读取并统计指定的列，不存在的列名忽略"""
+        with client.session_transaction() as session:
+            session['_user_id'] = str(test_user.id)
+        
+        csv_upload = _create_upload(test_user, test_csv_file, 'test.csv')
+        data = client.get(f'/api/excel/preview/{csv_upload.id}?columns=Price,Missing').get_json()
+        assert list(data['data'][0]) == ['Price']
+        assert data['stats']['column_count'] == 1
+        assert list(data['stats']['numeric_stats']) == ['Price']
+        
+        excel_upload = _create_upload(test_user, test_excel_file, 'test.xlsx')
+        data = client.get(f'/api/excel/preview/{excel_upload.id}?columns=Name,Age').get_json()
+        assert set(data['data'][0]) == {'Name', 'Age'}
+        assert data['stats']['column_count'] == 2
+        assert data['stats']['missing_values_by_column'] == {'Name': 0, 'Age': 0}
+
 
 if __name__ == '__main__':
     # 简单运行测试（需要pytest）
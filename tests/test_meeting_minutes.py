@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+测试会议纪要接口
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime
+
+import orjson
+import pytest
+from flask_migrate import stamp, upgrade
+from sqlalchemy import inspect, text
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+
+from app import cache, create_app
+from app.meeting_minutes import MeetingMinutesAssistant, SummaryGenerator
+from app.models import MeetingMinutes, TodoItem, Upload, User, db
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """创建测试应用"""
+    # 数据库地址在create_app时读取，需在创建应用前设置
+    monkeypatch.setenv('DATABASE_URL', 'sqlite:///:memory:')
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['WTF_CSRF_ENABLED'] = False
+    
+    with app.app_context():
+        db.create_all()
+        cache.clear()
+        yield app
+
+
+@pytest.fixture
+def test_user(app):
+    """创建测试用户"""
+    user = User(username='testuser', email='test@example.com')
+    user.set_password('testpass123')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def client(app, test_user):
+    """创建已登录的测试客户端"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(test_user.id)
+    return client
+
+
+@pytest.fixture
+def minutes(test_user):
+    """创建带两条待办事项的会议纪要"""
+    minutes = MeetingMinutes(
+        title='周例会',
+        original_text='会议原文',
+        summary='会议摘要',
+        structured_data={'decisions': ['上线新版本']},
+        timeline_data=[],
+        processing_status='completed',
+        user_id=test_user.id
+    )
+    db.session.add(minutes)
+    db.session.flush()
+    db.session.add_all([
+        TodoItem(meeting_minutes_id=minutes.id, description='整理需求', assignee='张三',
+                 priority=3, due_date=datetime(2026, 10, 20), user_id=test_user.id),
+        TodoItem(meeting_minutes_id=minutes.id, description='安排测试', assignee='李四',
+                 priority=2, status='completed', user_id=test_user.id)
+    ])
+    db.session.commit()
+    return minutes
+
+
+def _export_todos(client, minutes_id):
+    response = client.get(f'/api/meeting-minutes/{minutes_id}/export?format=json')
+    assert response.status_code == 200
+    return orjson.loads(response.data)['todo_items']
+
+
+class TestSummaryBatch:
+    """测试批量摘要生成"""
+
+    def test_batch_keeps_order_and_dedupes(self, monkeypatch):
+        """测试结果与输入顺序一致，相同文本只调用一次API"""
+        calls = []
+        lock = threading.Lock()
+
+        def fake_api(self, text, language):
+            with lock:
+                calls.append(text)
+            return f'摘要：{text}'
+
+        monkeypatch.setattr(SummaryGenerator, '_call_deepseek_api', fake_api)
+        texts = ['第一次会议', '第二次会议', '第一次会议', '第三次会议']
+
+        summaries = SummaryGenerator(api_key='').generate_summaries_batch(texts)
+
+        assert [summary['summary_text'] for summary in summaries] == [f'摘要：{text}' for text in texts]
+        assert sorted(calls) == sorted(set(texts))
+
+
+class TestTimelineChart:
+    """测试时间线图表配置"""
+
+    def test_chart_config_serializes(self, app, tmp_path, monkeypatch):
+        """测试处理结果中的图表配置可由应用的JSON序列化（不含函数等不可序列化对象）"""
+        monkeypatch.setattr(SummaryGenerator, '_call_deepseek_api', lambda self, text, language: '会议摘要')
+        transcript = tmp_path / 'meeting.txt'
+        transcript.write_text('会议开始。张三需要在下周五之前完成报告。', encoding='utf-8')
+
+        result = MeetingMinutesAssistant().process_meeting_text(str(transcript))
+        chart_config = result['timeline']['chart_config']
+
+        assert app.json.loads(app.json.dumps(chart_config)) == chart_config
+
+
+class TestMeetingMinutesProcess:
+    """测试会议文本处理"""
+
+    def test_relative_due_date_saved(self, client, test_user, tmp_path, monkeypatch):
+        """测试待办事项截止日期为相对日期文本时正常保存，数据库中截止日期为空"""
+        monkeypatch.setattr(SummaryGenerator, '_call_deepseek_api', lambda self, text, language: '会议摘要')
+        transcript = tmp_path / 'meeting.txt'
+        transcript.write_text('会议开始。张三需要在下周五之前完成报告。', encoding='utf-8')
+        upload = Upload(
+            filename='meeting.txt',
+            original_filename='meeting.txt',
+            file_size=transcript.stat().st_size,
+            file_type='text',
+            upload_path=str(transcript),
+            user_id=test_user.id
+        )
+        db.session.add(upload)
+        db.session.commit()
+
+        response = client.post('/api/meeting-minutes/process', json={'file_id': upload.id})
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        assert [todo['due_date'] for todo in data['todo_items']] == ['下周五']
+
+        todos = TodoItem.query.filter_by(meeting_minutes_id=data['meeting_minutes_id']).all()
+        assert len(todos) == 1
+        assert todos[0].due_date is None
+
+
+class TestMeetingMinutesTodos:
+    """测试详情与导出中的待办事项（来自todo_items表）"""
+
+    EXPECTED_TODOS = [
+        {'description': '整理需求', 'assignee': '张三', 'priority': 3,
+         'due_date': '2026-10-20T00:00:00', 'status': 'pending'},
+        {'description': '安排测试', 'assignee': '李四', 'priority': 2,
+         'due_date': None, 'status': 'completed'}
+    ]
+
+    def _expected(self, minutes):
+        return [
+            dict(expected, id=todo.id)
+            for expected, todo in zip(self.EXPECTED_TODOS, minutes.todos)
+        ]
+
+    def test_detail_todo_items(self, client, minutes):
+        """测试详情接口返回待办事项的id、状态与ISO格式截止日期"""
+        response = client.get(f'/api/meeting-minutes/{minutes.id}')
+        assert response.status_code == 200
+        data = response.get_json()['data']
+
+        assert data['todo_items'] == self._expected(minutes)
+        assert data['structured_data'] == {'decisions': ['上线新版本']}
+
+    def test_export_todo_items(self, client, minutes):
+        """测试JSON导出与详情接口的待办事项结构一致"""
+        assert _export_todos(client, minutes.id) == self._expected(minutes)
+
+
+class TestMeetingMinutesMigration:
+    """测试旧库结构迁移"""
+
+    def test_todo_items_column_backfilled_and_dropped(self, app, test_user):
+        """测试删除todo_items列前，将列中的JSON待办事项补写到todo_items表"""
+        # 构造旧版本结构：todo_items列仍在，迁移停在第一个版本
+        db.session.execute(text('ALTER TABLE meeting_minutes ADD COLUMN todo_items JSON'))
+        db.session.execute(
+            text('INSERT INTO meeting_minutes (id, title, todo_items, user_id) VALUES (:id, :title, :todos, :user_id)'),
+            [
+                {'id': 1, 'title': '旧纪要', 'user_id': test_user.id, 'todos': orjson.dumps([
+                    {'description': '补写的待办', 'assignee': '王五', 'priority': 3, 'due_date': '2026-10-20'},
+                    {'description': '口头截止日期', 'due_date': '下周五'}
+                ]).decode()},
+                {'id': 2, 'title': '已有待办', 'user_id': test_user.id,
+                 'todos': orjson.dumps([{'description': '重复的待办'}]).decode()}
+            ]
+        )
+        db.session.add(TodoItem(meeting_minutes_id=2, description='已有的待办', user_id=test_user.id))
+        db.session.commit()
+        stamp(directory=MIGRATIONS_DIR, revision='3f1c2a7d9b10')
+
+        upgrade(directory=MIGRATIONS_DIR)
+        db.session.expire_all()
+
+        columns = {column['name'] for column in inspect(db.engine).get_columns('meeting_minutes')}
+        assert 'todo_items' not in columns
+
+        backfilled = TodoItem.query.filter_by(meeting_minutes_id=1).order_by(TodoItem.id).all()
+        assert [(todo.description, todo.assignee, todo.priority, todo.due_date, todo.status) for todo in backfilled] == [
+            ('补写的待办', '王五', 3, datetime(2026, 10, 20), 'pending'),
+            ('口头截止日期', '', 2, None, 'pending')
+        ]
+        assert [todo.description for todo in TodoItem.query.filter_by(meeting_minutes_id=2)] == ['已有的待办']
+
+
+class TestMeetingMinutesExport:
+    """测试会议纪要导出"""
+
+    def test_export_cache_invalidated_by_todo_change(self, client, minutes):
+        """测试待办事项变化后导出缓存失效"""
+        assert [todo['status'] for todo in _export_todos(client, minutes.id)] == ['pending', 'completed']
+
+        todo = minutes.todos[0]
+        todo.status = 'completed'
+        db.session.commit()
+        assert [todo['status'] for todo in _export_todos(client, minutes.id)] == ['completed', 'completed']
+
+        db.session.add(TodoItem(meeting_minutes_id=minutes.id, description='发布公告',
+                                user_id=minutes.user_id))
+        db.session.commit()
+        assert len(_export_todos(client, minutes.id)) == 3